@@ -0,0 +1,5 @@
+from core.pagination import KeysetPagination
+
+
+class CommentKeysetPagination(KeysetPagination):
+    ordering = ("created_at", "id")
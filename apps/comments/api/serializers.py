@@ -1,13 +1,16 @@
 from rest_framework import serializers
 
 from apps.users.api.serializers import UserListSerializer
+from core.fieldsets import SparseFieldsetSerializerMixin
 
 from ..models import Comment
 
 
-class CommentListSerializer(serializers.ModelSerializer):
+class CommentListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     author = UserListSerializer(read_only=True)
 
+    expandable_fields = ("author",)
+
     class Meta:
         model = Comment
         fields = [
@@ -6,6 +6,8 @@ from rest_framework.response import Response
 from apps.projects import selectors as project_selectors
 from apps.tasks import selectors as task_selectors
 from core.api_docs import (
+    KEYSET_PAGINATION_PARAMETERS,
+    SPARSE_FIELDSET_PARAMETERS,
     create_endpoint_schema,
     delete_endpoint_schema,
     list_endpoint_schema,
@@ -13,9 +15,13 @@ from core.api_docs import (
     update_endpoint_schema,
 )
 from core.exceptions import NotFoundError
+from core.fast_serializers import FastListMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from core.pagination import EstimatedCountPagination, KeysetPaginationMixin
 
 from .. import selectors, services
 from ..models import Comment
+from .pagination import CommentKeysetPagination
 from .permissions import (
     CanCreateComment,
     CanDeleteComment,
@@ -30,7 +36,9 @@ from .serializers import (
 )
 
 
-class CommentViewSet(viewsets.GenericViewSet):
+class CommentViewSet(
+    FastListMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.GenericViewSet
+):
     """
     ViewSet для управления комментариями к задачам.
 
@@ -43,6 +51,8 @@ class CommentViewSet(viewsets.GenericViewSet):
 
     queryset = Comment.objects.all()
     serializer_class = CommentDetailSerializer
+    pagination_class = EstimatedCountPagination
+    keyset_pagination_class = CommentKeysetPagination
 
     def get_permissions(self):
         if self.action == "list":
@@ -82,7 +92,7 @@ class CommentViewSet(viewsets.GenericViewSet):
 
     def get_queryset(self):
         task = self.get_task()
-        return selectors.filter_by_task(task)
+        return selectors.filter_by_task(task, fieldset=self.get_fieldset())
 
     def get_object(self):
         comment_id = self.kwargs.get("pk")
@@ -97,17 +107,16 @@ class CommentViewSet(viewsets.GenericViewSet):
 
     @list_endpoint_schema(
         summary="Список комментариев задачи",
-        description="Возвращает список всех комментариев к задаче.",
+        description=(
+            "Возвращает список всех комментариев к задаче. "
+            "На больших выборках count — оценка планировщика (count_is_exact=false). "
+            "С pagination=keyset список отдаётся курсорными страницами без подсчёта total."
+        ),
         tags=["comments"],
+        parameters=[*KEYSET_PAGINATION_PARAMETERS, *SPARSE_FIELDSET_PARAMETERS],
     )
     def list(self, request, project_pk=None, task_pk=None):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.fast_list_response(self.get_queryset())
 
     @create_endpoint_schema(
         summary="Создать комментарий",
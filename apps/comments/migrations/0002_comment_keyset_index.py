@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0001_initial"),
+        ("tasks", "0004_task_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comments_co_task_id_00f57c_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["task", "created_at", "id"], name="comments_co_task_id_8138df_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 from apps.tasks.models import Task
@@ -20,14 +22,20 @@ class Comment(TimestampMixin, models.Model):
     )
     content = models.TextField("Содержимое")
     is_edited = models.BooleanField("Редактировалось", default=False)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config=settings.SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ["created_at"]
         indexes = [
-            models.Index(fields=["task", "created_at"]),
+            models.Index(fields=["task", "created_at", "id"]),
             models.Index(fields=["author"]),
+            GinIndex(fields=["search_vector"], name="comment_search_vector_idx"),
         ]
 
     def __str__(self):
@@ -1,21 +1,28 @@
 from django.db.models import QuerySet
 
 from apps.tasks.models import Task
+from core import identity_map
 from core.exceptions import NotFoundError
+from core.fieldsets import Fieldset
 
 from .models import Comment
 
 
 def get_by_id(comment_id: int) -> Comment:
-    try:
-        return Comment.objects.select_related("task", "task__project", "author").get(id=comment_id)
-    except Comment.DoesNotExist:
-        raise NotFoundError("Комментарий не найден")
+    def load():
+        try:
+            return Comment.objects.select_related("task", "task__project", "author").get(
+                id=comment_id
+            )
+        except Comment.DoesNotExist:
+            raise NotFoundError("Комментарий не найден")
+
+    return identity_map.get_or_load(("comment", str(comment_id)), load)
 
 
 def get_by_id_for_update(comment_id: int) -> Comment:
     try:
-        return (
+        comment = (
             Comment.objects.select_for_update()
             .select_related("task", "task__project", "author")
             .get(id=comment_id)
@@ -23,9 +30,15 @@ def get_by_id_for_update(comment_id: int) -> Comment:
     except Comment.DoesNotExist:
         raise NotFoundError("Комментарий не найден")
 
+    identity_map.put(("comment", str(comment_id)), comment)
+    return comment
+
 
-def filter_by_task(task: Task) -> QuerySet[Comment]:
-    return Comment.objects.filter(task=task).select_related("author")
+def filter_by_task(task: Task, fieldset: Fieldset = Fieldset()) -> QuerySet[Comment]:
+    queryset = Comment.objects.filter(task=task)
+    if fieldset.expands("author"):
+        queryset = queryset.select_related("author")
+    return queryset
 
 
 def count_by_task(task: Task) -> int:
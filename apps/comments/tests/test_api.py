@@ -26,6 +26,7 @@ class TestCommentListAPI:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["count"] == 3
+        assert response.data["count_is_exact"] is True
         assert len(response.data["results"]) == 3
 
     def test_list_comments_non_member_forbidden(
@@ -45,6 +46,40 @@ class TestCommentListAPI:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_list_comments_author_as_id(self, api_client, project_for_comments, task_for_comments):
+        comment = CommentFactory(task=task_for_comments)
+        api_client.force_authenticate(user=project_for_comments.owner)
+        url = reverse(
+            "comment-list",
+            kwargs={
+                "project_pk": project_for_comments.pk,
+                "task_pk": task_for_comments.pk,
+            },
+        )
+
+        response = api_client.get(url, {"fields": "id,author", "expand": ""})
+
+        assert response.data["results"] == [{"id": comment.id, "author": comment.author_id}]
+
+    def test_list_comments_keyset(self, api_client, project_for_comments, task_for_comments):
+        comments = CommentFactory.create_batch(5, task=task_for_comments)
+        api_client.force_authenticate(user=project_for_comments.owner)
+        url = reverse(
+            "comment-list",
+            kwargs={
+                "project_pk": project_for_comments.pk,
+                "task_pk": task_for_comments.pk,
+            },
+        )
+
+        first = api_client.get(url, {"pagination": "keyset", "page_size": 3})
+        second = api_client.get(first.data["next"])
+
+        assert "count" not in first.data
+        ids = [c["id"] for c in first.data["results"] + second.data["results"]]
+        assert ids == [c.id for c in comments]
+        assert second.data["next"] is None
+
 
 @pytest.mark.django_db
 class TestCommentCreateAPI:
@@ -0,0 +1,24 @@
+from core.pagination import KeysetPagination
+
+
+class ProjectKeysetPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class ProjectSearchPagination(KeysetPagination):
+    """Курсор по (rank, kind, id) поверх UNION ALL веток из selectors.search_in_project."""
+
+    ordering = ("-rank", "-kind", "-id")
+    _converters = {"rank": float, "kind": str, "id": int}
+
+    def fetch_rows(self, branches, values: list | None, reverse: bool) -> list:
+        if values is not None:
+            # курсорное условие применяется к каждой ветке до объединения
+            branches = [branch.filter(self._build_filter(values, reverse)) for branch in branches]
+
+        first, *rest = branches
+        union = first.union(*rest, all=True)
+        return list(union.order_by(*self.get_order_by(reverse))[: self.page_size + 1])
+
+    def to_python(self, branches, name: str, value):
+        return self._converters[name](value)
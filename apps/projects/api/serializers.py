@@ -45,6 +45,20 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         return obj.members.count()
 
 
+class ProjectStatsSerializer(serializers.Serializer):
+    total_tasks = serializers.IntegerField(help_text="Всего задач")
+    pending_tasks = serializers.IntegerField(help_text="Задач в статусе pending")
+    in_progress_tasks = serializers.IntegerField(help_text="Задач в статусе in_progress")
+    completed_tasks = serializers.IntegerField(help_text="Задач в статусе completed")
+    cancelled_tasks = serializers.IntegerField(help_text="Задач в статусе cancelled")
+    low_priority_tasks = serializers.IntegerField(help_text="Задач с приоритетом low")
+    medium_priority_tasks = serializers.IntegerField(help_text="Задач с приоритетом medium")
+    high_priority_tasks = serializers.IntegerField(help_text="Задач с приоритетом high")
+    urgent_priority_tasks = serializers.IntegerField(help_text="Задач с приоритетом urgent")
+    overdue_tasks = serializers.IntegerField(help_text="Незавершённых задач с истёкшим дедлайном")
+    members_count = serializers.IntegerField(help_text="Участников проекта")
+
+
 class ProjectCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255, help_text="Название проекта")
     description = serializers.CharField(
@@ -97,3 +111,22 @@ class ProjectMemberUpdateSerializer(serializers.Serializer):
         ],
         help_text="Новая роль участника: admin, member, viewer",
     )
+
+
+class ProjectSearchHitSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(
+        choices=["task", "comment"], help_text="Где найдено совпадение: task или comment"
+    )
+    id = serializers.IntegerField(help_text="ID задачи или комментария")
+    task_id = serializers.IntegerField(
+        help_text="ID задачи (для комментария — задачи, к которой он оставлен)"
+    )
+    rank = serializers.FloatField(help_text="Релевантность (ts_rank), по убыванию")
+    title = serializers.CharField(help_text="Название задачи")
+    snippet = serializers.CharField(help_text="Начало текста комментария; для задач пусто")
+
+
+class ProjectSearchResultSerializer(serializers.Serializer):
+    next = serializers.URLField(allow_null=True)
+    previous = serializers.URLField(allow_null=True)
+    results = ProjectSearchHitSerializer(many=True)
@@ -1,4 +1,4 @@
-from drf_spectacular.utils import OpenApiExample, extend_schema
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
@@ -7,6 +7,8 @@ from rest_framework.response import Response
 
 from apps.users import selectors as user_selectors
 from core.api_docs import (
+    CURSOR_PAGINATION_PARAMETERS,
+    KEYSET_PAGINATION_PARAMETERS,
     action_endpoint_schema,
     create_endpoint_schema,
     delete_endpoint_schema,
@@ -14,9 +16,19 @@ from core.api_docs import (
     retrieve_endpoint_schema,
     update_endpoint_schema,
 )
+from core.cache import (
+    CacheKeys,
+    CacheTTL,
+    invalidate_user_project_ids,
+    safe_cache_get_many,
+    safe_cache_set_many,
+)
+from core.fast_serializers import FastListMixin
+from core.pagination import KeysetPaginationMixin
 
 from .. import selectors, services
 from ..models import Project
+from .pagination import ProjectKeysetPagination, ProjectSearchPagination
 from .permissions import IsProjectAdminOrOwner, IsProjectMember, IsProjectOwner
 from .serializers import (
     ProjectCreateSerializer,
@@ -25,11 +37,14 @@ from .serializers import (
     ProjectMemberCreateSerializer,
     ProjectMemberSerializer,
     ProjectMemberUpdateSerializer,
+    ProjectSearchHitSerializer,
+    ProjectSearchResultSerializer,
+    ProjectStatsSerializer,
     ProjectUpdateSerializer,
 )
 
 
-class ProjectViewSet(viewsets.GenericViewSet):
+class ProjectViewSet(FastListMixin, KeysetPaginationMixin, viewsets.GenericViewSet):
     """
     ViewSet для управления проектами.
 
@@ -42,6 +57,7 @@ class ProjectViewSet(viewsets.GenericViewSet):
 
     queryset = Project.objects.all()
     serializer_class = ProjectDetailSerializer
+    keyset_pagination_class = ProjectKeysetPagination
 
     def get_permissions(self):
         if self.action == "create":
@@ -50,7 +66,7 @@ class ProjectViewSet(viewsets.GenericViewSet):
             return [IsAuthenticated(), IsProjectAdminOrOwner()]
         if self.action == "destroy":
             return [IsAuthenticated(), IsProjectOwner()]
-        if self.action in ["retrieve", "members", "leave"]:
+        if self.action in ["retrieve", "members", "leave", "search", "stats"]:
             return [IsAuthenticated(), IsProjectMember()]
         if self.action in ["member_detail", "add_member"]:
             return [IsAuthenticated(), IsProjectAdminOrOwner()]
@@ -63,6 +79,8 @@ class ProjectViewSet(viewsets.GenericViewSet):
             return ProjectCreateSerializer
         if self.action == "partial_update":
             return ProjectUpdateSerializer
+        if self.action == "members":
+            return ProjectMemberSerializer
         return ProjectDetailSerializer
 
     def get_queryset(self):
@@ -76,17 +94,51 @@ class ProjectViewSet(viewsets.GenericViewSet):
 
     @list_endpoint_schema(
         summary="Список проектов",
-        description="Возвращает список проектов пользователя (где он является участником).",
+        description=(
+            "Возвращает список проектов пользователя (где он является участником). "
+            "С pagination=keyset список отдаётся курсорными страницами без подсчёта total."
+        ),
         tags=["projects"],
+        parameters=KEYSET_PAGINATION_PARAMETERS,
     )
     def list(self, request):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
+        if self.uses_keyset_pagination():
+            # ключи сортировки нужны из БД — закэшированный список id тут не подходит
+            page = self.paginate_queryset(selectors.filter_ordering_keys_for_user(request.user))
+            return self.get_paginated_response(self._get_summaries([p.id for p in page]))
+
+        project_ids = selectors.get_user_project_ids(request.user)
+        page = self.paginate_queryset(project_ids)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+            return self.get_paginated_response(self._get_summaries(page))
+        return Response(self._get_summaries(project_ids))
+
+    def _get_summaries(self, project_ids):
+        keys = {
+            project_id: CacheKeys.PROJECT_SUMMARY.format(project_id=project_id)
+            for project_id in project_ids
+        }
+        cached = safe_cache_get_many(list(keys.values()))
+        summaries = {project_id: cached[key] for project_id, key in keys.items() if key in cached}
+
+        missing_ids = [project_id for project_id in project_ids if project_id not in summaries]
+        if missing_ids:
+            projects = selectors.filter_by_ids_with_members_count(missing_ids)
+            loaded = {
+                summary["id"]: summary
+                for summary in ProjectListSerializer(projects, many=True).data
+            }
+            safe_cache_set_many(
+                {keys[project_id]: summary for project_id, summary in loaded.items()},
+                CacheTTL.PROJECT,
+            )
+            summaries.update(loaded)
+
+            if len(loaded) < len(missing_ids):
+                # проект удалён, а закэшированный список id ещё ссылается на него
+                invalidate_user_project_ids(self.request.user.id)
+
+        return [summaries[project_id] for project_id in project_ids if project_id in summaries]
 
     @create_endpoint_schema(
         summary="Создать проект",
@@ -174,15 +226,8 @@ class ProjectViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["get"])
     def members(self, request, pk=None):
         project = self.get_object()
-        members = selectors.filter_members(project)
-
-        page = self.paginate_queryset(members)
-        if page is not None:
-            serializer = ProjectMemberSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = ProjectMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        # без request в context: аватары отдаются относительными URL, как и раньше
+        return self.fast_list_response(selectors.filter_members(project), context={})
 
     @extend_schema(
         summary="Добавить участника",
@@ -273,3 +318,60 @@ class ProjectViewSet(viewsets.GenericViewSet):
         project = self.get_object()
         services.leave_project(project=project, user=request.user)
         return Response({"detail": "Вы покинули проект"})
+
+    @extend_schema(
+        summary="Статистика проекта",
+        description=(
+            "Число задач по статусам и приоритетам, просроченных задач и участников. "
+            "Доступно участникам проекта."
+        ),
+        tags=["projects"],
+        responses={
+            200: ProjectStatsSerializer,
+            403: {"description": "Нет доступа к проекту"},
+        },
+    )
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        project = self.get_object()
+        stats = selectors.get_project_with_task_stats(project.id)
+        return Response(ProjectStatsSerializer(stats).data)
+
+    @extend_schema(
+        summary="Поиск по проекту",
+        description=(
+            "Полнотекстовый поиск по названиям и описаниям задач и по комментариям проекта. "
+            "Каждое слово запроса ищется как префикс, результаты отсортированы по релевантности "
+            "и отдаются курсорными страницами (next/previous). Доступно участникам проекта."
+        ),
+        tags=["projects"],
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Поисковый запрос",
+                required=True,
+            ),
+            *CURSOR_PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: ProjectSearchResultSerializer,
+            400: {"description": "Пустой поисковый запрос"},
+            403: {"description": "Нет доступа к проекту"},
+        },
+    )
+    @action(detail=True, methods=["get"])
+    def search(self, request, pk=None):
+        project = self.get_object()
+
+        query = selectors.build_search_query(request.query_params.get("q", ""))
+        if query is None:
+            raise ValidationError({"q": "Введите хотя бы одно слово для поиска"})
+
+        paginator = ProjectSearchPagination()
+        page = paginator.paginate_queryset(
+            selectors.search_in_project(project, query), request, view=self
+        )
+        hits = ProjectSearchHitSerializer(selectors.describe_search_hits(page), many=True)
+        return paginator.get_paginated_response(hits.data)
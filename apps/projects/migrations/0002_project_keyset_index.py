@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="project",
+            name="projects_pr_created_775fe7_idx",
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="projects_pr_created_35e83e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.15 on 2026-10-17 05:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_project_stats(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectMember = apps.get_model("projects", "ProjectMember")
+    ProjectStats = apps.get_model("projects", "ProjectStats")
+    Task = apps.get_model("tasks", "Task")
+
+    stats = {
+        project_id: ProjectStats(project_id=project_id)
+        for project_id in Project.objects.values_list("id", flat=True)
+    }
+    groups = Task.objects.values("project_id", "status", "priority").annotate(n=Count("id"))
+    for row in groups.order_by():
+        project_stats = stats[row["project_id"]]
+        project_stats.total_tasks += row["n"]
+        status_counter = f"{row['status']}_tasks"
+        priority_counter = f"{row['priority']}_priority_tasks"
+        setattr(project_stats, status_counter, getattr(project_stats, status_counter) + row["n"])
+        setattr(
+            project_stats, priority_counter, getattr(project_stats, priority_counter) + row["n"]
+        )
+
+    members = ProjectMember.objects.values("project_id").annotate(n=Count("id"))
+    for row in members.order_by():
+        stats[row["project_id"]].members_count = row["n"]
+
+    ProjectStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_project_keyset_index"),
+        ("tasks", "0006_task_active_deadline_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="projects.project",
+                        verbose_name="Проект",
+                    ),
+                ),
+                ("total_tasks", models.IntegerField(default=0, verbose_name="Всего задач")),
+                ("pending_tasks", models.IntegerField(default=0, verbose_name="Ожидают")),
+                ("in_progress_tasks", models.IntegerField(default=0, verbose_name="В работе")),
+                ("completed_tasks", models.IntegerField(default=0, verbose_name="Завершены")),
+                ("cancelled_tasks", models.IntegerField(default=0, verbose_name="Отменены")),
+                (
+                    "low_priority_tasks",
+                    models.IntegerField(default=0, verbose_name="Низкий приоритет"),
+                ),
+                (
+                    "medium_priority_tasks",
+                    models.IntegerField(default=0, verbose_name="Средний приоритет"),
+                ),
+                (
+                    "high_priority_tasks",
+                    models.IntegerField(default=0, verbose_name="Высокий приоритет"),
+                ),
+                ("urgent_priority_tasks", models.IntegerField(default=0, verbose_name="Срочные")),
+                ("members_count", models.IntegerField(default=0, verbose_name="Участников")),
+                (
+                    "reconciled_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Последняя сверка"),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика проекта",
+                "verbose_name_plural": "Статистика проектов",
+            },
+        ),
+        migrations.RunPython(fill_project_stats, migrations.RunPython.noop),
+    ]
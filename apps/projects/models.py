@@ -32,7 +32,7 @@ class Project(TimestampMixin, models.Model):
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["owner"]),
-            models.Index(fields=["-created_at"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -81,3 +81,62 @@ class ProjectMember(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.project} ({self.get_role_display()})"
+
+
+class ProjectStats(models.Model):
+    """
+    Денормализованные счётчики проекта. services меняют их F()-инкрементами в той же
+    транзакции, что и задачи/участников; расхождения исправляет periodic-сверка.
+    Просроченные задачи здесь не хранятся: их число меняется со временем без записи в БД.
+    """
+
+    TASK_COUNTERS = (
+        "total_tasks",
+        "pending_tasks",
+        "in_progress_tasks",
+        "completed_tasks",
+        "cancelled_tasks",
+        "low_priority_tasks",
+        "medium_priority_tasks",
+        "high_priority_tasks",
+        "urgent_priority_tasks",
+    )
+    COUNTERS = (*TASK_COUNTERS, "members_count")
+
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Проект",
+    )
+    # без CHECK >= 0: расхождение счётчика не должно ронять запись задачи
+    total_tasks = models.IntegerField("Всего задач", default=0)
+    pending_tasks = models.IntegerField("Ожидают", default=0)
+    in_progress_tasks = models.IntegerField("В работе", default=0)
+    completed_tasks = models.IntegerField("Завершены", default=0)
+    cancelled_tasks = models.IntegerField("Отменены", default=0)
+    low_priority_tasks = models.IntegerField("Низкий приоритет", default=0)
+    medium_priority_tasks = models.IntegerField("Средний приоритет", default=0)
+    high_priority_tasks = models.IntegerField("Высокий приоритет", default=0)
+    urgent_priority_tasks = models.IntegerField("Срочные", default=0)
+    members_count = models.IntegerField("Участников", default=0)
+    reconciled_at = models.DateTimeField("Последняя сверка", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Статистика проекта"
+        verbose_name_plural = "Статистика проектов"
+
+    def __str__(self):
+        return f"Статистика {self.project_id}"
+
+    @staticmethod
+    def status_counter(status: str) -> str:
+        return f"{status}_tasks"
+
+    @staticmethod
+    def priority_counter(priority: str) -> str:
+        return f"{priority}_priority_tasks"
+
+    def counters(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.COUNTERS}
@@ -1,33 +1,49 @@
 import logging
+import re
+from collections import defaultdict
 
-from django.db.models import Count, Q, QuerySet
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, F, FloatField, QuerySet, Value
+from django.db.models.functions import Cast, Substr
 
 from apps.users.models import User
+from core import identity_map
 from core.cache import (
-    CACHE_FALSE_SENTINEL,
     CACHE_NONE_SENTINEL,
     CacheKeys,
     CacheTTL,
     cache_with_lock,
+    project_cache_key,
     safe_cache_get,
     safe_cache_set,
+    safe_hash_can_load,
+    safe_hash_get,
+    safe_hash_set_all,
 )
 from core.exceptions import NotFoundError
 
-from .models import Project, ProjectMember
+from .models import Project, ProjectMember, ProjectStats
 
 logger = logging.getLogger(__name__)
 
+_SEARCH_TERM_RE = re.compile(r"[^\W_]+")
+MAX_SEARCH_TERMS = 10
+SEARCH_SNIPPET_LENGTH = 200
+
 
 def get_by_id(project_id: int) -> Project:
-    try:
-        return Project.objects.select_related("owner").get(id=project_id)
-    except Project.DoesNotExist:
-        raise NotFoundError("Проект не найден")
+    def load():
+        try:
+            return Project.objects.select_related("owner").get(id=project_id)
+        except Project.DoesNotExist:
+            raise NotFoundError("Проект не найден")
+
+    return identity_map.get_or_load(("project", str(project_id)), load)
 
 
 def get_detail(project_id: int) -> dict:
-    cache_key = CacheKeys.PROJECT_DETAIL.format(project_id=project_id)
+    cache_key = project_cache_key(CacheKeys.PROJECT_DETAIL, project_id)
 
     def fetch_project():
         try:
@@ -103,6 +119,29 @@ def filter_for_user(user: User) -> QuerySet[Project]:
     )
 
 
+def get_user_project_ids(user: User) -> list[int]:
+    cache_key = CacheKeys.USER_PROJECT_IDS.format(user_id=user.id)
+
+    project_ids = safe_cache_get(cache_key)
+    if project_ids is None:
+        project_ids = list(
+            Project.objects.filter(members__user=user)
+            .order_by("-created_at")
+            .values_list("id", flat=True)
+        )
+        safe_cache_set(cache_key, project_ids, CacheTTL.PROJECT_LIST)
+
+    return project_ids
+
+
+def filter_ordering_keys_for_user(user: User) -> QuerySet[Project]:
+    return Project.objects.filter(members__user=user).only("id", "created_at")
+
+
+def filter_by_ids_with_members_count(project_ids: list[int]) -> QuerySet[Project]:
+    return Project.objects.filter(id__in=project_ids).annotate(members_count=Count("members"))
+
+
 def filter_for_user_with_members_count(user: User) -> QuerySet[Project]:
     return (
         Project.objects.filter(members__user=user)
@@ -123,10 +162,21 @@ def get_member(project: Project, user: User) -> ProjectMember:
         raise NotFoundError("Участник не найден")
 
 
+def forget_membership(project_id: int, user_id: int) -> None:
+    identity_map.discard(("member_role", project_id, user_id))
+
+
 def get_member_role(project: Project, user: User) -> str | None:
-    cache_key = CacheKeys.MEMBER_ROLE.format(project_id=project.id, user_id=user.id)
+    return identity_map.get_or_load(
+        ("member_role", project.id, user.id),
+        lambda: _get_member_role(project.id, user.id),
+    )
+
 
-    cached = safe_cache_get(cache_key)
+def _get_member_role(project_id: int, user_id: int) -> str | None:
+    cache_key = project_cache_key(CacheKeys.PROJECT_MEMBERS, project_id)
+
+    cached = safe_hash_get(cache_key, user_id)
 
     if cached == CACHE_NONE_SENTINEL:
         return None
@@ -134,20 +184,20 @@ def get_member_role(project: Project, user: User) -> str | None:
     if cached is not None:
         return cached
 
-    role = (
-        ProjectMember.objects.filter(
-            project=project,
-            user=user,
+    if not safe_hash_can_load(cache_key):
+        # hash не запишется — роли всех участников грузить незачем
+        return (
+            ProjectMember.objects.filter(project_id=project_id, user_id=user_id)
+            .values_list("role", flat=True)
+            .first()
         )
-        .values_list("role", flat=True)
-        .first()
-    )
 
-    ttl = CacheTTL.MEMBERSHIP if role is not None else CacheTTL.NOT_FOUND
-    cache_value = role if role is not None else CACHE_NONE_SENTINEL
+    # одним запросом грузим роли всех участников — следующие проверки
+    # любого пользователя этого проекта обслужит hash
+    roles = dict(ProjectMember.objects.filter(project_id=project_id).values_list("user_id", "role"))
+    safe_hash_set_all(cache_key, roles, CacheTTL.MEMBERSHIP)
 
-    safe_cache_set(cache_key, cache_value, ttl)
-    return role
+    return roles.get(user_id)
 
 
 def filter_members(project: Project) -> QuerySet[ProjectMember]:
@@ -156,67 +206,167 @@ def filter_members(project: Project) -> QuerySet[ProjectMember]:
     )
 
 
+def filter_member_ids(project: Project, user_ids) -> set[int]:
+    """Какие из user_ids состоят в проекте — один запрос на весь список."""
+    return set(
+        ProjectMember.objects.filter(project=project, user_id__in=user_ids).values_list(
+            "user_id", flat=True
+        )
+    )
+
+
 def exists_member(project: Project, user: User) -> bool:
-    cache_key = CacheKeys.EXISTS_MEMBER.format(project_id=project.id, user_id=user.id)
+    return get_member_role(project, user) is not None
 
-    cached = safe_cache_get(cache_key)
 
-    if cached == CACHE_FALSE_SENTINEL:
-        return False
+def is_admin_or_owner(project: Project, user: User) -> bool:
+    return get_member_role(project, user) in (
+        ProjectMember.Role.OWNER,
+        ProjectMember.Role.ADMIN,
+    )
 
-    if cached is not None:
-        return cached
 
-    exists = ProjectMember.objects.filter(
-        project=project,
-        user=user,
-    ).exists()
+def get_project_with_task_stats(project_id: int) -> Project:
+    """
+    Проект с атрибутами-счётчиками из ProjectStats (см. ProjectStats.COUNTERS)
+    и overdue_tasks. Для проекта без строки статистики счётчики считаются агрегатом.
+    """
+    from apps.tasks import selectors as task_selectors
+
+    try:
+        project = Project.objects.select_related("owner", "stats").get(id=project_id)
+    except Project.DoesNotExist:
+        raise NotFoundError("Проект не найден")
 
-    ttl = CacheTTL.MEMBERSHIP if exists else CacheTTL.NOT_FOUND
-    cache_value = exists if exists else CACHE_FALSE_SENTINEL
+    try:
+        counters = project.stats.counters()
+    except ProjectStats.DoesNotExist:
+        counters = count_project_stats(project.id)
 
-    safe_cache_set(cache_key, cache_value, ttl)
-    return exists
+    for name, value in counters.items():
+        setattr(project, name, value)
+    project.overdue_tasks = task_selectors.get_overdue_count(project)
+    return project
 
 
-def is_admin_or_owner(project: Project, user: User) -> bool:
-    cache_key = CacheKeys.IS_ADMIN_OR_OWNER.format(project_id=project.id, user_id=user.id)
+def get_total_tasks(project_id: int) -> int | None:
+    """ProjectStats.total_tasks без JOIN; None, если строки статистики нет."""
+    return (
+        ProjectStats.objects.filter(project_id=project_id)
+        .values_list("total_tasks", flat=True)
+        .first()
+    )
 
-    cached = safe_cache_get(cache_key)
 
-    if cached == CACHE_FALSE_SENTINEL:
-        return False
+def count_project_stats(project_id: int) -> dict[str, int]:
+    """Точные значения счётчиков ProjectStats — задачи и участники отдельными запросами."""
+    from apps.tasks.models import Task
 
-    if cached is not None:
-        return cached
+    counters = dict.fromkeys(ProjectStats.COUNTERS, 0)
+    groups = (
+        Task.objects.filter(project_id=project_id)
+        .values("status", "priority")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in groups:
+        counters["total_tasks"] += row["n"]
+        counters[ProjectStats.status_counter(row["status"])] += row["n"]
+        counters[ProjectStats.priority_counter(row["priority"])] += row["n"]
+
+    counters["members_count"] = ProjectMember.objects.filter(project_id=project_id).count()
+    return counters
+
+
+def count_assignee_tasks_for_update(project_id: int) -> dict[int, dict]:
+    """
+    Назначенные задачи проекта по исполнителям: {user_id: {"total", "statuses", "high_priority"}}.
+    Строки задач блокируются — до коммита счётчики не разойдутся с тем, что будет удалено.
+    """
+    from apps.tasks.models import HIGH_PRIORITIES, Task
+
+    rows = (
+        Task.objects.select_for_update()
+        .filter(project_id=project_id, assignee__isnull=False)
+        .order_by("id")
+        .values_list("assignee_id", "status", "priority")
+    )
+    counts = {}
+    for assignee_id, status, priority in rows:
+        entry = counts.setdefault(
+            assignee_id, {"total": 0, "statuses": defaultdict(int), "high_priority": 0}
+        )
+        entry["total"] += 1
+        entry["statuses"][status] += 1
+        entry["high_priority"] += priority in HIGH_PRIORITIES
+    return counts
 
-    is_admin = ProjectMember.objects.filter(
-        project=project,
-        user=user,
-        role__in=[ProjectMember.Role.OWNER, ProjectMember.Role.ADMIN],
-    ).exists()
 
-    ttl = CacheTTL.MEMBERSHIP if is_admin else CacheTTL.NOT_FOUND
-    cache_value = is_admin if is_admin else CACHE_FALSE_SENTINEL
+def build_search_query(text: str) -> SearchQuery | None:
+    terms = _SEARCH_TERM_RE.findall(text.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
 
-    safe_cache_set(cache_key, cache_value, ttl)
-    return is_admin
+    # каждое слово ищется как префикс: «регл» находит «регламент»
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=settings.SEARCH_CONFIG,
+    )
 
 
-def get_project_with_task_stats(project_id: int) -> Project:
+def search_in_project(project: Project, query: SearchQuery) -> tuple[QuerySet, QuerySet]:
+    """
+    Совпадения по задачам (title, description) и комментариям проекта — две ветки
+    для UNION ALL с одинаковыми колонками: id, kind, hit_task_id, rank.
+    ts_rank возвращает real — приводим к double, иначе значение из курсора
+    после округления при выводе не совпадёт с рангом в БД.
+    """
+    from apps.comments.models import Comment
     from apps.tasks.models import Task
 
-    try:
-        return (
-            Project.objects.select_related("owner")
-            .annotate(
-                total_tasks=Count("tasks"),
-                completed_tasks=Count("tasks", filter=Q(tasks__status=Task.Status.COMPLETED)),
-                pending_tasks=Count("tasks", filter=Q(tasks__status=Task.Status.PENDING)),
-                in_progress_tasks=Count("tasks", filter=Q(tasks__status=Task.Status.IN_PROGRESS)),
-                members_count=Count("members", distinct=True),
-            )
-            .get(id=project_id)
+    tasks = (
+        Task.objects.filter(project=project, search_vector=query)
+        .annotate(
+            kind=Value("task"),
+            hit_task_id=F("id"),
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
         )
-    except Project.DoesNotExist:
-        raise NotFoundError("Проект не найден")
+        .values("id", "kind", "hit_task_id", "rank")
+    )
+    comments = (
+        Comment.objects.filter(task__project=project, search_vector=query)
+        .annotate(
+            kind=Value("comment"),
+            hit_task_id=F("task_id"),
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+        )
+        .values("id", "kind", "hit_task_id", "rank")
+    )
+    return tasks, comments
+
+
+def describe_search_hits(rows: list[dict]) -> list[dict]:
+    from apps.comments.models import Comment
+    from apps.tasks.models import Task
+
+    titles = dict(
+        Task.objects.filter(id__in={row["hit_task_id"] for row in rows}).values_list("id", "title")
+    )
+    snippets = dict(
+        Comment.objects.filter(id__in=[row["id"] for row in rows if row["kind"] == "comment"])
+        .annotate(snippet=Substr("content", 1, SEARCH_SNIPPET_LENGTH))
+        .values_list("id", "snippet")
+    )
+
+    return [
+        {
+            "type": row["kind"],
+            "id": row["id"],
+            "task_id": row["hit_task_id"],
+            "rank": row["rank"],
+            "title": titles.get(row["hit_task_id"], ""),
+            "snippet": snippets.get(row["id"], "") if row["kind"] == "comment" else "",
+        }
+        for row in rows
+    ]
@@ -1,14 +1,19 @@
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
+from apps.users import services as user_services
 from apps.users.models import User
 from core.cache import (
-    invalidate_membership_cache,
+    invalidate_all_project_caches,
     invalidate_project_cache,
+    invalidate_user_project_ids,
+    update_membership_cache,
 )
 from core.exceptions import ConflictError, ValidationError
 
 from . import selectors
-from .models import Project, ProjectMember
+from .models import Project, ProjectMember, ProjectStats
 from .tasks import (
     send_project_invitation_email,
     send_removed_from_project_email,
@@ -29,6 +34,10 @@ def create_project(*, owner: User, name: str, description: str = "") -> Project:
         user=owner,
         role=ProjectMember.Role.OWNER,
     )
+    ProjectStats.objects.create(project=project, members_count=1)
+
+    _owner_id = owner.id
+    transaction.on_commit(lambda: invalidate_user_project_ids(_owner_id))
 
     return project
 
@@ -61,18 +70,22 @@ def update_project(
 @transaction.atomic
 def delete_project(*, project: Project) -> None:
     _project_id = project.id
-    _member_user_ids = list(
-        ProjectMember.objects.filter(project=project).values_list("user_id", flat=True)
-    )
+
+    # задачи уходят каскадом мимо tasks.services — счётчики исполнителей откатываем здесь,
+    # после удаления: adjust_task_stats заводит недостающую строку пересчётом по данным
+    by_assignee = selectors.count_assignee_tasks_for_update(project.id)
 
     project.delete()
 
-    def _invalidate():
-        invalidate_project_cache(_project_id)
-        for user_id in _member_user_ids:
-            invalidate_membership_cache(_project_id, user_id)
+    for user_id, counts in sorted(by_assignee.items()):
+        user_services.adjust_task_stats(
+            user_id,
+            total=-counts["total"],
+            statuses={status: -n for status, n in counts["statuses"].items()},
+            high_priority=-counts["high_priority"],
+        )
 
-    transaction.on_commit(_invalidate)
+    transaction.on_commit(lambda: invalidate_all_project_caches(_project_id))
 
 
 @transaction.atomic
@@ -86,6 +99,68 @@ def archive_project(*, project: Project) -> Project:
     return project
 
 
+def adjust_task_counters(
+    project_id: int,
+    *,
+    total: int = 0,
+    statuses: dict[str, int] | None = None,
+    priorities: dict[str, int] | None = None,
+) -> None:
+    """
+    F()-инкременты счётчиков задач в транзакции вызывающего: строка статистики
+    блокируется до коммита, поэтому параллельные изменения не теряются.
+    statuses/priorities — изменения по значению: {"pending": -1, "completed": 1}.
+    """
+    changes = {"total_tasks": total}
+    for task_status, delta in (statuses or {}).items():
+        name = ProjectStats.status_counter(task_status)
+        changes[name] = changes.get(name, 0) + delta
+    for priority, delta in (priorities or {}).items():
+        name = ProjectStats.priority_counter(priority)
+        changes[name] = changes.get(name, 0) + delta
+
+    _apply_counters(project_id, changes)
+
+
+def _adjust_members_count(project_id: int, delta: int) -> None:
+    _apply_counters(project_id, {"members_count": delta})
+
+
+def _apply_counters(project_id: int, changes: dict[str, int]) -> None:
+    updates = {name: F(name) + delta for name, delta in changes.items() if delta}
+    if updates:
+        ProjectStats.objects.filter(project_id=project_id).update(**updates)
+
+
+def reconcile_project_stats(project_id: int) -> bool:
+    """Пересчитывает счётчики проекта; True, если они расходились с данными."""
+    with transaction.atomic():
+        ProjectStats.objects.get_or_create(project_id=project_id)
+        # пока строка заблокирована, инкременты ждут: пересчёт видит все закоммиченные изменения
+        stats = ProjectStats.objects.select_for_update().get(project_id=project_id)
+        actual = selectors.count_project_stats(project_id)
+
+        drifted = stats.counters() != actual
+        for name, value in actual.items():
+            setattr(stats, name, value)
+        stats.reconciled_at = timezone.now()
+        stats.save()
+
+    return drifted
+
+
+def reconcile_all_project_stats() -> int:
+    """Сверка счётчиков всех проектов, по транзакции на проект; возвращает число исправленных."""
+    project_ids = Project.objects.order_by("id").values_list("id", flat=True)
+    return sum(reconcile_project_stats(project_id) for project_id in project_ids.iterator())
+
+
+def _invalidate_member_lists(project_id: int, user_id: int) -> None:
+    # проект появился/пропал в списке пользователя, у проекта изменился members_count
+    invalidate_user_project_ids(user_id)
+    invalidate_project_cache(project_id)
+
+
 @transaction.atomic
 def add_member(
     *,
@@ -104,13 +179,16 @@ def add_member(
         user=user,
         role=role,
     )
+    _adjust_members_count(project.id, 1)
+    selectors.forget_membership(project.id, user.id)
 
     _user_id = user.id
     _project_id = project.id
     _role = role
 
     def _on_commit():
-        invalidate_membership_cache(_project_id, _user_id)
+        update_membership_cache(_project_id, _user_id, _role)
+        _invalidate_member_lists(_project_id, _user_id)
         send_project_invitation_email.delay(_user_id, _project_id, _role)
 
     transaction.on_commit(_on_commit)
@@ -129,13 +207,14 @@ def update_member_role(*, membership: ProjectMember, role: str) -> ProjectMember
     old_role = membership.role
     membership.role = role
     membership.save(update_fields=["role"])
+    selectors.forget_membership(membership.project_id, membership.user_id)
 
     _user_id = membership.user_id
     _project_id = membership.project_id
     _role = role
 
     def _on_commit():
-        invalidate_membership_cache(_project_id, _user_id)
+        update_membership_cache(_project_id, _user_id, _role)
         if old_role != _role:
             send_role_changed_email.delay(_user_id, _project_id, _role)
 
@@ -154,9 +233,12 @@ def remove_member(*, membership: ProjectMember) -> None:
     _project_name = membership.project.name
 
     membership.delete()
+    _adjust_members_count(_project_id, -1)
+    selectors.forget_membership(_project_id, _user_id)
 
     def _on_commit():
-        invalidate_membership_cache(_project_id, _user_id)
+        update_membership_cache(_project_id, _user_id, None)
+        _invalidate_member_lists(_project_id, _user_id)
         send_removed_from_project_email.delay(_user_id, _project_name)
 
     transaction.on_commit(_on_commit)
@@ -173,5 +255,11 @@ def leave_project(*, project: Project, user: User) -> None:
     _user_id = user.id
 
     membership.delete()
+    _adjust_members_count(_project_id, -1)
+    selectors.forget_membership(_project_id, _user_id)
 
-    transaction.on_commit(lambda: invalidate_membership_cache(_project_id, _user_id))
+    def _on_commit():
+        update_membership_cache(_project_id, _user_id, None)
+        _invalidate_member_lists(_project_id, _user_id)
+
+    transaction.on_commit(_on_commit)
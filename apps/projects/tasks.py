@@ -53,3 +53,12 @@ def send_removed_from_project_email(user_id: int, project_name: str) -> None:
     logger.info(
         f"Sending removed from project email to {user.email} " f'for project "{project_name}"'
     )
+
+
+@shared_task
+def reconcile_project_stats() -> None:
+    from . import services
+
+    drifted = services.reconcile_all_project_stats()
+    if drifted:
+        logger.warning(f"Project stats drift repaired: {drifted} projects")
@@ -1,11 +1,19 @@
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
+from apps.comments.tests.factories import CommentFactory
+from apps.projects import services
 from apps.projects.models import Project, ProjectMember
+from apps.tasks.tests.factories import TaskFactory
 from apps.users.tests.factories import UserFactory
+from core.cache import CacheKeys
 
 from .factories import ProjectFactory, ProjectMemberFactory
 
@@ -41,6 +49,73 @@ class TestProjectListAPI:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_list_projects_served_from_cache(self, api_client, project, locmem_cache):
+        api_client.force_authenticate(user=project.owner)
+        url = reverse("project-list")
+        first = api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get(url)
+
+        assert second.data == first.data
+        assert not [q for q in queries.captured_queries if "projects_project" in q["sql"]]
+
+    def test_list_projects_keyset(self, api_client):
+        user = UserFactory(is_verified=True)
+        projects = [ProjectFactory(owner=user) for _ in range(3)]
+        api_client.force_authenticate(user=user)
+        url = reverse("project-list")
+
+        first = api_client.get(url, {"pagination": "keyset", "page_size": 2})
+        second = api_client.get(first.data["next"])
+
+        ids = [p["id"] for p in first.data["results"] + second.data["results"]]
+        assert ids == [p.id for p in reversed(projects)]
+        assert second.data["next"] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_rename_refreshes_summary_only(self, api_client, project, locmem_cache):
+        api_client.force_authenticate(user=project.owner)
+        url = reverse("project-list")
+        api_client.get(url)
+
+        services.update_project(project=project, name="Renamed")
+        response = api_client.get(url)
+
+        assert response.data["results"][0]["name"] == "Renamed"
+        ids_key = CacheKeys.USER_PROJECT_IDS.format(user_id=project.owner.id)
+        assert locmem_cache.get(ids_key) == [project.id]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_membership_changes_refresh_list(
+        self, api_client, project, non_member_user, locmem_cache
+    ):
+        api_client.force_authenticate(user=non_member_user)
+        url = reverse("project-list")
+        assert api_client.get(url).data["results"] == []
+
+        membership = services.add_member(project=project, user=non_member_user)
+        response = api_client.get(url)
+        assert [p["id"] for p in response.data["results"]] == [project.id]
+        assert response.data["results"][0]["members_count"] == 2
+
+        services.remove_member(membership=membership)
+        assert api_client.get(url).data["results"] == []
+
+    def test_deleted_project_dropped_from_cached_ids(self, api_client, project, locmem_cache):
+        other_project = ProjectFactory(owner=project.owner)
+        api_client.force_authenticate(user=project.owner)
+        url = reverse("project-list")
+        api_client.get(url)
+
+        # удаление без on_commit-инвалидации: в кэше остался устаревший список id
+        locmem_cache.delete(CacheKeys.PROJECT_SUMMARY.format(project_id=project.id))
+        Project.objects.filter(id=project.id).delete()
+        response = api_client.get(url)
+
+        assert [p["id"] for p in response.data["results"]] == [other_project.id]
+        assert locmem_cache.get(CacheKeys.USER_PROJECT_IDS.format(user_id=project.owner.id)) is None
+
 
 @pytest.mark.django_db
 class TestProjectCreateAPI:
@@ -128,9 +203,8 @@ class TestProjectDeleteAPI:
         url = reverse("project-detail", kwargs={"pk": project.pk})
         project_id = project.id
 
-        with patch("apps.projects.services.invalidate_project_cache"):
-            with patch("apps.projects.services.invalidate_membership_cache"):
-                response = api_client.delete(url)
+        with patch("apps.projects.services.invalidate_all_project_caches"):
+            response = api_client.delete(url)
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not Project.objects.filter(id=project_id).exists()
@@ -184,7 +258,7 @@ class TestProjectMembersAPI:
         url = reverse("project-add-member", kwargs={"pk": project.pk})
         data = {"user_id": new_user.id, "role": ProjectMember.Role.MEMBER}
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_project_invitation_email.delay"):
                 response = api_client.post(url, data)
 
@@ -212,7 +286,7 @@ class TestProjectMemberDetailAPI:
         )
         data = {"role": ProjectMember.Role.ADMIN}
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_role_changed_email.delay"):
                 response = api_client.patch(url, data)
 
@@ -226,7 +300,7 @@ class TestProjectMemberDetailAPI:
             "project-member-detail", kwargs={"pk": project.pk, "user_id": project_member.id}
         )
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_removed_from_project_email.delay"):
                 response = api_client.delete(url)
 
@@ -240,7 +314,7 @@ class TestProjectLeaveAPI:
         api_client.force_authenticate(user=project_member)
         url = reverse("project-leave", kwargs={"pk": project.pk})
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             response = api_client.post(url)
 
         assert response.status_code == status.HTTP_200_OK
@@ -255,6 +329,103 @@ class TestProjectLeaveAPI:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+@pytest.mark.django_db
+class TestProjectSearchAPI:
+    def _search(self, api_client, project, **params):
+        api_client.force_authenticate(user=project.owner)
+        return api_client.get(reverse("project-search", kwargs={"pk": project.pk}), params)
+
+    def test_finds_tasks_and_comments_by_prefix(self, api_client, project):
+        by_title = TaskFactory(project=project, title="Регламент релизов")
+        by_description = TaskFactory(project=project, description="Обновить регламенты дежурств")
+        comment = CommentFactory(task=TaskFactory(project=project), content="Где регламент?")
+        TaskFactory(project=project, title="Другое")
+        TaskFactory(title="Регламент чужого проекта")
+
+        response = self._search(api_client, project, q="регл")
+
+        assert response.status_code == status.HTTP_200_OK
+        hits = {(hit["type"], hit["id"]) for hit in response.data["results"]}
+        assert hits == {("task", by_title.id), ("task", by_description.id), ("comment", comment.id)}
+
+    def test_title_match_ranked_above_description(self, api_client, project):
+        by_description = TaskFactory(project=project, title="Задача", description="Бэкап базы")
+        by_title = TaskFactory(project=project, title="Бэкап базы", description="")
+
+        response = self._search(api_client, project, q="бэкап")
+
+        assert [hit["id"] for hit in response.data["results"]] == [by_title.id, by_description.id]
+
+    def test_comment_hit_carries_task(self, api_client, project):
+        task = TaskFactory(project=project, title="Релиз")
+        comment = CommentFactory(task=task, content="Проверить миграции перед релизом")
+
+        response = self._search(api_client, project, q="миграции")
+
+        assert response.data["results"] == [
+            {
+                "type": "comment",
+                "id": comment.id,
+                "task_id": task.id,
+                "rank": response.data["results"][0]["rank"],
+                "title": "Релиз",
+                "snippet": "Проверить миграции перед релизом",
+            }
+        ]
+
+    def test_cursor_pages_cover_all_hits(self, api_client, project):
+        tasks = TaskFactory.create_batch(3, project=project, title="Отчёт")
+        comments = CommentFactory.create_batch(2, task=tasks[0], content="отчёт готов")
+
+        response = self._search(api_client, project, q="отчёт", page_size=2)
+        hits = []
+        while True:
+            hits.extend((hit["type"], hit["id"]) for hit in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = api_client.get(response.data["next"])
+
+        assert len(hits) == len(set(hits)) == 5
+        assert {hit_id for kind, hit_id in hits if kind == "comment"} == {c.id for c in comments}
+
+    def test_empty_query_rejected(self, api_client, project):
+        response = self._search(api_client, project, q=" ?! ")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_non_member_forbidden(self, api_client, project):
+        api_client.force_authenticate(user=UserFactory(is_verified=True))
+
+        response = api_client.get(reverse("project-search", kwargs={"pk": project.pk}), {"q": "x"})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestProjectStatsAPI:
+    def test_stats(self, api_client, project):
+        TaskFactory(project=project, status="completed", priority="high")
+        TaskFactory(project=project, deadline=timezone.now() - timedelta(days=1))
+        services.reconcile_project_stats(project.id)
+        api_client.force_authenticate(user=project.owner)
+
+        response = api_client.get(reverse("project-stats", kwargs={"pk": project.pk}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_tasks"] == 2
+        assert response.data["completed_tasks"] == 1
+        assert response.data["high_priority_tasks"] == 1
+        assert response.data["overdue_tasks"] == 1
+        assert response.data["members_count"] == 1
+
+    def test_stats_non_member(self, api_client, project, non_member_user):
+        api_client.force_authenticate(user=non_member_user)
+
+        response = api_client.get(reverse("project-stats", kwargs={"pk": project.pk}))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.django_db
 class TestProjectPermissions:
     @pytest.mark.parametrize(
@@ -2,9 +2,15 @@ from unittest.mock import patch
 
 import pytest
 
-from apps.projects import services
-from apps.projects.models import Project, ProjectMember
+from apps.projects import selectors, services
+from apps.projects.models import Project, ProjectMember, ProjectStats
+from apps.projects.tasks import reconcile_project_stats
+from apps.tasks import services as task_services
+from apps.users import selectors as user_selectors
+from apps.users import services as user_services
+from apps.users.models import UserTaskStats
 from apps.users.tests.factories import UserFactory
+from core.cache import CACHE_NONE_SENTINEL
 from core.exceptions import ConflictError, ValidationError
 
 
@@ -80,13 +86,43 @@ class TestDeleteProject:
     def test_delete_project_success(self, project):
         project_id = project.id
 
-        with patch("apps.projects.services.invalidate_project_cache") as mock_cache:
-            with patch("apps.projects.services.invalidate_membership_cache"):
-                services.delete_project(project=project)
+        with patch("apps.projects.services.invalidate_all_project_caches") as mock_cache:
+            services.delete_project(project=project)
 
         assert not Project.objects.filter(id=project_id).exists()
         mock_cache.assert_called_once_with(project_id)
 
+    def test_delete_project_rolls_back_assignee_stats(self):
+        owner = UserFactory(is_verified=True)
+        project = services.create_project(owner=owner, name="Doomed")
+        other = services.create_project(owner=owner, name="Kept")
+        member = UserFactory(is_verified=True)
+        with patch("apps.projects.services.update_membership_cache"):
+            services.add_member(project=project, user=member)
+            services.add_member(project=other, user=member)
+        user_services.reconcile_user_task_stats(member.id)
+        user_services.reconcile_user_task_stats(owner.id)
+        for target in (project, project, other):
+            task = task_services.create_task(
+                project=target,
+                creator=owner,
+                title="Task",
+                assignee=member,
+                priority="urgent",
+            )
+        task_services.change_status(task=task, new_status="completed")
+        task_services.create_task(project=project, creator=owner, title="Task", assignee=owner)
+
+        services.delete_project(project=project)
+
+        for user in (member, owner):
+            stats = UserTaskStats.objects.get(user=user).as_dict()
+            expected = user_selectors.count_user_task_stats(user.id)
+            assert {name: stats[name] for name in UserTaskStats.COUNTERS} == {
+                name: expected[name] for name in UserTaskStats.COUNTERS
+            }
+        assert UserTaskStats.objects.get(user=member).total_assigned == 1
+
 
 @pytest.mark.django_db
 class TestArchiveProject:
@@ -105,7 +141,7 @@ class TestAddMember:
     def test_add_member_success(self, project):
         new_user = UserFactory(is_verified=True)
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_project_invitation_email.delay") as mock_email:
                 member = services.add_member(
                     project=project,
@@ -121,7 +157,7 @@ class TestAddMember:
     def test_add_member_as_admin(self, project):
         new_user = UserFactory(is_verified=True)
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_project_invitation_email.delay"):
                 member = services.add_member(
                     project=project,
@@ -154,17 +190,17 @@ class TestAddMember:
         assert "владельца" in str(exc_info.value)
 
     @pytest.mark.django_db(transaction=True)
-    def test_add_member_invalidates_cache(self, project):
+    def test_add_member_updates_cache(self, project):
         new_user = UserFactory(is_verified=True)
 
-        with patch("apps.projects.services.invalidate_membership_cache") as mock_cache:
+        with patch("apps.projects.services.update_membership_cache") as mock_cache:
             with patch("apps.projects.services.send_project_invitation_email.delay"):
                 services.add_member(
                     project=project,
                     user=new_user,
                 )
 
-        mock_cache.assert_called_once_with(project.id, new_user.id)
+        mock_cache.assert_called_once_with(project.id, new_user.id, ProjectMember.Role.MEMBER)
 
 
 @pytest.mark.django_db
@@ -173,7 +209,7 @@ class TestUpdateMemberRole:
     def test_update_member_role_success(self, project, project_member):
         membership = ProjectMember.objects.get(project=project, user=project_member)
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch("apps.projects.services.send_role_changed_email.delay") as mock_email:
                 result = services.update_member_role(
                     membership=membership,
@@ -212,7 +248,7 @@ class TestRemoveMember:
     def test_remove_member_success(self, project, project_member):
         membership = ProjectMember.objects.get(project=project, user=project_member)
 
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             with patch(
                 "apps.projects.services.send_removed_from_project_email.delay"
             ) as mock_email:
@@ -233,7 +269,7 @@ class TestRemoveMember:
 @pytest.mark.django_db
 class TestLeaveProject:
     def test_leave_project_success(self, project, project_member):
-        with patch("apps.projects.services.invalidate_membership_cache"):
+        with patch("apps.projects.services.update_membership_cache"):
             services.leave_project(project=project, user=project_member)
 
         assert not ProjectMember.objects.filter(project=project, user=project_member).exists()
@@ -243,3 +279,121 @@ class TestLeaveProject:
             services.leave_project(project=project, user=project_owner)
 
         assert "Владелец" in str(exc_info.value)
+
+
+@pytest.mark.django_db
+class TestProjectStats:
+    def _create_project(self):
+        owner = UserFactory(is_verified=True)
+        return services.create_project(owner=owner, name="Stats")
+
+    def test_create_project_creates_stats(self):
+        project = self._create_project()
+
+        assert project.stats.members_count == 1
+        assert project.stats.total_tasks == 0
+
+    def test_task_services_keep_counters(self):
+        project = self._create_project()
+        owner = project.owner
+        first = task_services.create_task(project=project, creator=owner, title="A")
+        second = task_services.create_task(
+            project=project, creator=owner, title="B", priority="urgent"
+        )
+
+        task_services.change_status(task=first, new_status="completed")
+        task_services.update_task(task=second, priority="low")
+        task_services.delete_task(task=second)
+
+        stats = ProjectStats.objects.get(project=project)
+        assert stats.counters() == selectors.count_project_stats(project.id)
+        assert stats.total_tasks == 1
+        assert stats.completed_tasks == 1
+        assert stats.medium_priority_tasks == 1
+
+    def test_membership_services_keep_members_count(self):
+        project = self._create_project()
+        first, second = UserFactory.create_batch(2, is_verified=True)
+
+        with patch("apps.projects.services.update_membership_cache"):
+            membership = services.add_member(project=project, user=first)
+            services.add_member(project=project, user=second)
+            services.remove_member(membership=membership)
+            services.leave_project(project=project, user=second)
+
+        assert ProjectStats.objects.get(project=project).members_count == 1
+
+    def test_reconcile_repairs_drift(self):
+        project = self._create_project()
+        task_services.create_task(project=project, creator=project.owner, title="A")
+        ProjectStats.objects.filter(project=project).update(total_tasks=7, pending_tasks=0)
+
+        assert services.reconcile_project_stats(project.id) is True
+        assert services.reconcile_project_stats(project.id) is False
+
+        stats = ProjectStats.objects.get(project=project)
+        assert stats.total_tasks == 1
+        assert stats.pending_tasks == 1
+        assert stats.reconciled_at is not None
+
+    def test_periodic_task_creates_missing_stats(self, project):
+        reconcile_project_stats.delay()
+
+        assert ProjectStats.objects.get(project=project).members_count == 1
+
+    def test_selector_falls_back_to_aggregate(self, project, project_member):
+        stats = selectors.get_project_with_task_stats(project.id)
+
+        assert stats.members_count == 2
+        assert stats.total_tasks == 0
+        assert stats.overdue_tasks == 0
+
+
+@pytest.mark.django_db
+class TestMembershipSelectors:
+    def test_cold_cache_loads_all_roles_in_one_query(
+        self, project, project_owner, project_admin, django_assert_num_queries
+    ):
+        with (
+            patch("apps.projects.selectors.safe_hash_can_load", return_value=True),
+            patch("apps.projects.selectors.safe_hash_set_all") as mock_set_all,
+        ):
+            with django_assert_num_queries(1):
+                role = selectors.get_member_role(project, project_admin)
+
+        assert role == ProjectMember.Role.ADMIN
+        cached_roles = mock_set_all.call_args[0][1]
+        assert cached_roles == {
+            project_owner.id: ProjectMember.Role.OWNER,
+            project_admin.id: ProjectMember.Role.ADMIN,
+        }
+
+    def test_unwritable_hash_reads_single_row(
+        self, project, project_admin, django_assert_num_queries
+    ):
+        with (
+            patch("apps.projects.selectors.safe_hash_can_load", return_value=False),
+            patch("apps.projects.selectors.safe_hash_set_all") as mock_set_all,
+        ):
+            with django_assert_num_queries(1) as queries:
+                role = selectors.get_member_role(project, project_admin)
+
+        assert role == ProjectMember.Role.ADMIN
+        assert '"user_id" = ' in queries.captured_queries[0]["sql"]
+        mock_set_all.assert_not_called()
+
+    def test_checks_answered_from_membership_hash(
+        self, project, project_admin, django_assert_num_queries
+    ):
+        with patch("apps.projects.selectors.safe_hash_get", return_value="admin"):
+            with django_assert_num_queries(0):
+                assert selectors.exists_member(project, project_admin)
+                assert selectors.is_admin_or_owner(project, project_admin)
+
+    def test_non_member_answered_from_loaded_hash(
+        self, project, non_member_user, django_assert_num_queries
+    ):
+        with patch("apps.projects.selectors.safe_hash_get", return_value=CACHE_NONE_SENTINEL):
+            with django_assert_num_queries(0):
+                assert selectors.get_member_role(project, non_member_user) is None
+                assert not selectors.exists_member(project, non_member_user)
@@ -12,6 +12,7 @@ from core.api_docs import (
     update_endpoint_schema,
 )
 from core.exceptions import NotFoundError
+from core.fast_serializers import FastListMixin
 
 from .. import selectors, services
 from ..models import Tag
@@ -24,7 +25,7 @@ from .serializers import (
 )
 
 
-class TagViewSet(viewsets.GenericViewSet):
+class TagViewSet(FastListMixin, viewsets.GenericViewSet):
     """
     ViewSet для управления тегами задач.
 
@@ -83,13 +84,7 @@ class TagViewSet(viewsets.GenericViewSet):
         tags=["tags"],
     )
     def list(self, request, project_pk=None):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.fast_list_response(self.get_queryset())
 
     @create_endpoint_schema(
         summary="Создать тег",
@@ -3,6 +3,7 @@ from django.db import transaction
 from apps.projects.models import Project
 from apps.tasks.models import Task
 from apps.users.models import User
+from core.cache import bump_task_list_version
 from core.exceptions import ConflictError, ValidationError
 
 from . import selectors
@@ -47,12 +48,35 @@ def update_tag(
         update_fields.append("color")
 
     tag.save(update_fields=update_fields)
+
+    # имя и цвет тега попадают в закэшированные страницы списка задач
+    _project_id = tag.project_id
+    transaction.on_commit(lambda: bump_task_list_version(_project_id))
     return tag
 
 
 @transaction.atomic
 def delete_tag(*, tag: Tag) -> None:
+    _project_id = tag.project_id
+
     tag.delete()
+    transaction.on_commit(lambda: bump_task_list_version(_project_id))
+
+
+def _get_project_tags(project_id: int, tag_ids: list[int]) -> list[Tag]:
+    unique_tag_ids = list(set(tag_ids))
+    tags = list(selectors.filter_by_ids(unique_tag_ids))
+
+    if len(tags) != len(unique_tag_ids):
+        found_ids = {tag.id for tag in tags}
+        missing_ids = set(unique_tag_ids) - found_ids
+        raise ValidationError(f"Теги не найдены: {missing_ids}")
+
+    for tag in tags:
+        if tag.project_id != project_id:
+            raise ValidationError("Некоторые теги не принадлежат проекту задачи")
+
+    return tags
 
 
 @transaction.atomic
@@ -60,19 +84,10 @@ def set_task_tags(*, task: Task, tag_ids: list[int], updated_by: User | None = N
     if not tag_ids:
         task.tags.clear()
     else:
-        unique_tag_ids = list(set(tag_ids))
-        tags = list(selectors.filter_by_ids(unique_tag_ids))
+        task.tags.set(_get_project_tags(task.project_id, tag_ids))
 
-        if len(tags) != len(unique_tag_ids):
-            found_ids = {tag.id for tag in tags}
-            missing_ids = set(unique_tag_ids) - found_ids
-            raise ValidationError(f"Теги не найдены: {missing_ids}")
-
-        for tag in tags:
-            if tag.project_id != task.project_id:
-                raise ValidationError("Некоторые теги не принадлежат проекту задачи")
-
-        task.tags.set(tags)
+    _project_id = task.project_id
+    transaction.on_commit(lambda: bump_task_list_version(_project_id))
 
     if updated_by:
         _task_id = task.id
@@ -86,3 +101,18 @@ def set_task_tags(*, task: Task, tag_ids: list[int], updated_by: User | None = N
         transaction.on_commit(_broadcast)
 
     return task
+
+
+@transaction.atomic
+def replace_tags_for_tasks(*, project: Project, task_ids: list[int], tag_ids: list[int]) -> None:
+    """
+    Одинаковый набор тегов для пачки задач: один DELETE и один INSERT по связующей таблице.
+    Версию списка и события отправляет вызывающий.
+    """
+    tags = _get_project_tags(project.id, tag_ids) if tag_ids else []
+
+    through = Task.tags.through
+    through.objects.filter(task_id__in=task_ids).delete()
+    through.objects.bulk_create(
+        through(task_id=task_id, tag_id=tag.id) for task_id in task_ids for tag in tags
+    )
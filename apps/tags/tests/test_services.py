@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from apps.projects.tests.factories import ProjectFactory
@@ -176,3 +178,24 @@ class TestSetTaskTags:
         result = services.set_task_tags(task=task, tag_ids=[new_tag.id])
 
         assert list(result.tags.all()) == [new_tag]
+
+
+class TestTaskListVersion:
+    @pytest.mark.django_db(transaction=True)
+    def test_set_task_tags_bumps_version(self):
+        task = TaskFactory()
+        tag = TagFactory(project=task.project)
+
+        with patch("apps.tags.services.bump_task_list_version") as mock_bump:
+            services.set_task_tags(task=task, tag_ids=[tag.id])
+
+        mock_bump.assert_called_once_with(task.project_id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_update_tag_bumps_version(self):
+        tag = TagFactory()
+
+        with patch("apps.tags.services.bump_task_list_version") as mock_bump:
+            services.update_tag(tag=tag, color="#000000")
+
+        mock_bump.assert_called_once_with(tag.project_id)
@@ -19,4 +19,4 @@ class TaskAdmin(admin.ModelAdmin):
     search_fields = ["title", "description", "project__name", "assignee__email"]
     raw_id_fields = ["project", "creator", "assignee"]
     readonly_fields = ["created_at", "updated_at"]
-    ordering = ["project", "position", "-created_at"]
+    ordering = ["project", "order_rank", "-created_at"]
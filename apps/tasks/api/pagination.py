@@ -0,0 +1,18 @@
+from core.pagination import KeysetPagination
+
+from ..models import TASK_ORDERING
+
+
+class TaskKeysetPagination(KeysetPagination):
+    ordering = TASK_ORDERING
+
+
+class TaskDeadlinePagination(KeysetPagination):
+    # просроченные и скоро истекающие: deadline у таких задач всегда заполнен
+    ordering = ("deadline", "id")
+
+
+class AssignedTaskPagination(KeysetPagination):
+    # задачи без дедлайна — в конце списка; индекс (assignee, status, deadline)
+    ordering = ("deadline", "id")
+    nullable_fields = ("deadline",)
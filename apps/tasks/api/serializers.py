@@ -2,15 +2,26 @@ from rest_framework import serializers
 
 from apps.tags.api.serializers import TagMinimalSerializer
 from apps.users.api.serializers import UserListSerializer
+from core.fieldsets import SparseFieldsetSerializerMixin
 
 from ..models import Task
 
+# position в ответах больше нет: его заменил order_rank, позиция — индекс задачи в списке
+ORDER_RANK_HELP = (
+    "Ключ ручного порядка (вместо position): задачи проекта идут по возрастанию order_rank. "
+    'Сравнивать строки побайтово (как колляция "C"), не с учётом локали и не как числа. '
+    "Позиция задачи — её индекс в списке проекта."
+)
 
-class TaskListSerializer(serializers.ModelSerializer):
+
+class TaskListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    order_rank = serializers.CharField(read_only=True, help_text=ORDER_RANK_HELP)
     creator = UserListSerializer(read_only=True)
     assignee = UserListSerializer(read_only=True)
     tags = TagMinimalSerializer(many=True, read_only=True)
 
+    expandable_fields = ("creator", "assignee", "tags")
+
     class Meta:
         model = Task
         fields = [
@@ -19,7 +30,7 @@ class TaskListSerializer(serializers.ModelSerializer):
             "status",
             "priority",
             "deadline",
-            "position",
+            "order_rank",
             "creator",
             "assignee",
             "tags",
@@ -28,7 +39,16 @@ class TaskListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class AssignedTaskListSerializer(TaskListSerializer):
+    """Задача в списке из нескольких проектов — с ID проекта."""
+
+    class Meta(TaskListSerializer.Meta):
+        fields = [*TaskListSerializer.Meta.fields, "project"]
+        read_only_fields = fields
+
+
 class TaskDetailSerializer(serializers.ModelSerializer):
+    order_rank = serializers.CharField(read_only=True, help_text=ORDER_RANK_HELP)
     creator = UserListSerializer(read_only=True)
     assignee = UserListSerializer(read_only=True)
     tags = TagMinimalSerializer(many=True, read_only=True)
@@ -43,7 +63,7 @@ class TaskDetailSerializer(serializers.ModelSerializer):
             "status",
             "priority",
             "deadline",
-            "position",
+            "order_rank",
             "creator",
             "assignee",
             "tags",
@@ -77,6 +97,81 @@ class TaskCreateSerializer(serializers.Serializer):
     )
 
 
+BULK_MAX_TASKS = 500
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    tasks = TaskCreateSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=BULK_MAX_TASKS,
+        help_text=f"Задачи для создания (максимум {BULK_MAX_TASKS})",
+    )
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    # поле со значением для каждой операции
+    OPERATION_FIELDS = {
+        "status": "status",
+        "priority": "priority",
+        "assignee": "assignee_id",
+        "tags": "tag_ids",
+    }
+
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_TASKS,
+        help_text=f"ID задач проекта (максимум {BULK_MAX_TASKS})",
+    )
+    operation = serializers.ChoiceField(
+        choices=list(OPERATION_FIELDS),
+        help_text="Операция: status, priority, assignee, tags",
+    )
+    status = serializers.ChoiceField(
+        choices=Task.Status.choices, required=False, help_text="Новый статус (operation=status)"
+    )
+    priority = serializers.ChoiceField(
+        choices=Task.Priority.choices,
+        required=False,
+        help_text="Новый приоритет (operation=priority)",
+    )
+    assignee_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="ID исполнителя или null, чтобы снять (operation=assignee)",
+    )
+    tag_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=True,
+        max_length=20,
+        help_text="Новый набор тегов, максимум 20 (operation=tags)",
+    )
+
+    def validate(self, attrs):
+        field = self.OPERATION_FIELDS[attrs["operation"]]
+        if field not in attrs:
+            raise serializers.ValidationError(
+                {field: f"Обязательное поле для операции {attrs['operation']}"}
+            )
+        return attrs
+
+
+class TaskBulkReorderSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_TASKS,
+        help_text=f"ID задач в новом порядке (максимум {BULK_MAX_TASKS})",
+    )
+
+    def validate_task_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("ID задач не должны повторяться")
+        return value
+
+
 class TaskUpdateSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=255, required=False, help_text="Название задачи")
     description = serializers.CharField(
@@ -92,6 +187,35 @@ class TaskUpdateSerializer(serializers.Serializer):
     )
 
 
+class TaskDueSoonQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(
+        min_value=1, max_value=90, default=7, help_text="Горизонт в днях (1–90)"
+    )
+
+
+class AssignedTaskQuerySerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Task.Priority.choices, required=False)
+    deadline_after = serializers.DateTimeField(required=False, help_text="Дедлайн не раньше")
+    deadline_before = serializers.DateTimeField(required=False, help_text="Дедлайн не позже")
+
+
+class TaskDeadlinePageSerializer(serializers.Serializer):
+    next = serializers.URLField(allow_null=True)
+    previous = serializers.URLField(allow_null=True)
+    results = TaskListSerializer(many=True)
+
+
+class TaskOverduePageSerializer(TaskDeadlinePageSerializer):
+    count = serializers.IntegerField(help_text="Всего просроченных задач в проекте")
+
+
+class AssignedTaskPageSerializer(serializers.Serializer):
+    next = serializers.URLField(allow_null=True)
+    previous = serializers.URLField(allow_null=True)
+    results = AssignedTaskListSerializer(many=True)
+
+
 class TaskStatusSerializer(serializers.Serializer):
     status = serializers.ChoiceField(
         choices=Task.Status.choices, help_text="Статус: pending, in_progress, completed, cancelled"
@@ -105,7 +229,10 @@ class TaskAssignSerializer(serializers.Serializer):
 
 
 class TaskReorderSerializer(serializers.Serializer):
-    position = serializers.IntegerField(min_value=0, help_text="Новая позиция задачи (0-based)")
+    position = serializers.IntegerField(
+        min_value=0,
+        help_text="Новый индекс задачи в списке проекта (0-based); в ответе — новый order_rank",
+    )
 
 
 class TaskSetTagsSerializer(serializers.Serializer):
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import TaskViewSet
+from .views import MyTaskViewSet, TaskViewSet
 
 task_list = TaskViewSet.as_view(
     {
@@ -9,6 +9,48 @@ task_list = TaskViewSet.as_view(
     }
 )
 
+task_bulk_create = TaskViewSet.as_view(
+    {
+        "post": "bulk_create",
+    }
+)
+
+task_bulk_update = TaskViewSet.as_view(
+    {
+        "post": "bulk_update",
+    }
+)
+
+task_bulk_reorder = TaskViewSet.as_view(
+    {
+        "post": "bulk_reorder",
+    }
+)
+
+task_overdue = TaskViewSet.as_view(
+    {
+        "get": "overdue",
+    }
+)
+
+task_due_soon = TaskViewSet.as_view(
+    {
+        "get": "due_soon",
+    }
+)
+
+my_task_list = MyTaskViewSet.as_view(
+    {
+        "get": "list",
+    }
+)
+
+my_task_overdue = MyTaskViewSet.as_view(
+    {
+        "get": "overdue",
+    }
+)
+
 task_detail = TaskViewSet.as_view(
     {
         "get": "retrieve",
@@ -47,6 +89,31 @@ urlpatterns = [
         task_list,
         name="task-list",
     ),
+    path(
+        "projects/<int:project_pk>/tasks/bulk/",
+        task_bulk_create,
+        name="task-bulk-create",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/bulk-update/",
+        task_bulk_update,
+        name="task-bulk-update",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/reorder/",
+        task_bulk_reorder,
+        name="task-bulk-reorder",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/overdue/",
+        task_overdue,
+        name="task-overdue",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/due-soon/",
+        task_due_soon,
+        name="task-due-soon",
+    ),
     path(
         "projects/<int:project_pk>/tasks/<int:pk>/",
         task_detail,
@@ -72,4 +139,14 @@ urlpatterns = [
         task_set_tags,
         name="task-set-tags",
     ),
+    path(
+        "me/tasks/",
+        my_task_list,
+        name="me-task-list",
+    ),
+    path(
+        "me/tasks/overdue/",
+        my_task_overdue,
+        name="me-task-overdue",
+    ),
 ]
@@ -1,4 +1,5 @@
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
@@ -9,6 +10,9 @@ from apps.projects import selectors as project_selectors
 from apps.tags import services as tag_services
 from apps.users import selectors as user_selectors
 from core.api_docs import (
+    CURSOR_PAGINATION_PARAMETERS,
+    KEYSET_PAGINATION_PARAMETERS,
+    SPARSE_FIELDSET_PARAMETERS,
     action_endpoint_schema,
     create_endpoint_schema,
     delete_endpoint_schema,
@@ -16,16 +20,38 @@ from core.api_docs import (
     retrieve_endpoint_schema,
     update_endpoint_schema,
 )
+from core.cache import (
+    CacheKeys,
+    CacheTTL,
+    get_task_list_version,
+    project_cache_key,
+    safe_cache_get,
+    safe_cache_set,
+)
+from core.etag import compute_etag, etag_matches, request_cache_hash
 from core.exceptions import NotFoundError
+from core.fast_serializers import FastListMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from core.pagination import EstimatedCountPagination, KeysetPaginationMixin
 
 from .. import selectors, services
-from ..models import Task
+from ..models import TASK_ORDERING, Task
+from .pagination import AssignedTaskPagination, TaskDeadlinePagination, TaskKeysetPagination
 from .permissions import CanCreateTask, CanDeleteTask, CanEditTask, CanViewTask
 from .serializers import (
+    AssignedTaskListSerializer,
+    AssignedTaskPageSerializer,
+    AssignedTaskQuerySerializer,
     TaskAssignSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkReorderSerializer,
+    TaskBulkUpdateSerializer,
     TaskCreateSerializer,
+    TaskDeadlinePageSerializer,
     TaskDetailSerializer,
+    TaskDueSoonQuerySerializer,
     TaskListSerializer,
+    TaskOverduePageSerializer,
     TaskReorderSerializer,
     TaskSetTagsSerializer,
     TaskStatusSerializer,
@@ -33,7 +59,9 @@ from .serializers import (
 )
 
 
-class TaskViewSet(viewsets.GenericViewSet):
+class TaskViewSet(
+    FastListMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.GenericViewSet
+):
     """
     ViewSet для управления задачами внутри проектов.
 
@@ -46,13 +74,18 @@ class TaskViewSet(viewsets.GenericViewSet):
 
     queryset = Task.objects.all()
     serializer_class = TaskDetailSerializer
+    pagination_class = EstimatedCountPagination
+    keyset_pagination_class = TaskKeysetPagination
+
+    # списки по дедлайну всегда курсорные: (deadline, id) совпадает с частичными индексами
+    deadline_actions = ("overdue", "due_soon")
 
     def get_permissions(self):
-        if self.action == "list":
+        if self.action == "list" or self.action in self.deadline_actions:
             return [IsAuthenticated(), CanViewTask()]
-        if self.action == "create":
+        if self.action in ("create", "bulk_create"):
             return [IsAuthenticated(), CanCreateTask()]
-        if self.action == "retrieve":
+        if self.action in ("retrieve", "bulk_update", "bulk_reorder"):
             return [IsAuthenticated(), CanViewTask()]
         if self.action == "partial_update":
             return [IsAuthenticated(), CanViewTask(), CanEditTask()]
@@ -63,10 +96,16 @@ class TaskViewSet(viewsets.GenericViewSet):
         return [IsAuthenticated()]
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action == "list" or self.action in self.deadline_actions:
             return TaskListSerializer
         if self.action == "create":
             return TaskCreateSerializer
+        if self.action == "bulk_create":
+            return TaskBulkCreateSerializer
+        if self.action == "bulk_update":
+            return TaskBulkUpdateSerializer
+        if self.action == "bulk_reorder":
+            return TaskBulkReorderSerializer
         if self.action == "partial_update":
             return TaskUpdateSerializer
         if self.action == "change_status":
@@ -79,29 +118,46 @@ class TaskViewSet(viewsets.GenericViewSet):
             return TaskSetTagsSerializer
         return TaskDetailSerializer
 
+    def get_keyset_pagination_class(self):
+        if self.action in self.deadline_actions:
+            return TaskDeadlinePagination
+        return super().get_keyset_pagination_class()
+
+    def uses_keyset_pagination(self) -> bool:
+        return self.action in self.deadline_actions or super().uses_keyset_pagination()
+
     def get_project(self):
         project_id = self.kwargs.get("project_pk")
         return project_selectors.get_by_id(project_id)
 
-    def get_queryset(self):
-        project = self.get_project()
-        task_status = self.request.query_params.get("status")
-        task_priority = self.request.query_params.get("priority")
+    def get_list_filters(self) -> dict:
         assignee_id = self.request.query_params.get("assignee_id")
-
         if assignee_id:
             try:
                 assignee_id = int(assignee_id)
             except ValueError:
                 assignee_id = None
 
+        return {
+            "status": self.request.query_params.get("status"),
+            "priority": self.request.query_params.get("priority"),
+            "assignee_id": assignee_id,
+        }
+
+    def get_queryset(self):
         return selectors.filter_by_project_with_filters(
-            project=project,
-            status=task_status,
-            priority=task_priority,
-            assignee_id=assignee_id,
+            project=self.get_project(),
+            **self.get_list_filters(),
+            fieldset=self.get_fieldset(),
         )
 
+    def get_stored_count(self) -> int | None:
+        # count списка без фильтров — из ProjectStats; фильтрованные списки оценивает планировщик
+        filters = self.get_list_filters()
+        if filters["status"] or filters["priority"] or filters["assignee_id"] is not None:
+            return None
+        return project_selectors.get_total_tasks(self.kwargs.get("project_pk"))
+
     def get_object(self):
         task_id = self.kwargs.get("pk")
         task = selectors.get_by_id(task_id)
@@ -119,9 +175,31 @@ class TaskViewSet(viewsets.GenericViewSet):
             raise ValidationError({"assignee_id": "Пользователь не является участником проекта"})
         return assignee
 
+    def _validate_bulk_assignees(self, rows: list[dict], project) -> None:
+        # все исполнители проверяются одним запросом, ошибки — по номерам строк
+        assignee_ids = {row["assignee_id"] for row in rows if row.get("assignee_id")}
+        members = project_selectors.filter_member_ids(project, assignee_ids)
+        errors = [
+            (
+                {"assignee_id": ["Пользователь не является участником проекта"]}
+                if row.get("assignee_id") and row["assignee_id"] not in members
+                else {}
+            )
+            for row in rows
+        ]
+        if any(errors):
+            raise ValidationError({"tasks": errors})
+
     @list_endpoint_schema(
         summary="Список задач проекта",
-        description="Возвращает список задач проекта с фильтрацией по статусу, приоритету и исполнителю.",
+        description=(
+            "Возвращает список задач проекта с фильтрацией по статусу, приоритету и исполнителю. "
+            "Ответ содержит ETag; при совпадении If-None-Match возвращается 304 без тела. "
+            "Без фильтров count берётся из счётчика проекта. "
+            "На больших фильтрованных выборках count — оценка планировщика "
+            "(count_is_exact=false). "
+            "С pagination=keyset список отдаётся курсорными страницами без подсчёта total."
+        ),
         tags=["tasks"],
         parameters=[
             OpenApiParameter(
@@ -145,16 +223,221 @@ class TaskViewSet(viewsets.GenericViewSet):
                 description="Фильтр по ID исполнителя",
                 required=False,
             ),
+            OpenApiParameter(
+                name="If-None-Match",
+                type=str,
+                location=OpenApiParameter.HEADER,
+                description="ETag ранее полученной страницы",
+                required=False,
+            ),
+            *KEYSET_PAGINATION_PARAMETERS,
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
     )
     def list(self, request, project_pk=None):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        project = self.get_project()
+        cache_key = project_cache_key(
+            CacheKeys.TASK_LIST_PAGE,
+            project.id,
+            version=get_task_list_version(project.id),
+            query_hash=request_cache_hash(request),
+        )
+
+        cached = safe_cache_get(cache_key)
+        if cached is None:
+            data = self._render_list()
+            cached = {"etag": compute_etag(data), "data": data}
+            safe_cache_set(cache_key, cached, CacheTTL.TASK_LIST)
+
+        headers = {"ETag": cached["etag"]}
+        if etag_matches(request, cached["etag"]):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(cached["data"], headers=headers)
+
+    def _render_list(self):
+        return self.fast_list_response(self.get_queryset()).data
+
+    @extend_schema(
+        summary="Просроченные задачи проекта",
+        description=(
+            "Незавершённые задачи (pending, in_progress) с истёкшим дедлайном, "
+            "от самого старого дедлайна. Отдаются курсорными страницами; "
+            "count — общее число просроченных задач в проекте."
+        ),
+        tags=["tasks"],
+        parameters=CURSOR_PAGINATION_PARAMETERS,
+        responses={
+            200: TaskOverduePageSerializer,
+            403: {"description": "Нет доступа к проекту"},
+        },
+    )
+    @action(detail=False, methods=["get"])
+    def overdue(self, request, project_pk=None):
+        project = self.get_project()
+        response = self.fast_list_response(selectors.filter_overdue(project))
+        response.data = {"count": selectors.get_overdue_count(project), **response.data}
+        return response
+
+    @extend_schema(
+        summary="Задачи с приближающимся дедлайном",
+        description=(
+            "Незавершённые задачи, дедлайн которых наступит в ближайшие days дней, "
+            "по возрастанию дедлайна. Отдаются курсорными страницами."
+        ),
+        tags=["tasks"],
+        parameters=[
+            OpenApiParameter(
+                name="days",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Горизонт в днях (1–90, по умолчанию 7)",
+                required=False,
+            ),
+            *CURSOR_PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: TaskDeadlinePageSerializer,
+            400: {"description": "Некорректный параметр days"},
+            403: {"description": "Нет доступа к проекту"},
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="due-soon")
+    def due_soon(self, request, project_pk=None):
+        query = TaskDueSoonQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        project = self.get_project()
+        return self.fast_list_response(
+            selectors.filter_due_soon(project, days=query.validated_data["days"])
+        )
+
+    @extend_schema(
+        summary="Создать задачи пачкой",
+        description=(
+            "Создаёт до 500 задач одним запросом: все строки проверяются заранее, "
+            "при любой ошибке не создаётся ни одна задача. Задачи встают в конец списка "
+            "в порядке запроса. Доступно member, admin, owner (не viewer)."
+        ),
+        tags=["tasks"],
+        request=TaskBulkCreateSerializer,
+        responses={
+            201: TaskListSerializer(many=True),
+            400: {"description": "Ошибки валидации по строкам: tasks[i].field"},
+            403: {"description": "Нет прав на создание задач"},
+        },
+        examples=[
+            OpenApiExample(
+                name="BulkCreateTasksRequest",
+                value={
+                    "tasks": [
+                        {"title": "Собрать требования", "priority": "high"},
+                        {"title": "Подготовить макет", "assignee_id": 2},
+                    ]
+                },
+                request_only=True,
+            ),
+        ],
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request, project_pk=None):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        project = self.get_project()
+        rows = serializer.validated_data["tasks"]
+        self._validate_bulk_assignees(rows, project)
+
+        tasks = services.bulk_create_tasks(project=project, creator=request.user, tasks=rows)
+        queryset = selectors.filter_by_project_with_filters(project).filter(
+            id__in=[task.id for task in tasks]
+        )
+        return Response(
+            TaskListSerializer(queryset.order_by(*TASK_ORDERING), many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        summary="Изменить задачи пачкой",
+        description=(
+            "Применяет одну операцию (status, priority, assignee, tags) к списку задач "
+            "одним UPDATE. Права проверяются для всей пачки сразу: creator или assignee "
+            "каждой задачи, либо admin/owner проекта. Возвращает все переданные задачи; "
+            "участники получают одно событие task.bulk_updated, исполнители — по одному письму."
+        ),
+        tags=["tasks"],
+        request=TaskBulkUpdateSerializer,
+        responses={
+            200: TaskListSerializer(many=True),
+            400: {"description": "Ошибка валидации"},
+            403: {"description": "Нет прав на изменение части задач"},
+            404: {"description": "Часть задач не найдена в проекте"},
+        },
+        examples=[
+            OpenApiExample(
+                name="BulkUpdateTasksRequest",
+                value={"task_ids": [1, 2, 3], "operation": "status", "status": "completed"},
+                request_only=True,
+            ),
+        ],
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request, project_pk=None):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        project = self.get_project()
+        assignee = None
+        if data["operation"] == "assignee" and data["assignee_id"]:
+            assignee = self._validate_assignee(data["assignee_id"], project)
+
+        services.bulk_update_tasks(
+            project=project,
+            task_ids=data["task_ids"],
+            updated_by=request.user,
+            operation=data["operation"],
+            status=data.get("status"),
+            priority=data.get("priority"),
+            assignee=assignee,
+            tag_ids=data.get("tag_ids"),
+        )
+        queryset = selectors.filter_by_project_with_filters(project).filter(id__in=data["task_ids"])
+        return Response(TaskListSerializer(queryset.order_by(*TASK_ORDERING), many=True).data)
+
+    @extend_schema(
+        summary="Задать порядок набора задач",
+        description=(
+            "Сохраняет новый порядок переданных задач (например, колонки доски) одним UPDATE: "
+            "задачи обмениваются местами, которые уже занимали, остальные не двигаются. "
+            "Права — как у изменения каждой задачи. Участники получают одно событие "
+            "task.bulk_reordered с новым порядком."
+        ),
+        tags=["tasks"],
+        request=TaskBulkReorderSerializer,
+        responses={
+            200: TaskListSerializer(many=True),
+            400: {"description": "Ошибка валидации"},
+            403: {"description": "Нет прав на изменение части задач"},
+            404: {"description": "Часть задач не найдена в проекте"},
+        },
+        examples=[
+            OpenApiExample(
+                name="BulkReorderTasksRequest",
+                value={"task_ids": [3, 1, 2]},
+                request_only=True,
+            ),
+        ],
+    )
+    @action(detail=False, methods=["post"], url_path="reorder")
+    def bulk_reorder(self, request, project_pk=None):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task_ids = serializer.validated_data["task_ids"]
+
+        project = self.get_project()
+        services.bulk_reorder_tasks(project=project, task_ids=task_ids, updated_by=request.user)
+        queryset = selectors.filter_by_project_with_filters(project).filter(id__in=task_ids)
+        return Response(TaskListSerializer(queryset.order_by(*TASK_ORDERING), many=True).data)
 
     @create_endpoint_schema(
         summary="Создать задачу",
@@ -307,7 +590,10 @@ class TaskViewSet(viewsets.GenericViewSet):
 
     @action_endpoint_schema(
         summary="Изменить позицию задачи",
-        description="Изменяет позицию задачи в списке. Доступно creator, assignee, admin, owner.",
+        description=(
+            "Перемещает задачу на индекс position в списке проекта; переписывается только "
+            "её order_rank. Доступно creator, assignee, admin, owner."
+        ),
         tags=["tasks"],
         method="POST",
         request_examples=[
@@ -358,3 +644,84 @@ class TaskViewSet(viewsets.GenericViewSet):
         )
         task = selectors.get_by_id(task.id)
         return Response(TaskDetailSerializer(task).data)
+
+
+class MyTaskViewSet(FastListMixin, KeysetPaginationMixin, viewsets.GenericViewSet):
+    """Задачи текущего пользователя во всех его проектах; списки всегда курсорные."""
+
+    queryset = Task.objects.none()
+    serializer_class = AssignedTaskListSerializer
+    keyset_pagination_class = AssignedTaskPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_keyset_pagination_class(self):
+        if self.action == "overdue":
+            return TaskDeadlinePagination
+        return super().get_keyset_pagination_class()
+
+    def uses_keyset_pagination(self) -> bool:
+        return True
+
+    @extend_schema(
+        summary="Мои задачи",
+        description=(
+            "Задачи, назначенные текущему пользователю, во всех проектах, где он состоит. "
+            "По возрастанию дедлайна, задачи без дедлайна — в конце; курсорные страницы."
+        ),
+        tags=["tasks"],
+        parameters=[
+            OpenApiParameter(
+                name="status",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Фильтр по статусу (pending, in_progress, completed, cancelled)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="priority",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Фильтр по приоритету (low, medium, high, urgent)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="deadline_after",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Дедлайн не раньше (задачи без дедлайна исключаются)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="deadline_before",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Дедлайн не позже (задачи без дедлайна исключаются)",
+                required=False,
+            ),
+            *CURSOR_PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: AssignedTaskPageSerializer,
+            400: {"description": "Некорректные параметры фильтра"},
+        },
+    )
+    def list(self, request):
+        query = AssignedTaskQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return self.fast_list_response(
+            selectors.filter_assigned_to_user(request.user, **query.validated_data)
+        )
+
+    @extend_schema(
+        summary="Мои просроченные задачи",
+        description=(
+            "Незавершённые задачи текущего пользователя с истёкшим дедлайном во всех "
+            "проектах, где он состоит. От самого старого дедлайна, курсорными страницами."
+        ),
+        tags=["tasks"],
+        parameters=CURSOR_PAGINATION_PARAMETERS,
+        responses={200: AssignedTaskPageSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def overdue(self, request):
+        return self.fast_list_response(selectors.filter_overdue_assigned_to_user(request.user))
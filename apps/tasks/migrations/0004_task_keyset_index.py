@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_remove_task_task_position_non_negative"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="tasks_task_project_fd47c4_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["project", "position", "-created_at", "-id"],
+                name="tasks_task_project_ad64cc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-17 05:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("deadline__isnull", False), ("status__in", ("pending", "in_progress"))
+                ),
+                fields=["project", "deadline"],
+                name="task_active_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("deadline__isnull", False), ("status__in", ("pending", "in_progress"))
+                ),
+                fields=["assignee", "deadline"],
+                name="task_assignee_deadline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-17 05:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0003_projectstats"),
+        ("tags", "0002_add_color_validator"),
+        ("tasks", "0006_task_active_deadline_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assignee", "status", "deadline"], name="task_assignee_status_dl_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.15 on 2026-10-17 06:20
+
+from django.db import migrations, models
+
+from core.ranking import rank_for_slot
+
+
+def fill_ranks(apps, schema_editor):
+    # текущий порядок (position, -created_at, -id) переходит в слоты 1..n каждого проекта
+    Task = apps.get_model("tasks", "Task")
+
+    rows = Task.objects.order_by("project_id", "position", "-created_at", "-id").values_list(
+        "id", "project_id"
+    )
+    batch = []
+    project_id, slot = None, 0
+    for task_id, task_project_id in rows.iterator(chunk_size=2000):
+        if task_project_id != project_id:
+            project_id, slot = task_project_id, 0
+        slot += 1
+        batch.append(Task(id=task_id, order_rank=rank_for_slot(slot)))
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ["order_rank"])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ["order_rank"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_assignee_status_deadline_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="order_rank",
+            field=models.CharField(
+                db_collation="C", default="", max_length=64, verbose_name="Ранг"
+            ),
+            preserve_default=False,
+        ),
+        # position остаётся до 0010: откат этой миграции порядок не теряет
+        migrations.RunPython(fill_ranks, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="task",
+            options={
+                "ordering": ["order_rank", "-created_at"],
+                "verbose_name": "Задача",
+                "verbose_name_plural": "Задачи",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["project", "order_rank", "-created_at", "-id"], name="task_project_rank_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.15 on 2026-10-17 06:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+from core.ranking import slot_of
+
+
+def fill_rank_counters(apps, schema_editor):
+    # счётчик продолжает с последнего занятого слота проекта
+    Task = apps.get_model("tasks", "Task")
+    TaskRankCounter = apps.get_model("tasks", "TaskRankCounter")
+
+    last_ranks = Task.objects.values("project_id").annotate(last_rank=Max("order_rank"))
+    TaskRankCounter.objects.bulk_create(
+        (
+            TaskRankCounter(project_id=row["project_id"], last_slot=slot_of(row["last_rank"]))
+            for row in last_ranks.order_by()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0003_projectstats"),
+        ("tasks", "0008_task_order_rank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskRankCounter",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_rank_counter",
+                        serialize=False,
+                        to="projects.project",
+                        verbose_name="Проект",
+                    ),
+                ),
+                (
+                    "last_slot",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Последний слот"),
+                ),
+            ],
+            options={
+                "verbose_name": "Счётчик рангов задач",
+                "verbose_name_plural": "Счётчики рангов задач",
+            },
+        ),
+        migrations.RunPython(fill_rank_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def fill_positions(apps, schema_editor):
+    # откат: позиции 0..n-1 каждого проекта в порядке рангов (order_rank, -created_at, -id)
+    Task = apps.get_model("tasks", "Task")
+
+    rows = Task.objects.order_by("project_id", "order_rank", "-created_at", "-id").values_list(
+        "id", "project_id"
+    )
+    batch = []
+    project_id, position = None, 0
+    for task_id, task_project_id in rows.iterator(chunk_size=2000):
+        if task_project_id != project_id:
+            project_id, position = task_project_id, 0
+        batch.append(Task(id=task_id, position=position))
+        position += 1
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ["position"])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ["position"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_task_rank_counter"),
+    ]
+
+    operations = [
+        # при откате операции идут в обратном порядке: сначала вернётся колонка, потом позиции
+        migrations.RunPython(migrations.RunPython.noop, fill_positions),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="tasks_task_project_ad64cc_idx",
+        ),
+        migrations.RemoveField(
+            model_name="task",
+            name="position",
+        ),
+    ]
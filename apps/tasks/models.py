@@ -1,8 +1,19 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 from apps.projects.models import Project
 from core.mixins import TimestampMixin
+from core.ranking import RANK_MAX_LENGTH
+
+# незавершённые статусы — только у таких задач дедлайн может быть просрочен;
+# условие частичных индексов по deadline, запросы должны фильтровать ровно по нему
+ACTIVE_STATUSES = ("pending", "in_progress")
+# приоритеты, которые считаются в статистике пользователя как high_priority
+HIGH_PRIORITIES = ("high", "urgent")
+# ручной порядок задач в проекте; id делает ключ уникальным для курсоров и блокировок
+TASK_ORDERING = ("order_rank", "-created_at", "-id")
 
 
 class Task(TimestampMixin, models.Model):
@@ -53,26 +64,76 @@ class Task(TimestampMixin, models.Model):
         default=Priority.MEDIUM,
     )
     deadline = models.DateTimeField("Дедлайн", null=True, blank=True)
-    position = models.PositiveIntegerField("Позиция", default=0)
+    # лексикографический ранг (core.ranking): перемещение меняет только ранг самой задачи
+    order_rank = models.CharField("Ранг", max_length=RANK_MAX_LENGTH, db_collation="C")
     tags = models.ManyToManyField(
         "tags.Tag",
         blank=True,
         related_name="tasks",
         verbose_name="Теги",
     )
+    # вычисляется PostgreSQL в том же INSERT/UPDATE — отдельной записи из приложения нет
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=settings.SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=settings.SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
-        ordering = ["position", "-created_at"]
+        ordering = ["order_rank", "-created_at"]
         indexes = [
             models.Index(fields=["project", "status"]),
             models.Index(fields=["project", "priority"]),
             models.Index(fields=["project", "assignee"]),
-            models.Index(fields=["project", "position"]),
+            models.Index(
+                fields=["project", "order_rank", "-created_at", "-id"], name="task_project_rank_idx"
+            ),
             models.Index(fields=["deadline"]),
             models.Index(fields=["-created_at"]),
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+            models.Index(
+                fields=["project", "deadline"],
+                condition=models.Q(status__in=ACTIVE_STATUSES, deadline__isnull=False),
+                name="task_active_deadline_idx",
+            ),
+            models.Index(
+                fields=["assignee", "deadline"],
+                condition=models.Q(status__in=ACTIVE_STATUSES, deadline__isnull=False),
+                name="task_assignee_deadline_idx",
+            ),
+            models.Index(
+                fields=["assignee", "status", "deadline"],
+                name="task_assignee_status_dl_idx",
+            ),
         ]
 
     def __str__(self):
         return self.title
+
+
+class TaskRankCounter(models.Model):
+    """
+    Последний выданный проекту слот ранга (core.ranking): новые задачи получают слоты
+    одним UPDATE ... RETURNING, без MAX() по задачам. Счётчик только растёт.
+    """
+
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_rank_counter",
+        verbose_name="Проект",
+    )
+    last_slot = models.PositiveBigIntegerField("Последний слот", default=0)
+
+    class Meta:
+        verbose_name = "Счётчик рангов задач"
+        verbose_name_plural = "Счётчики рангов задач"
+
+    def __str__(self):
+        return f"{self.project_id}: {self.last_slot}"
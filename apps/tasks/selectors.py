@@ -1,26 +1,36 @@
-from django.db.models import Max, Q, QuerySet
+from datetime import datetime, timedelta
+
+from django.db.models import Prefetch, Q, QuerySet
+from django.utils import timezone
 
 from apps.projects.models import Project
+from apps.tags.models import Tag
 from apps.users.models import User
+from core import identity_map
+from core.cache import CacheKeys, CacheTTL, project_cache_key, safe_cache_get, safe_cache_set
 from core.exceptions import NotFoundError
+from core.fieldsets import Fieldset
 
-from .models import Task
+from .models import ACTIVE_STATUSES, TASK_ORDERING, Task
 
 
 def get_by_id(task_id: int) -> Task:
-    try:
-        return (
-            Task.objects.select_related("project", "creator", "assignee")
-            .prefetch_related("tags")
-            .get(id=task_id)
-        )
-    except Task.DoesNotExist:
-        raise NotFoundError("Задача не найдена")
+    def load():
+        try:
+            return (
+                Task.objects.select_related("project", "creator", "assignee")
+                .prefetch_related("tags")
+                .get(id=task_id)
+            )
+        except Task.DoesNotExist:
+            raise NotFoundError("Задача не найдена")
+
+    return identity_map.get_or_load(("task", str(task_id)), load)
 
 
 def get_by_id_for_update(task_id: int) -> Task:
     try:
-        return (
+        task = (
             Task.objects.select_for_update()
             .select_related("project", "creator", "assignee")
             .prefetch_related("tags")
@@ -29,6 +39,14 @@ def get_by_id_for_update(task_id: int) -> Task:
     except Task.DoesNotExist:
         raise NotFoundError("Задача не найдена")
 
+    identity_map.put(("task", str(task_id)), task)
+    return task
+
+
+def filter_by_ids_for_update(project: Project, task_ids) -> QuerySet[Task]:
+    # блокировки берутся по возрастанию id — пересекающиеся пачки не дедлокаются
+    return Task.objects.select_for_update().filter(project=project, id__in=task_ids).order_by("id")
+
 
 def filter_by_project(project: Project) -> QuerySet[Task]:
     return (
@@ -43,6 +61,7 @@ def filter_by_project_with_filters(
     status: str | None = None,
     priority: str | None = None,
     assignee_id: int | None = None,
+    fieldset: Fieldset = Fieldset(),
 ) -> QuerySet[Task]:
     filters = Q(project=project)
 
@@ -53,16 +72,44 @@ def filter_by_project_with_filters(
     if assignee_id is not None:
         filters &= Q(assignee_id=assignee_id)
 
-    return (
-        Task.objects.filter(filters).select_related("creator", "assignee").prefetch_related("tags")
-    )
+    return _load_relations(Task.objects.filter(filters), fieldset)
+
+
+def _load_relations(queryset: QuerySet[Task], fieldset: Fieldset) -> QuerySet[Task]:
+    # JOIN только для развёрнутых связей: нераскрытые creator/assignee отдаются из *_id
+    select = [name for name in ("creator", "assignee") if fieldset.expands(name)]
+    if select:
+        queryset = queryset.select_related(*select)
+
+    if fieldset.expands("tags"):
+        queryset = queryset.prefetch_related("tags")
+    elif fieldset.includes("tags"):
+        queryset = queryset.prefetch_related(Prefetch("tags", queryset=Tag.objects.only("id")))
+
+    return queryset
+
+
+def filter_assigned_to_user(
+    user: User,
+    status: str | None = None,
+    priority: str | None = None,
+    deadline_after: datetime | None = None,
+    deadline_before: datetime | None = None,
+) -> QuerySet[Task]:
+    # членство проверяется JOIN-ом в этом же запросе, а не проверкой прав по каждому проекту
+    filters = Q(assignee=user, project__members__user=user)
 
+    if status:
+        filters &= Q(status=status)
+    if priority:
+        filters &= Q(priority=priority)
+    if deadline_after is not None:
+        filters &= Q(deadline__gte=deadline_after)
+    if deadline_before is not None:
+        filters &= Q(deadline__lte=deadline_before)
 
-def filter_assigned_to_user(user: User) -> QuerySet[Task]:
     return (
-        Task.objects.filter(assignee=user)
-        .select_related("project", "creator")
-        .prefetch_related("tags")
+        Task.objects.filter(filters).select_related("project", "creator").prefetch_related("tags")
     )
 
 
@@ -70,18 +117,89 @@ def exists_task_in_project(project: Project, task_id: int) -> bool:
     return Task.objects.filter(project=project, id=task_id).exists()
 
 
-def get_max_position(project: Project) -> int:
-    result = Task.objects.filter(project=project).aggregate(max_position=Max("position"))
-    return result["max_position"] or 0
+def get_last_rank(project: Project, exclude_id: int | None = None) -> str | None:
+    queryset = Task.objects.filter(project=project)
+    if exclude_id is not None:
+        queryset = queryset.exclude(id=exclude_id)
+    return queryset.order_by("-order_rank").values_list("order_rank", flat=True).first()
 
 
-# def filter_overdue_tasks(project: Project) -> QuerySet[Task]:
-#     now = timezone.now()
-#     return Task.objects.filter(
-#         Q(project=project)
-#         & Q(deadline__lt=now)
-#         & ~Q(status__in=[Task.Status.COMPLETED, Task.Status.CANCELLED])
-#     ).select_related('creator', 'assignee').prefetch_related('tags').order_by('deadline')
+def get_neighbour_ranks(
+    project: Project, task_id: int, index: int
+) -> tuple[str | None, str | None]:
+    """Ранги задач, между которыми встанет task_id на месте index (0-based) в списке проекта."""
+    ranks = (
+        Task.objects.filter(project=project)
+        .exclude(id=task_id)
+        .order_by(*TASK_ORDERING)
+        .values_list("order_rank", flat=True)
+    )
+    if index == 0:
+        return None, ranks.first()
+
+    neighbours = list(ranks[index - 1 : index + 1])
+    if not neighbours:
+        return get_last_rank(project, exclude_id=task_id), None
+    return neighbours[0], neighbours[1] if len(neighbours) > 1 else None
+
+
+def _filter_active_with_deadline(**filters) -> QuerySet[Task]:
+    # условие совпадает с условием частичных индексов task_*_deadline_idx
+    return Task.objects.filter(status__in=ACTIVE_STATUSES, deadline__isnull=False, **filters)
+
+
+def filter_overdue(project: Project, now: datetime | None = None) -> QuerySet[Task]:
+    now = now or timezone.now()
+    return _filter_active_with_deadline(project=project, deadline__lt=now).order_by(
+        "deadline", "id"
+    )
+
+
+def filter_due_soon(project: Project, days: int, now: datetime | None = None) -> QuerySet[Task]:
+    now = now or timezone.now()
+    return _filter_active_with_deadline(
+        project=project, deadline__gte=now, deadline__lte=now + timedelta(days=days)
+    ).order_by("deadline", "id")
+
+
+def filter_overdue_assigned_to_user(user: User, now: datetime | None = None) -> QuerySet[Task]:
+    now = now or timezone.now()
+    # задачи проектов, из которых пользователя исключили, не показываем
+    return _filter_active_with_deadline(
+        assignee=user, deadline__lt=now, project__members__user=user
+    ).order_by("deadline", "id")
+
+
+def get_overdue_count(project: Project) -> int:
+    """
+    Число просроченных задач проекта из кэша. Запись живёт до ближайшего ещё не наступившего
+    дедлайна (тогда просрочка меняется без записи в БД), изменения статуса и дедлайна
+    в services сбрасывают её сами.
+    """
+    cache_key = project_cache_key(CacheKeys.TASK_OVERDUE_COUNT, project.id)
+    now = timezone.now()
+
+    cached = safe_cache_get(cache_key)
+    if cached is not None and (
+        cached["valid_until"] is None or now.timestamp() < cached["valid_until"]
+    ):
+        return cached["count"]
+
+    # два диапазона по task_active_deadline_idx вместо агрегата по всем задачам проекта
+    active = _filter_active_with_deadline(project=project)
+    count = active.filter(deadline__lt=now).count()
+    next_deadline = (
+        active.filter(deadline__gte=now).order_by("deadline").values_list("deadline", flat=True)
+    ).first()
+    safe_cache_set(
+        cache_key,
+        {
+            "count": count,
+            "valid_until": next_deadline.timestamp() if next_deadline else None,
+        },
+        CacheTTL.OVERDUE_COUNT,
+    )
+    return count
 
 
 # def filter_user_related_tasks(user: User, project: Project) -> QuerySet[Task]:
@@ -102,19 +220,3 @@ def get_max_position(project: Project) -> int:
 #         ),
 #         avg_position=Avg('position'),
 #     )
-
-
-# def filter_with_deadline_soon(
-#     project: Project,
-#     days: int = 7,
-# ) -> QuerySet[Task]:
-#     now = timezone.now()
-#     threshold = now + timedelta(days=days)
-#     return Task.objects.filter(
-#         Q(project=project)
-#         & Q(deadline__gte=now)
-#         & Q(deadline__lte=threshold)
-#         & ~Q(status__in=[Task.Status.COMPLETED, Task.Status.CANCELLED])
-#     ).annotate(
-#         days_until_deadline=Coalesce(F('deadline'), now) - now
-#     ).select_related('creator', 'assignee').prefetch_related('tags').order_by('deadline')
@@ -1,20 +1,112 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
 from datetime import datetime
+from itertools import chain
 
-from django.db import transaction
-from django.db.models import F
+from django.db import connection, transaction
+from django.utils import timezone
 
+from apps.projects import selectors as project_selectors
+from apps.projects import services as project_services
 from apps.projects.models import Project
+from apps.tags import services as tag_services
+from apps.users import services as user_services
 from apps.users.models import User
+from core.cache import bump_task_list_version, invalidate_overdue_count
+from core.exceptions import NotFoundError, PermissionDeniedError, ValidationError
+from core.ranking import RANK_MAX_LENGTH, needs_rebalance, rank_between, rank_for_slot, slot_of
 
 from . import selectors
-from .models import Task
+from .models import ACTIVE_STATUSES, HIGH_PRIORITIES, Task, TaskRankCounter
 from .tasks import (
+    rebalance_task_ranks,
+    send_bulk_task_assigned_emails,
+    send_bulk_task_status_changed_emails,
+    send_bulk_task_unassigned_emails,
     send_task_assigned_email,
     send_task_status_changed_email,
     send_task_unassigned_email,
 )
 
 
+def _bump_list_version(project_id: int) -> None:
+    # закэшированные страницы списка задач проекта становятся недостижимы
+    transaction.on_commit(lambda: bump_task_list_version(project_id))
+
+
+def _refresh_overdue_count(project_id: int) -> None:
+    # счётчик просроченных пересчитается при следующем чтении
+    transaction.on_commit(lambda: invalidate_overdue_count(project_id))
+
+
+def _count_for_assignee(tasks: Iterable[Task], user_id: int | None, sign: int) -> None:
+    # задачи целиком добавляются (sign=1) в статистику исполнителя или вычитаются (sign=-1)
+    if user_id is None:
+        return
+    tasks = list(tasks)
+    statuses = Counter(task.status for task in tasks)
+    user_services.adjust_task_stats(
+        user_id,
+        total=sign * len(tasks),
+        statuses={task_status: sign * count for task_status, count in statuses.items()},
+        high_priority=sign * sum(task.priority in HIGH_PRIORITIES for task in tasks),
+        last_task_created=max(task.created_at for task in tasks) if sign > 0 else None,
+    )
+
+
+def _take_slots(project_id: int, count: int) -> int | None:
+    table = TaskRankCounter._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET last_slot = last_slot + %s WHERE project_id = %s "
+            "RETURNING last_slot",
+            [count, project_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def allocate_slots(project: Project, count: int) -> range:
+    """
+    count подряд идущих слотов рангов в конце списка проекта за один запрос. Строка
+    счётчика блокируется до коммита, как и ProjectStats в той же транзакции,
+    поэтому параллельные создания получают разные слоты.
+    """
+    last_slot = _take_slots(project.id, count)
+    if last_slot is None:
+        # первый запрос проекта: счётчик продолжает слоты уже существующих задач
+        last_rank = selectors.get_last_rank(project)
+        TaskRankCounter.objects.bulk_create(
+            [
+                TaskRankCounter(
+                    project_id=project.id, last_slot=slot_of(last_rank) if last_rank else 0
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        last_slot = _take_slots(project.id, count)
+    return range(last_slot - count + 1, last_slot + 1)
+
+
+def _append_ranks(project: Project, count: int) -> list[str]:
+    # новые задачи встают в конец списка
+    return [rank_for_slot(slot) for slot in allocate_slots(project, count)]
+
+
+def _group_by_user(tasks: Iterable[Task], attr: str = "assignee_id") -> dict[int, list[Task]]:
+    groups = defaultdict(list)
+    for task in tasks:
+        user_id = getattr(task, attr)
+        if user_id is not None:
+            groups[user_id].append(task)
+    return groups
+
+
+def _as_notifications(groups: dict[int, list[Task]]) -> list[list]:
+    # [[user_id, [task_id, ...]], ...] — аргумент групповых писем, сериализуемый в JSON
+    return [[user_id, [task.id for task in tasks]] for user_id, tasks in groups.items()]
+
+
 @transaction.atomic
 def create_task(
     *,
@@ -26,7 +118,7 @@ def create_task(
     deadline: datetime | None = None,
     assignee: User | None = None,
 ) -> Task:
-    position = selectors.get_max_position(project) + 1
+    (rank,) = _append_ranks(project, 1)
 
     task = Task.objects.create(
         project=project,
@@ -36,8 +128,15 @@ def create_task(
         priority=priority,
         deadline=deadline,
         assignee=assignee,
-        position=position,
+        order_rank=rank,
+    )
+    project_services.adjust_task_counters(
+        project.id, total=1, statuses={task.status: 1}, priorities={task.priority: 1}
     )
+    _count_for_assignee([task], task.assignee_id, 1)
+    _bump_list_version(project.id)
+    if deadline is not None:
+        _refresh_overdue_count(project.id)
 
     if assignee:
         _user_id = assignee.id
@@ -60,6 +159,51 @@ def create_task(
     return task
 
 
+@transaction.atomic
+def bulk_create_tasks(*, project: Project, creator: User, tasks: list[dict]) -> list[Task]:
+    """
+    Пачка задач одним INSERT: ранги — один диапазон слотов из счётчика проекта,
+    счётчики меняются по разу на проект и исполнителя, а на коммит уходят одно событие
+    и одна задача рассылки. Членство исполнителей (assignee_id) проверяет вызывающий.
+    """
+    ranks = _append_ranks(project, len(tasks))
+    created = Task.objects.bulk_create(
+        Task(project=project, creator=creator, order_rank=rank, **data)
+        for rank, data in zip(ranks, tasks, strict=True)
+    )
+
+    project_services.adjust_task_counters(
+        project.id,
+        total=len(created),
+        statuses=Counter(task.status for task in created),
+        priorities=Counter(task.priority for task in created),
+    )
+    by_assignee = _group_by_user(created)
+    # по возрастанию id — тот же порядок блокировок, что в assign_task
+    for user_id in sorted(by_assignee):
+        _count_for_assignee(by_assignee[user_id], user_id, 1)
+
+    _bump_list_version(project.id)
+    if any(task.deadline is not None for task in created):
+        _refresh_overdue_count(project.id)
+
+    _task_ids = [task.id for task in created]
+    _project_id = project.id
+    _user_id = creator.id
+    _assignments = _as_notifications(by_assignee)
+
+    def _on_commit():
+        from apps.websocket.tasks import broadcast_tasks_created
+
+        broadcast_tasks_created.delay(_task_ids, _project_id, _user_id)
+        if _assignments:
+            send_bulk_task_assigned_emails.delay(_assignments, _project_id)
+
+    transaction.on_commit(_on_commit)
+
+    return created
+
+
 _UNSET = object()
 
 
@@ -83,15 +227,27 @@ def update_task(
         task.description = description
         update_fields.append("description")
 
+    if priority is not None and priority != task.priority:
+        project_services.adjust_task_counters(
+            task.project_id, priorities={task.priority: -1, priority: 1}
+        )
+    high_delta = 0
     if priority is not None:
+        high_delta = (priority in HIGH_PRIORITIES) - (task.priority in HIGH_PRIORITIES)
         task.priority = priority
         update_fields.append("priority")
 
+    deadline_changed = deadline is not _UNSET and deadline != task.deadline
     if deadline is not _UNSET:
         task.deadline = deadline
         update_fields.append("deadline")
 
     task.save(update_fields=update_fields)
+    if task.assignee_id and high_delta:
+        user_services.adjust_task_stats(task.assignee_id, high_priority=high_delta)
+    _bump_list_version(task.project_id)
+    if deadline_changed and task.status in ACTIVE_STATUSES:
+        _refresh_overdue_count(task.project_id)
 
     if updated_by:
         _task_id = task.id
@@ -112,7 +268,15 @@ def delete_task(*, task: Task, deleted_by: User | None = None) -> None:
     _task_id = task.id
     _project_id = task.project_id
 
+    was_active_with_deadline = task.deadline is not None and task.status in ACTIVE_STATUSES
     task.delete()
+    project_services.adjust_task_counters(
+        _project_id, total=-1, statuses={task.status: -1}, priorities={task.priority: -1}
+    )
+    _count_for_assignee([task], task.assignee_id, -1)
+    _bump_list_version(_project_id)
+    if was_active_with_deadline:
+        _refresh_overdue_count(_project_id)
 
     if deleted_by:
         _user_id = deleted_by.id
@@ -134,6 +298,14 @@ def change_status(*, task: Task, new_status: str, updated_by: User | None = None
 
     task.status = new_status
     task.save(update_fields=["status", "updated_at"])
+    project_services.adjust_task_counters(task.project_id, statuses={old_status: -1, new_status: 1})
+    if task.assignee_id:
+        user_services.adjust_task_stats(task.assignee_id, statuses={old_status: -1, new_status: 1})
+    _bump_list_version(task.project_id)
+    if task.deadline is not None and (old_status in ACTIVE_STATUSES) != (
+        new_status in ACTIVE_STATUSES
+    ):
+        _refresh_overdue_count(task.project_id)
 
     if task.assignee:
         _user_id = task.assignee_id
@@ -171,6 +343,11 @@ def assign_task(
 
     task.assignee = assignee
     task.save(update_fields=["assignee", "updated_at"])
+    # строки статистики блокируются по возрастанию id: встречные переназначения не дедлокаются
+    moves = [(old_assignee_id, -1), (assignee.id if assignee else None, 1)]
+    for user_id, sign in sorted(move for move in moves if move[0] is not None):
+        _count_for_assignee([task], user_id, sign)
+    _bump_list_version(task.project_id)
 
     if old_assignee_id:
         _old_user_id = old_assignee_id
@@ -202,30 +379,205 @@ def assign_task(
     return task
 
 
-@transaction.atomic
-def reorder_task(*, task: Task, new_position: int, updated_by: User | None = None) -> Task:
-    old_position = task.position
+BULK_OPERATIONS = ("status", "priority", "assignee", "tags")
 
-    if old_position == new_position:
-        return task
 
-    project = task.project
+def _check_can_edit_tasks(project: Project, tasks: list[Task], user: User) -> None:
+    # те же правила, что у CanEditTask, но роль в проекте читается один раз на пачку
+    if project_selectors.is_admin_or_owner(project, user):
+        return
+    forbidden = [task.id for task in tasks if user.id not in (task.creator_id, task.assignee_id)]
+    if forbidden:
+        raise PermissionDeniedError(f"Нет прав на изменение задач: {forbidden}")
+
 
-    if new_position < old_position:
-        Task.objects.filter(
-            project=project,
-            position__gte=new_position,
-            position__lt=old_position,
-        ).update(position=F("position") + 1)
+@transaction.atomic
+def bulk_update_tasks(
+    *,
+    project: Project,
+    task_ids: list[int],
+    updated_by: User,
+    operation: str,
+    status: str | None = None,
+    priority: str | None = None,
+    assignee: User | None = None,
+    tag_ids: list[int] | None = None,
+) -> list[int]:
+    """
+    Одна операция над пачкой задач проекта: строки блокируются и проверяются одним
+    запросом, изменение — одним UPDATE. Счётчики меняются по разу на значение и
+    исполнителя, письма группируются по пользователю, событие — одно на проект.
+    Возвращает id задач, которые действительно изменились.
+    """
+    if operation not in BULK_OPERATIONS:
+        raise ValidationError(f"Неизвестная операция: {operation}")
+
+    tasks = list(selectors.filter_by_ids_for_update(project, task_ids))
+    missing = set(task_ids) - {task.id for task in tasks}
+    if missing:
+        raise NotFoundError(f"Задачи не найдены в проекте: {sorted(missing)}")
+    _check_can_edit_tasks(project, tasks, updated_by)
+
+    if operation == "status":
+        changed = _bulk_change_status(project, tasks, status)
+    elif operation == "priority":
+        changed = _bulk_change_priority(project, tasks, priority)
+    elif operation == "assignee":
+        changed = _bulk_assign(project, tasks, assignee)
     else:
-        Task.objects.filter(
-            project=project,
-            position__gt=old_position,
-            position__lte=new_position,
-        ).update(position=F("position") - 1)
+        tag_services.replace_tags_for_tasks(
+            project=project, task_ids=[task.id for task in tasks], tag_ids=tag_ids or []
+        )
+        changed = tasks
+
+    if not changed:
+        return []
+
+    _bump_list_version(project.id)
+
+    _task_ids = [task.id for task in changed]
+    _project_id = project.id
+    _user_id = updated_by.id
+
+    def _broadcast():
+        from apps.websocket.tasks import broadcast_tasks_updated
+
+        broadcast_tasks_updated.delay(_task_ids, _project_id, _user_id)
 
-    task.position = new_position
-    task.save(update_fields=["position", "updated_at"])
+    transaction.on_commit(_broadcast)
+
+    return _task_ids
+
+
+def _bulk_change_status(project: Project, tasks: list[Task], new_status: str) -> list[Task]:
+    changed = [task for task in tasks if task.status != new_status]
+    if not changed:
+        return []
+
+    Task.objects.filter(id__in=[task.id for task in changed]).update(
+        status=new_status, updated_at=timezone.now()
+    )
+
+    old_statuses = Counter(task.status for task in changed)
+    project_services.adjust_task_counters(
+        project.id,
+        statuses={**{old: -count for old, count in old_statuses.items()}, new_status: len(changed)},
+    )
+    by_assignee = _group_by_user(changed)
+    for user_id in sorted(by_assignee):
+        assigned = by_assignee[user_id]
+        statuses = Counter()
+        for task in assigned:
+            statuses[task.status] -= 1
+        statuses[new_status] += len(assigned)
+        user_services.adjust_task_stats(user_id, statuses=statuses)
+
+    if any(
+        task.deadline is not None
+        and (task.status in ACTIVE_STATUSES) != (new_status in ACTIVE_STATUSES)
+        for task in changed
+    ):
+        _refresh_overdue_count(project.id)
+
+    if by_assignee:
+        _notifications = _as_notifications(by_assignee)
+        _new_status = new_status
+        transaction.on_commit(
+            lambda: send_bulk_task_status_changed_emails.delay(_notifications, _new_status)
+        )
+
+    return changed
+
+
+def _bulk_change_priority(project: Project, tasks: list[Task], priority: str) -> list[Task]:
+    changed = [task for task in tasks if task.priority != priority]
+    if not changed:
+        return []
+
+    Task.objects.filter(id__in=[task.id for task in changed]).update(
+        priority=priority, updated_at=timezone.now()
+    )
+
+    old_priorities = Counter(task.priority for task in changed)
+    project_services.adjust_task_counters(
+        project.id,
+        priorities={
+            **{old: -count for old, count in old_priorities.items()},
+            priority: len(changed),
+        },
+    )
+    by_assignee = _group_by_user(changed)
+    for user_id in sorted(by_assignee):
+        high_delta = sum(
+            (priority in HIGH_PRIORITIES) - (task.priority in HIGH_PRIORITIES)
+            for task in by_assignee[user_id]
+        )
+        if high_delta:
+            user_services.adjust_task_stats(user_id, high_priority=high_delta)
+
+    return changed
+
+
+def _bulk_assign(project: Project, tasks: list[Task], assignee: User | None) -> list[Task]:
+    assignee_id = assignee.id if assignee else None
+    changed = [task for task in tasks if task.assignee_id != assignee_id]
+    if not changed:
+        return []
+
+    Task.objects.filter(id__in=[task.id for task in changed]).update(
+        assignee=assignee, updated_at=timezone.now()
+    )
+
+    previous = _group_by_user(changed)
+    moves = [(user_id, -1, assigned) for user_id, assigned in previous.items()]
+    if assignee_id is not None:
+        moves.append((assignee_id, 1, changed))
+    # строки статистики блокируются по возрастанию id, как в assign_task
+    for user_id, sign, moved in sorted(moves, key=lambda move: (move[0], move[1])):
+        _count_for_assignee(moved, user_id, sign)
+
+    _project_id = project.id
+    if previous:
+        _unassignments = _as_notifications(previous)
+        transaction.on_commit(
+            lambda: send_bulk_task_unassigned_emails.delay(_unassignments, _project_id)
+        )
+    if assignee_id is not None:
+        _assignments = [[assignee_id, [task.id for task in changed]]]
+        transaction.on_commit(
+            lambda: send_bulk_task_assigned_emails.delay(_assignments, _project_id)
+        )
+
+    return changed
+
+
+def _rank_between(before: str | None, after: str | None) -> str | None:
+    # None — места между соседями нет: одинаковые ранги или ранг длиннее колонки
+    if before is not None and after is not None and before >= after:
+        return None
+    rank = rank_between(before, after)
+    return rank if len(rank) <= RANK_MAX_LENGTH else None
+
+
+@transaction.atomic
+def reorder_task(*, task: Task, new_position: int, updated_by: User | None = None) -> Task:
+    """
+    Перемещение на место new_position (0-based): задача получает ранг между новыми
+    соседями, остальные строки не меняются.
+    """
+    before, after = selectors.get_neighbour_ranks(task.project, task.id, new_position)
+    if (before is None or before < task.order_rank) and (after is None or task.order_rank < after):
+        return task
+
+    rank = _rank_between(before, after)
+    if rank is None:
+        rebalance_ranks(task.project_id)
+        before, after = selectors.get_neighbour_ranks(task.project, task.id, new_position)
+        rank = rank_between(before, after)
+
+    task.order_rank = rank
+    task.save(update_fields=["order_rank", "updated_at"])
+    _bump_list_version(task.project_id)
 
     if updated_by:
         _task_id = task.id
@@ -238,4 +590,105 @@ def reorder_task(*, task: Task, new_position: int, updated_by: User | None = Non
 
         transaction.on_commit(_broadcast)
 
+    if needs_rebalance(rank):
+        _project_id = task.project_id
+        transaction.on_commit(lambda: rebalance_task_ranks.delay(_project_id))
+
     return task
+
+
+def _lock_project(project_id: int) -> None:
+    # NO KEY UPDATE не конфликтует с FOR KEY SHARE, который берут INSERT-ы задач по FK
+    list(
+        Project.objects.select_for_update(no_key=True)
+        .filter(id=project_id)
+        .values_list("id", flat=True)
+    )
+
+
+def _write_ranks(changes: list[tuple[int, str]]) -> None:
+    table = Task._meta.db_table
+    values = ", ".join(["(%s::bigint, %s)"] * len(changes))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} AS task SET order_rank = new.order_rank, updated_at = %s "
+            f"FROM (VALUES {values}) AS new (id, order_rank) WHERE task.id = new.id",
+            [timezone.now(), *chain.from_iterable(changes)],
+        )
+
+
+@transaction.atomic
+def bulk_reorder_tasks(*, project: Project, task_ids: list[int], updated_by: User) -> list[int]:
+    """
+    Новый порядок набора задач (например, колонки доски): задачи обмениваются рангами,
+    которые уже занимали, — одним UPDATE ... FROM (VALUES ...) под блокировкой проекта.
+    Задачи вне набора остаются на своих местах. Возвращает id задач с новым рангом.
+    """
+    _lock_project(project.id)
+    tasks = list(selectors.filter_by_ids_for_update(project, task_ids))
+    missing = set(task_ids) - {task.id for task in tasks}
+    if missing:
+        raise NotFoundError(f"Задачи не найдены в проекте: {sorted(missing)}")
+    _check_can_edit_tasks(project, tasks, updated_by)
+
+    current = {task.id: task.order_rank for task in tasks}
+    if len(set(current.values())) != len(current):
+        # одинаковые ранги не задают порядок — сначала разводим их
+        rebalance_ranks(project.id)
+        current = dict(Task.objects.filter(id__in=task_ids).values_list("id", "order_rank"))
+
+    ranks = sorted(current.values())
+    changes = [
+        (task_id, rank)
+        for task_id, rank in zip(task_ids, ranks, strict=True)
+        if current[task_id] != rank
+    ]
+    if not changes:
+        return []
+
+    _write_ranks(changes)
+    _bump_list_version(project.id)
+
+    _task_ids = list(task_ids)
+    _project_id = project.id
+    _user_id = updated_by.id
+
+    def _broadcast():
+        from apps.websocket.tasks import broadcast_tasks_reordered
+
+        broadcast_tasks_reordered.delay(_task_ids, _project_id, _user_id)
+
+    transaction.on_commit(_broadcast)
+
+    return [task_id for task_id, _ in changes]
+
+
+@transaction.atomic
+def rebalance_ranks(project_id: int) -> int:
+    """
+    Переписывает ранги задач проекта в слоты 1..n, сохраняя порядок, когда ранги
+    удлинились от перемещений в одно место. Задачи проекта блокируются до коммита.
+    Счётчик слотов не сбрасывается: n не больше уже выданных слотов.
+    """
+    _lock_project(project_id)
+    # строки блокируются по id, как в filter_by_ids_for_update, иначе пересечение с пачкой
+    # задач дедлокается; порядок TASK_ORDERING восстанавливаем в Python (ранги — ASCII, как "C")
+    tasks = list(
+        Task.objects.select_for_update()
+        .filter(project_id=project_id)
+        .order_by("id")
+        .only("id", "order_rank", "created_at")
+    )
+    tasks.sort(key=lambda task: (task.created_at, task.id), reverse=True)
+    tasks.sort(key=lambda task: task.order_rank)
+    changed = []
+    for slot, task in enumerate(tasks, start=1):
+        rank = rank_for_slot(slot)
+        if task.order_rank != rank:
+            task.order_rank = rank
+            changed.append(task)
+
+    Task.objects.bulk_update(changed, ["order_rank"], batch_size=1000)
+    if changed:
+        _bump_list_version(project_id)
+    return len(changed)
@@ -33,6 +33,46 @@ def send_task_assigned_email(
     )
 
 
+@shared_task
+def send_bulk_task_assigned_emails(assignments: list[list], project_id: int) -> None:
+    """Одно письмо каждому исполнителю: assignments — пары [user_id, [task_id, ...]]."""
+    try:
+        project = Project.objects.get(id=project_id)
+    except Project.DoesNotExist:
+        logger.warning(f"Failed to send bulk assigned emails: project_id={project_id}")
+        return
+
+    users = User.objects.in_bulk([user_id for user_id, _ in assignments])
+    for user_id, task_ids in assignments:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        logger.info(
+            f"Sending task assigned email to {user.email} "
+            f'for {len(task_ids)} tasks in project "{project.name}"'
+        )
+
+
+@shared_task
+def send_bulk_task_unassigned_emails(unassignments: list[list], project_id: int) -> None:
+    """Одно письмо каждому бывшему исполнителю: пары [user_id, [task_id, ...]]."""
+    try:
+        project = Project.objects.get(id=project_id)
+    except Project.DoesNotExist:
+        logger.warning(f"Failed to send bulk unassigned emails: project_id={project_id}")
+        return
+
+    users = User.objects.in_bulk([user_id for user_id, _ in unassignments])
+    for user_id, task_ids in unassignments:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        logger.info(
+            f"Sending task unassigned email to {user.email} "
+            f'for {len(task_ids)} tasks in project "{project.name}"'
+        )
+
+
 @shared_task
 def send_task_unassigned_email(
     user_id: int,
@@ -71,3 +111,26 @@ def send_task_status_changed_email(
         f"Sending task status changed email to {user.email} "
         f'for task "{task.title}": {old_status} -> {new_status}'
     )
+
+
+@shared_task
+def send_bulk_task_status_changed_emails(notifications: list[list], new_status: str) -> None:
+    """Одно письмо каждому исполнителю: пары [user_id, [task_id, ...]]."""
+    users = User.objects.in_bulk([user_id for user_id, _ in notifications])
+    for user_id, task_ids in notifications:
+        user = users.get(user_id)
+        if user is None:
+            logger.warning(f"Failed to send bulk status changed email: user_id={user_id}")
+            continue
+        logger.info(
+            f"Sending task status changed email to {user.email} "
+            f"for {len(task_ids)} tasks: -> {new_status}"
+        )
+
+
+@shared_task
+def rebalance_task_ranks(project_id: int) -> None:
+    from . import services
+
+    rewritten = services.rebalance_ranks(project_id)
+    logger.info(f"Task ranks rebalanced: project_id={project_id}, tasks={rewritten}")
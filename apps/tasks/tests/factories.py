@@ -3,6 +3,7 @@ from factory.django import DjangoModelFactory
 
 from apps.projects.tests.factories import ProjectFactory
 from apps.tasks.models import Task
+from core.ranking import rank_for_slot
 
 
 class TaskFactory(DjangoModelFactory):
@@ -15,4 +16,4 @@ class TaskFactory(DjangoModelFactory):
     description = factory.Faker("paragraph")
     status = Task.Status.PENDING
     priority = Task.Priority.MEDIUM
-    position = factory.Sequence(lambda n: n)
+    order_rank = factory.Sequence(lambda n: rank_for_slot(n + 1))
@@ -1,14 +1,22 @@
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
+from apps.projects import services as project_services
 from apps.projects.models import ProjectMember
 from apps.projects.tests.factories import ProjectFactory, ProjectMemberFactory
 from apps.tags.tests.factories import TagFactory
+from apps.tasks import selectors, services
 from apps.tasks.models import Task
 from apps.users.tests.factories import UserFactory
+from core.pagination import estimate_count
+from core.ranking import rank_for_slot
 
 from .factories import TaskFactory
 
@@ -44,6 +52,433 @@ class TestTaskListAPI:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_list_not_modified_for_matching_etag(self, api_client, project_for_tasks):
+        TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_list_etag_changes_with_tasks(self, api_client, project_for_tasks, locmem_cache):
+        task = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        etag = api_client.get(url)["ETag"]
+
+        services.change_status(task=task, new_status=Task.Status.COMPLETED)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["results"][0]["status"] == Task.Status.COMPLETED
+
+    def test_list_page_served_from_cache(self, api_client, project_for_tasks, locmem_cache):
+        TaskFactory.create_batch(2, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        first = api_client.get(url, {"status": Task.Status.PENDING, "page": 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get(url, {"page": 1, "status": Task.Status.PENDING})
+
+        assert second.data == first.data
+        assert not [q for q in queries.captured_queries if "tasks_task" in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestTaskSparseFieldsetAPI:
+    def test_fields_skip_relations(self, api_client, project_for_tasks):
+        tag = TagFactory()
+        for task in TaskFactory.create_batch(2, project=project_for_tasks):
+            task.tags.add(tag)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,title,status,order_rank"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "title", "status", "order_rank"}
+        task_queries = [q["sql"] for q in queries.captured_queries if "tasks_task" in q["sql"]]
+        assert not [sql for sql in task_queries if "users_user" in sql or "tags_tag" in sql]
+
+    def test_unexpanded_relations_rendered_as_ids(self, api_client, project_for_tasks):
+        tag = TagFactory()
+        task = TaskFactory(project=project_for_tasks)
+        task.tags.add(tag)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url, {"expand": "assignee"})
+
+        result = response.data["results"][0]
+        assert result["creator"] == task.creator_id
+        assert result["assignee"] is None
+        assert result["tags"] == [tag.id]
+
+    def test_expand_renders_nested_objects(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url, {"fields": "id,creator", "expand": "creator"})
+
+        assert response.data["results"][0]["creator"]["id"] == task.creator_id
+
+    def test_unknown_field_rejected(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url, {"fields": "id,password", "expand": "status"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestTaskEstimatedCountAPI:
+    def test_small_list_counted_exactly(self, api_client, project_for_tasks):
+        TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url)
+
+        assert response.data["count"] == 3
+        assert response.data["count_is_exact"] is True
+
+    def test_large_list_uses_planner_estimate(self, api_client, project_for_tasks, settings):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 100
+        TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        with (
+            patch("core.pagination.estimate_count", return_value=150000),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            response = api_client.get(url, {"page_size": 2})
+
+        assert response.data["count"] == 150000
+        assert response.data["count_is_exact"] is False
+        assert response.data["next"] is not None
+        assert not [q for q in queries.captured_queries if "COUNT(" in q["sql"]]
+
+    def test_pages_past_low_estimate_reachable(self, api_client, project_for_tasks, settings):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 0
+        TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        with patch("core.pagination.estimate_count", return_value=1):
+            second = api_client.get(url, {"page_size": 1, "page": 2})
+            third = api_client.get(url, {"page_size": 1, "page": 3})
+            fourth = api_client.get(url, {"page_size": 1, "page": 4})
+
+        assert second.data["next"] is not None
+        assert len(third.data["results"]) == 1
+        assert third.data["next"] is None
+        assert fourth.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unfiltered_list_counted_from_project_stats(self, api_client, settings):
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 0
+        owner = UserFactory(is_verified=True)
+        project = project_services.create_project(owner=owner, name="Stats")
+        for title in ("A", "B", "C"):
+            services.create_task(project=project, creator=owner, title=title)
+        api_client.force_authenticate(user=owner)
+        url = reverse("task-list", kwargs={"project_pk": project.pk})
+
+        with (
+            patch("core.pagination.estimate_count", return_value=150000) as estimate,
+            CaptureQueriesContext(connection) as queries,
+        ):
+            response = api_client.get(url, {"page_size": 2})
+            filtered = api_client.get(url, {"status": "pending", "page_size": 2})
+
+        assert response.data["count"] == 3
+        assert response.data["count_is_exact"] is True
+        assert response.data["next"] is not None
+        assert not [q for q in queries.captured_queries if "COUNT(" in q["sql"]]
+        # фильтрованный список по-прежнему оценивает планировщик
+        estimate.assert_called_once()
+        assert filtered.data["count"] == 150000
+
+    def test_planner_estimate(self, project_for_tasks):
+        assert isinstance(estimate_count(Task.objects.filter(project=project_for_tasks)), int)
+
+
+@pytest.mark.django_db
+class TestTaskKeysetPaginationAPI:
+    def _walk(self, api_client, url, params):
+        ids = []
+        response = api_client.get(url, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            ids.extend(t["id"] for t in response.data["results"])
+            if not response.data["next"]:
+                return ids, response
+            response = api_client.get(response.data["next"])
+
+    def test_pages_follow_list_ordering(self, api_client, project_for_tasks):
+        # одинаковые order_rank — порядок решают created_at и id
+        TaskFactory.create_batch(3, project=project_for_tasks, order_rank=rank_for_slot(1))
+        TaskFactory.create_batch(2, project=project_for_tasks, order_rank=rank_for_slot(2))
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        expected = [t["id"] for t in api_client.get(url).data["results"]]
+
+        ids, _ = self._walk(api_client, url, {"pagination": "keyset", "page_size": 2})
+
+        assert ids == expected
+
+    def test_previous_returns_prior_page(self, api_client, project_for_tasks):
+        TaskFactory.create_batch(5, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        first = api_client.get(url, {"pagination": "keyset", "page_size": 2})
+        second = api_client.get(first.data["next"])
+
+        response = api_client.get(second.data["previous"])
+
+        assert first.data["previous"] is None
+        assert response.data["results"] == first.data["results"]
+
+    def test_no_count_query(self, api_client, project_for_tasks):
+        TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"pagination": "keyset"})
+
+        assert "count" not in response.data
+        assert not [q for q in queries.captured_queries if "COUNT(" in q["sql"]]
+
+    def test_invalid_cursor(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url, {"cursor": "garbage"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestTaskDeadlineAPI:
+    def _create(self, project, days, **kwargs):
+        return TaskFactory(
+            project=project, deadline=timezone.now() + timedelta(days=days), **kwargs
+        )
+
+    def test_overdue_returns_active_tasks_by_deadline(self, api_client, project_for_tasks):
+        late = self._create(project_for_tasks, -5)
+        later = self._create(project_for_tasks, -1, status=Task.Status.IN_PROGRESS)
+        self._create(project_for_tasks, -3, status=Task.Status.COMPLETED)
+        self._create(project_for_tasks, 2)
+        TaskFactory(project=project_for_tasks, deadline=None)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-overdue", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        assert [t["id"] for t in response.data["results"]] == [late.id, later.id]
+
+    def test_overdue_pages_by_cursor(self, api_client, project_for_tasks):
+        tasks = [self._create(project_for_tasks, -days) for days in (4, 3, 2, 1)]
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-overdue", kwargs={"project_pk": project_for_tasks.pk})
+
+        first = api_client.get(url, {"page_size": 3})
+        second = api_client.get(first.data["next"])
+
+        ids = [t["id"] for t in first.data["results"] + second.data["results"]]
+        assert ids == [t.id for t in tasks]
+        assert second.data["next"] is None
+
+    def test_due_soon_window(self, api_client, project_for_tasks):
+        soon = self._create(project_for_tasks, 2)
+        self._create(project_for_tasks, 10)
+        self._create(project_for_tasks, -1)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-due-soon", kwargs={"project_pk": project_for_tasks.pk})
+
+        week = api_client.get(url)
+        month = api_client.get(url, {"days": 30})
+
+        assert [t["id"] for t in week.data["results"]] == [soon.id]
+        assert len(month.data["results"]) == 2
+
+    @pytest.mark.parametrize("days", ["0", "91", "abc"])
+    def test_due_soon_invalid_days(self, api_client, project_for_tasks, days):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-due-soon", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url, {"days": days})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_overdue_non_member(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=UserFactory(is_verified=True))
+        url = reverse("task-overdue", kwargs={"project_pk": project_for_tasks.pk})
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_my_overdue_across_projects(self, api_client, task_with_assignee):
+        task, assignee = task_with_assignee
+        Task.objects.filter(id=task.id).update(deadline=timezone.now() - timedelta(days=1))
+        other = ProjectFactory()
+        ProjectMemberFactory(project=other, user=assignee)
+        mine = self._create(other, -2, assignee=assignee)
+        self._create(other, -3)
+        left = ProjectFactory()
+        self._create(left, -4, assignee=assignee)
+        api_client.force_authenticate(user=assignee)
+
+        response = api_client.get(reverse("me-task-overdue"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.data["results"]] == [mine.id, task.id]
+        assert response.data["results"][0]["project"] == other.id
+
+    @pytest.mark.django_db(transaction=True)
+    def test_overdue_count_refreshed_by_services(self, api_client, project_for_tasks, locmem_cache):
+        task = self._create(project_for_tasks, -1)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-overdue", kwargs={"project_pk": project_for_tasks.pk})
+        assert api_client.get(url).data["count"] == 1
+
+        services.change_status(
+            task=task, new_status=Task.Status.COMPLETED, updated_by=project_for_tasks.owner
+        )
+        assert api_client.get(url).data["count"] == 0
+
+        services.change_status(
+            task=task, new_status=Task.Status.PENDING, updated_by=project_for_tasks.owner
+        )
+        services.update_task(
+            task=task,
+            updated_by=project_for_tasks.owner,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        assert api_client.get(url).data["count"] == 0
+
+    def test_overdue_count_expires_at_next_deadline(self, project_for_tasks, locmem_cache):
+        self._create(project_for_tasks, -1)
+        self._create(project_for_tasks, 1)
+        assert selectors.get_overdue_count(project_for_tasks) == 1
+
+        tomorrow = timezone.now() + timedelta(days=2)
+        with patch("apps.tasks.selectors.timezone.now", return_value=tomorrow):
+            assert selectors.get_overdue_count(project_for_tasks) == 2
+
+
+@pytest.mark.django_db
+class TestMyTaskListAPI:
+    @pytest.fixture
+    def assignee(self, project_for_tasks):
+        user = UserFactory(is_verified=True)
+        ProjectMemberFactory(project=project_for_tasks, user=user)
+        return user
+
+    def _create(self, project, user, days=None, **kwargs):
+        deadline = timezone.now() + timedelta(days=days) if days is not None else None
+        return TaskFactory(project=project, assignee=user, deadline=deadline, **kwargs)
+
+    def _walk(self, api_client, params):
+        ids = []
+        response = api_client.get(reverse("me-task-list"), params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            ids.extend(t["id"] for t in response.data["results"])
+            if not response.data["next"]:
+                return ids, response
+            response = api_client.get(response.data["next"])
+
+    def test_lists_tasks_across_projects_by_deadline(self, api_client, project_for_tasks, assignee):
+        other = ProjectFactory()
+        ProjectMemberFactory(project=other, user=assignee)
+        without_deadline = self._create(project_for_tasks, assignee)
+        later = self._create(other, assignee, days=3)
+        sooner = self._create(project_for_tasks, assignee, days=1)
+        self._create(project_for_tasks, UserFactory(), days=1)
+        self._create(ProjectFactory(), assignee, days=1)
+        api_client.force_authenticate(user=assignee)
+
+        response = api_client.get(reverse("me-task-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.data["results"]] == [
+            sooner.id,
+            later.id,
+            without_deadline.id,
+        ]
+        assert response.data["results"][1]["project"] == other.id
+
+    def test_pages_through_tasks_without_deadline(self, api_client, project_for_tasks, assignee):
+        with_deadline = [self._create(project_for_tasks, assignee, days=d) for d in (1, 2, 3)]
+        without_deadline = [self._create(project_for_tasks, assignee) for _ in range(3)]
+        api_client.force_authenticate(user=assignee)
+
+        ids, last = self._walk(api_client, {"page_size": 2})
+        previous = api_client.get(last.data["previous"])
+
+        assert ids == [t.id for t in with_deadline + without_deadline]
+        assert [t["id"] for t in previous.data["results"]] == [
+            with_deadline[2].id,
+            without_deadline[0].id,
+        ]
+
+    def test_filters(self, api_client, project_for_tasks, assignee):
+        match = self._create(project_for_tasks, assignee, days=2, priority="high")
+        self._create(project_for_tasks, assignee, days=2, priority="low")
+        self._create(project_for_tasks, assignee, days=2, priority="high", status="completed")
+        self._create(project_for_tasks, assignee, days=20, priority="high")
+        self._create(project_for_tasks, assignee, priority="high")
+        api_client.force_authenticate(user=assignee)
+
+        ids, _ = self._walk(
+            api_client,
+            {
+                "status": "pending",
+                "priority": "high",
+                "deadline_before": (timezone.now() + timedelta(days=7)).isoformat(),
+            },
+        )
+
+        assert ids == [match.id]
+
+    def test_invalid_filter(self, api_client, assignee):
+        api_client.force_authenticate(user=assignee)
+
+        response = api_client.get(reverse("me-task-list"), {"status": "unknown"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_membership_checked_in_one_query(self, api_client, assignee):
+        for _ in range(3):
+            project = ProjectFactory()
+            ProjectMemberFactory(project=project, user=assignee)
+            self._create(project, assignee, days=1)
+        api_client.force_authenticate(user=assignee)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("me-task-list"))
+
+        assert len(response.data["results"]) == 3
+        membership_queries = [
+            q for q in queries.captured_queries if "projects_projectmember" in q["sql"]
+        ]
+        assert len(membership_queries) == 1
+
 
 @pytest.mark.django_db
 class TestTaskCreateAPI:
@@ -88,6 +523,188 @@ class TestTaskCreateAPI:
         assert response.data["assignee"]["id"] == project_member_user.id
 
 
+@pytest.mark.django_db
+class TestTaskBulkCreateAPI:
+    def _url(self, project):
+        return reverse("task-bulk-create", kwargs={"project_pk": project.pk})
+
+    def test_bulk_create_success(self, api_client, project_for_tasks, project_member_user):
+        TaskFactory(project=project_for_tasks, order_rank=rank_for_slot(3))
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {
+            "tasks": [
+                {"title": "First", "priority": Task.Priority.HIGH},
+                {"title": "Second", "assignee_id": project_member_user.id},
+            ]
+        }
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [t["title"] for t in response.data] == ["First", "Second"]
+        assert [t["order_rank"] for t in response.data] == [rank_for_slot(4), rank_for_slot(5)]
+        assert response.data[1]["assignee"]["id"] == project_member_user.id
+
+    def test_bulk_create_queries_do_not_grow(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = self._url(project_for_tasks)
+
+        def post(count):
+            data = {"tasks": [{"title": f"Task {i}"} for i in range(count)]}
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(url, data, format="json")
+            assert response.status_code == status.HTTP_201_CREATED
+            return len(queries)
+
+        post(1)  # первый запрос создаёт счётчик слотов проекта
+        assert post(2) == post(40)
+
+    def test_invalid_row_creates_nothing(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"tasks": [{"title": "Valid"}, {"title": "Bad", "priority": "asap"}]}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "priority" in response.data["tasks"][1]
+        assert not Task.objects.filter(project=project_for_tasks).exists()
+
+    def test_non_member_assignee(self, api_client, project_for_tasks):
+        outsider = UserFactory(is_verified=True)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"tasks": [{"title": "A"}, {"title": "B", "assignee_id": outsider.id}]}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["tasks"][0] == {}
+        assert "assignee_id" in response.data["tasks"][1]
+        assert not Task.objects.filter(project=project_for_tasks).exists()
+
+    def test_empty_list(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+
+        response = api_client.post(self._url(project_for_tasks), {"tasks": []}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_viewer_forbidden(self, api_client, project_for_tasks, project_viewer_user):
+        api_client.force_authenticate(user=project_viewer_user)
+
+        response = api_client.post(
+            self._url(project_for_tasks), {"tasks": [{"title": "Task"}]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestTaskBulkUpdateAPI:
+    def _url(self, project):
+        return reverse("task-bulk-update", kwargs={"project_pk": project.pk})
+
+    def test_bulk_status_success(self, api_client, project_for_tasks):
+        tasks = TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {
+            "task_ids": [task.id for task in tasks],
+            "operation": "status",
+            "status": Task.Status.COMPLETED,
+        }
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {t["status"] for t in response.data} == {Task.Status.COMPLETED}
+
+    def test_bulk_update_queries_do_not_grow(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = self._url(project_for_tasks)
+
+        def post(count, priority):
+            tasks = TaskFactory.create_batch(count, project=project_for_tasks)
+            data = {
+                "task_ids": [task.id for task in tasks],
+                "operation": "priority",
+                "priority": priority,
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(url, data, format="json")
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        assert post(2, Task.Priority.HIGH) == post(30, Task.Priority.URGENT)
+
+    def test_bulk_tags(self, api_client, project_for_tasks):
+        tasks = TaskFactory.create_batch(2, project=project_for_tasks)
+        old_tag, new_tag = TagFactory.create_batch(2, project=project_for_tasks)
+        tasks[0].tags.add(old_tag)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {
+            "task_ids": [task.id for task in tasks],
+            "operation": "tags",
+            "tag_ids": [new_tag.id],
+        }
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [[tag["id"] for tag in t["tags"]] for t in response.data] == [[new_tag.id]] * 2
+
+    def test_foreign_tag(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        foreign_tag = TagFactory()
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"task_ids": [task.id], "operation": "tags", "tag_ids": [foreign_tag.id]}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_missing_operation_value(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"task_ids": [task.id], "operation": "assignee"}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "assignee_id" in response.data
+
+    def test_non_member_assignee(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        outsider = UserFactory(is_verified=True)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"task_ids": [task.id], "operation": "assignee", "assignee_id": outsider.id}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_member_foreign_task_forbidden(
+        self, api_client, project_for_tasks, project_member_user
+    ):
+        own = TaskFactory(project=project_for_tasks, creator=project_member_user)
+        foreign = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_member_user)
+        data = {"task_ids": [own.id, foreign.id], "operation": "priority", "priority": "low"}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        own.refresh_from_db()
+        assert own.priority != "low"
+
+    def test_task_from_other_project(self, api_client, project_for_tasks):
+        other = TaskFactory()
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"task_ids": [other.id], "operation": "priority", "priority": "low"}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.django_db
 class TestTaskDetailAPI:
     def test_retrieve_task_success(self, api_client, project_for_tasks, task):
@@ -204,6 +821,21 @@ class TestTaskStatusAPI:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["status"] == Task.Status.IN_PROGRESS
 
+    def test_change_status_loads_rows_once(self, api_client, project_for_tasks, task):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = reverse("task-status", kwargs={"project_pk": project_for_tasks.pk, "pk": task.pk})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(url, {"status": Task.Status.IN_PROGRESS})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == Task.Status.IN_PROGRESS
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        task_selects = [sql for sql in selects if 'FROM "tasks_task"' in sql]
+        project_selects = [sql for sql in selects if 'FROM "projects_project"' in sql]
+        assert len(task_selects) == 1
+        assert len(project_selects) == 1
+
 
 @pytest.mark.django_db
 class TestTaskAssignAPI:
@@ -232,15 +864,88 @@ class TestTaskAssignAPI:
 
 @pytest.mark.django_db
 class TestTaskReorderAPI:
-    def test_reorder_task_success(self, api_client, project_for_tasks, task):
-        api_client.force_authenticate(user=task.creator)
-        url = reverse("task-reorder", kwargs={"project_pk": project_for_tasks.pk, "pk": task.pk})
-        data = {"position": 10}
+    def test_reorder_task_success(self, api_client, project_for_tasks):
+        first, second, third = TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=third.creator)
+        url = reverse("task-reorder", kwargs={"project_pk": project_for_tasks.pk, "pk": third.pk})
 
-        response = api_client.post(url, data)
+        response = api_client.post(url, {"position": 0})
 
         assert response.status_code == status.HTTP_200_OK
-        assert response.data["position"] == 10
+        assert response.data["order_rank"] < first.order_rank
+        list_url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        ids = [t["id"] for t in api_client.get(list_url).data["results"]]
+        assert ids == [third.id, first.id, second.id]
+
+
+@pytest.mark.django_db
+class TestTaskBulkReorderAPI:
+    def _url(self, project):
+        return reverse("task-bulk-reorder", kwargs={"project_pk": project.pk})
+
+    def test_bulk_reorder_success(self, api_client, project_for_tasks):
+        first, second, third = TaskFactory.create_batch(3, project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        data = {"task_ids": [third.id, first.id, second.id]}
+
+        response = api_client.post(self._url(project_for_tasks), data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.data] == data["task_ids"]
+        list_url = reverse("task-list", kwargs={"project_pk": project_for_tasks.pk})
+        ids = [t["id"] for t in api_client.get(list_url).data["results"]]
+        assert ids == data["task_ids"]
+
+    def test_bulk_reorder_queries_do_not_grow(self, api_client, project_for_tasks):
+        api_client.force_authenticate(user=project_for_tasks.owner)
+        url = self._url(project_for_tasks)
+
+        def post(count):
+            tasks = TaskFactory.create_batch(count, project=project_for_tasks)
+            data = {"task_ids": [task.id for task in reversed(tasks)]}
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(url, data, format="json")
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        assert post(2) == post(30)
+
+    def test_duplicate_ids(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_for_tasks.owner)
+
+        response = api_client.post(
+            self._url(project_for_tasks), {"task_ids": [task.id, task.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "task_ids" in response.data
+
+    def test_member_foreign_task_forbidden(
+        self, api_client, project_for_tasks, project_member_user
+    ):
+        own = TaskFactory(project=project_for_tasks, creator=project_member_user)
+        foreign = TaskFactory(project=project_for_tasks)
+        api_client.force_authenticate(user=project_member_user)
+
+        response = api_client.post(
+            self._url(project_for_tasks), {"task_ids": [foreign.id, own.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        own.refresh_from_db()
+        assert own.order_rank < foreign.order_rank
+
+    def test_task_from_other_project(self, api_client, project_for_tasks):
+        task = TaskFactory(project=project_for_tasks)
+        other = TaskFactory()
+        api_client.force_authenticate(user=project_for_tasks.owner)
+
+        response = api_client.post(
+            self._url(project_for_tasks), {"task_ids": [other.id, task.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 @pytest.mark.django_db
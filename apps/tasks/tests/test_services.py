@@ -1,14 +1,24 @@
+import threading
 from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from apps.projects import selectors as project_selectors
+from apps.projects import services as project_services
 from apps.projects.models import ProjectMember
 from apps.projects.tests.factories import ProjectFactory, ProjectMemberFactory
 from apps.tasks import services
-from apps.tasks.models import Task
+from apps.tasks.models import Task, TaskRankCounter
+from apps.users import selectors as user_selectors
+from apps.users import services as user_services
+from apps.users.models import UserTaskStats
 from apps.users.tests.factories import UserFactory
+from core.exceptions import NotFoundError, PermissionDeniedError
+from core.ranking import rank_for_slot
 
 from .factories import TaskFactory
 
@@ -32,9 +42,9 @@ class TestCreateTask:
         assert task.project == project
         assert task.status == Task.Status.PENDING
 
-    def test_create_task_auto_position(self):
+    def test_create_task_appends_rank(self):
         project = ProjectFactory()
-        TaskFactory(project=project, position=5)
+        TaskFactory(project=project, order_rank=rank_for_slot(5))
 
         task = services.create_task(
             project=project,
@@ -42,7 +52,7 @@ class TestCreateTask:
             title="New Task",
         )
 
-        assert task.position == 6
+        assert task.order_rank == rank_for_slot(6)
 
     @pytest.mark.django_db(transaction=True)
     def test_create_task_with_assignee_sends_email(self):
@@ -62,6 +72,269 @@ class TestCreateTask:
         mock_email.assert_called_once()
 
 
+@pytest.mark.django_db(transaction=True)
+class TestAllocateSlots:
+    WRITERS = 50
+
+    def _run_in_parallel(self, func, writers: int) -> None:
+        # все потоки стартуют одновременно, у каждого своё соединение и своя транзакция
+        barrier = threading.Barrier(writers)
+        errors = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                func(index)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    def test_counter_continues_existing_ranks(self):
+        project = ProjectFactory()
+        TaskFactory(project=project, order_rank=rank_for_slot(7))
+
+        assert services.allocate_slots(project, 3) == range(8, 11)
+        assert services.allocate_slots(project, 1) == range(11, 12)
+        assert TaskRankCounter.objects.get(project=project).last_slot == 11
+
+    def test_parallel_creates_get_distinct_ranks(self):
+        project = ProjectFactory()
+
+        with patch("apps.websocket.tasks.broadcast_task_created.delay"):
+            self._run_in_parallel(
+                lambda index: services.create_task(
+                    project=project, creator=project.owner, title=f"Task {index}"
+                ),
+                self.WRITERS,
+            )
+
+        ranks = list(Task.objects.filter(project=project).values_list("order_rank", flat=True))
+        assert len(ranks) == self.WRITERS
+        assert len(set(ranks)) == self.WRITERS
+
+    def test_parallel_bulk_creates_get_disjoint_ranges(self):
+        project = ProjectFactory()
+        writers, size = 10, 5
+
+        with patch("apps.websocket.tasks.broadcast_tasks_created.delay"):
+            self._run_in_parallel(
+                lambda index: services.bulk_create_tasks(
+                    project=project,
+                    creator=project.owner,
+                    tasks=[{"title": f"Task {index}.{i}"} for i in range(size)],
+                ),
+                writers,
+            )
+
+        ranks = list(Task.objects.filter(project=project).values_list("order_rank", flat=True))
+        assert sorted(ranks) == [rank_for_slot(slot) for slot in range(1, writers * size + 1)]
+
+
+@pytest.mark.django_db
+class TestBulkCreateTasks:
+    def test_allocates_contiguous_ranks(self):
+        project = ProjectFactory()
+        TaskFactory(project=project, order_rank=rank_for_slot(5))
+
+        tasks = services.bulk_create_tasks(
+            project=project,
+            creator=project.owner,
+            tasks=[{"title": "A"}, {"title": "B"}, {"title": "C"}],
+        )
+
+        assert [task.order_rank for task in tasks] == [rank_for_slot(slot) for slot in (6, 7, 8)]
+        assert Task.objects.filter(project=project).count() == 4
+
+    def test_keeps_counters(self):
+        owner = UserFactory(is_verified=True)
+        project = project_services.create_project(owner=owner, name="Bulk")
+        assignee = UserFactory(is_verified=True)
+        with patch("apps.projects.services.update_membership_cache"):
+            project_services.add_member(project=project, user=assignee)
+        user_services.reconcile_user_task_stats(assignee.id)
+
+        services.bulk_create_tasks(
+            project=project,
+            creator=owner,
+            tasks=[
+                {"title": "A", "priority": "urgent", "assignee_id": assignee.id},
+                {"title": "B", "assignee_id": assignee.id},
+                {"title": "C", "priority": "low"},
+            ],
+        )
+
+        project.stats.refresh_from_db()
+        assert project.stats.counters() == project_selectors.count_project_stats(project.id)
+        assert project.stats.total_tasks == 3
+        stats = UserTaskStats.objects.get(user=assignee)
+        assert stats.as_dict() == user_selectors.count_user_task_stats(assignee.id)
+        assert stats.total_assigned == 2
+        assert stats.high_priority == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_side_effects_batched(self):
+        project = ProjectFactory()
+        first, second = UserFactory.create_batch(2, is_verified=True)
+        for user in (first, second):
+            ProjectMemberFactory(project=project, user=user, role=ProjectMember.Role.MEMBER)
+        rows = [{"title": f"Task {i}", "assignee_id": (first, second)[i % 2].id} for i in range(6)]
+
+        with (
+            patch("apps.websocket.tasks.broadcast_tasks_created.delay") as mock_broadcast,
+            patch("apps.tasks.services.send_bulk_task_assigned_emails.delay") as mock_email,
+            patch("apps.tasks.services.send_task_assigned_email.delay") as mock_single,
+        ):
+            tasks = services.bulk_create_tasks(project=project, creator=project.owner, tasks=rows)
+
+        mock_broadcast.assert_called_once_with(
+            [task.id for task in tasks], project.id, project.owner.id
+        )
+        mock_email.assert_called_once()
+        assignments = dict(mock_email.call_args[0][0])
+        assert assignments[first.id] == [tasks[0].id, tasks[2].id, tasks[4].id]
+        assert assignments[second.id] == [tasks[1].id, tasks[3].id, tasks[5].id]
+        mock_single.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestBulkUpdateTasks:
+    def _project(self):
+        owner = UserFactory(is_verified=True)
+        project = project_services.create_project(owner=owner, name="Bulk")
+        members = UserFactory.create_batch(2, is_verified=True)
+        with patch("apps.projects.services.update_membership_cache"):
+            for member in members:
+                project_services.add_member(project=project, user=member)
+        for member in members:
+            user_services.reconcile_user_task_stats(member.id)
+        return project, members
+
+    def _assert_counters(self, project, users):
+        project.stats.refresh_from_db()
+        assert project.stats.counters() == project_selectors.count_project_stats(project.id)
+        for user in users:
+            # last_task_created при снятии не откатывается — как и в assign_task
+            stats = UserTaskStats.objects.get(user=user).as_dict()
+            expected = user_selectors.count_user_task_stats(user.id)
+            assert {name: stats[name] for name in UserTaskStats.COUNTERS} == {
+                name: expected[name] for name in UserTaskStats.COUNTERS
+            }
+
+    def _create(self, project, assignees, **kwargs):
+        rows = [{"title": f"Task {i}", "assignee_id": user.id} for i, user in enumerate(assignees)]
+        with patch("apps.tasks.services.send_bulk_task_assigned_emails.delay"):
+            return services.bulk_create_tasks(
+                project=project, creator=project.owner, tasks=[{**row, **kwargs} for row in rows]
+            )
+
+    def test_status_keeps_counters(self):
+        project, (first, second) = self._project()
+        tasks = self._create(project, [first, first, second])
+        services.change_status(task=tasks[0], new_status=Task.Status.IN_PROGRESS)
+
+        changed = services.bulk_update_tasks(
+            project=project,
+            task_ids=[task.id for task in tasks],
+            updated_by=project.owner,
+            operation="status",
+            status=Task.Status.IN_PROGRESS,
+        )
+
+        assert changed == [tasks[1].id, tasks[2].id]
+        assert set(Task.objects.values_list("status", flat=True)) == {Task.Status.IN_PROGRESS}
+        self._assert_counters(project, [first, second])
+
+    def test_priority_keeps_counters(self):
+        project, (first, second) = self._project()
+        tasks = self._create(project, [first, second], priority=Task.Priority.LOW)
+
+        services.bulk_update_tasks(
+            project=project,
+            task_ids=[task.id for task in tasks],
+            updated_by=project.owner,
+            operation="priority",
+            priority=Task.Priority.URGENT,
+        )
+
+        self._assert_counters(project, [first, second])
+        assert UserTaskStats.objects.get(user=first).high_priority == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_assign_moves_counters_and_groups_emails(self):
+        project, (first, second) = self._project()
+        tasks = self._create(project, [first, first, second])
+
+        with (
+            patch("apps.tasks.services.send_bulk_task_unassigned_emails.delay") as mock_unassigned,
+            patch("apps.tasks.services.send_bulk_task_assigned_emails.delay") as mock_assigned,
+            patch("apps.websocket.tasks.broadcast_tasks_updated.delay") as mock_broadcast,
+        ):
+            changed = services.bulk_update_tasks(
+                project=project,
+                task_ids=[task.id for task in tasks],
+                updated_by=project.owner,
+                operation="assignee",
+                assignee=second,
+            )
+
+        assert changed == [tasks[0].id, tasks[1].id]
+        self._assert_counters(project, [first, second])
+        assert UserTaskStats.objects.get(user=second).total_assigned == 3
+        mock_unassigned.assert_called_once_with([[first.id, changed]], project.id)
+        mock_assigned.assert_called_once_with([[second.id, changed]], project.id)
+        mock_broadcast.assert_called_once_with(changed, project.id, project.owner.id)
+
+    def test_unassign(self):
+        project, (first, second) = self._project()
+        tasks = self._create(project, [first, second])
+
+        services.bulk_update_tasks(
+            project=project,
+            task_ids=[task.id for task in tasks],
+            updated_by=project.owner,
+            operation="assignee",
+            assignee=None,
+        )
+
+        assert not Task.objects.filter(assignee__isnull=False).exists()
+        self._assert_counters(project, [first, second])
+
+    def test_member_cannot_edit_foreign_tasks(self):
+        project, (first, second) = self._project()
+        own, foreign = self._create(project, [first, second])
+
+        with pytest.raises(PermissionDeniedError):
+            services.bulk_update_tasks(
+                project=project,
+                task_ids=[own.id, foreign.id],
+                updated_by=first,
+                operation="priority",
+                priority=Task.Priority.HIGH,
+            )
+
+    def test_task_from_other_project(self):
+        project, (first, _) = self._project()
+        own = self._create(project, [first])[0]
+        other = TaskFactory()
+
+        with pytest.raises(NotFoundError):
+            services.bulk_update_tasks(
+                project=project,
+                task_ids=[own.id, other.id],
+                updated_by=project.owner,
+                operation="priority",
+                priority=Task.Priority.HIGH,
+            )
+
+
 @pytest.mark.django_db
 class TestUpdateTask:
     def test_update_task_title(self):
@@ -214,39 +487,237 @@ class TestAssignTask:
 
 @pytest.mark.django_db
 class TestReorderTask:
+    def _order(self, project):
+        return list(Task.objects.filter(project=project).values_list("id", flat=True))
+
     def test_reorder_task_move_up(self):
         project = ProjectFactory()
-        task1 = TaskFactory(project=project, position=1)
-        task2 = TaskFactory(project=project, position=2)
-        task3 = TaskFactory(project=project, position=3)
+        task1, task2, task3 = TaskFactory.create_batch(3, project=project)
 
         services.reorder_task(task=task3, new_position=1)
 
-        task1.refresh_from_db()
-        task2.refresh_from_db()
-        task3.refresh_from_db()
-        assert task3.position == 1
-        assert task1.position == 2
-        assert task2.position == 3
+        assert self._order(project) == [task1.id, task3.id, task2.id]
 
     def test_reorder_task_move_down(self):
         project = ProjectFactory()
-        task1 = TaskFactory(project=project, position=1)
-        task2 = TaskFactory(project=project, position=2)
-        task3 = TaskFactory(project=project, position=3)
+        task1, task2, task3 = TaskFactory.create_batch(3, project=project)
+
+        services.reorder_task(task=task1, new_position=2)
+
+        assert self._order(project) == [task2.id, task3.id, task1.id]
+
+    def test_reorder_task_to_top(self):
+        project = ProjectFactory()
+        task1, task2 = TaskFactory.create_batch(2, project=project)
+
+        services.reorder_task(task=task2, new_position=0)
+
+        assert self._order(project) == [task2.id, task1.id]
+
+    def test_reorder_task_past_end(self):
+        project = ProjectFactory()
+        task1, task2 = TaskFactory.create_batch(2, project=project)
+
+        services.reorder_task(task=task1, new_position=10)
+
+        assert self._order(project) == [task2.id, task1.id]
+
+    def test_reorder_rewrites_only_moved_task(self):
+        project = ProjectFactory()
+        tasks = TaskFactory.create_batch(5, project=project)
+        ranks = {task.id: task.order_rank for task in tasks}
 
-        services.reorder_task(task=task1, new_position=3)
+        services.reorder_task(task=tasks[4], new_position=1)
 
-        task1.refresh_from_db()
-        task2.refresh_from_db()
-        task3.refresh_from_db()
-        assert task1.position == 3
-        assert task2.position == 1
-        assert task3.position == 2
+        current = dict(Task.objects.filter(project=project).values_list("id", "order_rank"))
+        assert {task_id for task_id in ranks if current[task_id] != ranks[task_id]} == {tasks[4].id}
 
     def test_reorder_task_same_position_no_change(self):
-        task = TaskFactory(position=2)
+        project = ProjectFactory()
+        task1, task2 = TaskFactory.create_batch(2, project=project)
+        old_rank = task2.order_rank
+
+        result = services.reorder_task(task=task2, new_position=1)
+
+        assert result.order_rank == old_rank
+
+    def test_equal_ranks_are_rebalanced(self):
+        project = ProjectFactory()
+        # одинаковые ранги — порядок по -created_at, -id: task3, task2, task1
+        task1, task2, task3 = TaskFactory.create_batch(
+            3, project=project, order_rank=rank_for_slot(1)
+        )
+
+        services.reorder_task(task=task3, new_position=1)
+
+        assert self._order(project) == [task2.id, task3.id, task1.id]
+        ranks = list(Task.objects.filter(project=project).values_list("order_rank", flat=True))
+        assert len(set(ranks)) == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_long_rank_schedules_rebalance(self):
+        project = ProjectFactory()
+        task1, task2, task3 = TaskFactory.create_batch(3, project=project)
+
+        with patch("apps.tasks.services.rebalance_task_ranks.delay") as mock_rebalance:
+            # раз за разом ставим задачу между двумя соседями — ранг удлиняется
+            for index in range(200):
+                services.reorder_task(task=(task3, task2)[index % 2], new_position=1)
+
+        mock_rebalance.assert_called_with(project.id)
+        ranks = list(Task.objects.filter(project=project).values_list("order_rank", flat=True))
+        assert ranks == sorted(ranks)
+
+    def test_rebalance_keeps_order(self):
+        project = ProjectFactory()
+        tasks = TaskFactory.create_batch(3, project=project)
+        services.reorder_task(task=tasks[2], new_position=0)
+        order = self._order(project)
+
+        rewritten = services.rebalance_ranks(project.id)
+
+        assert rewritten == 3
+        assert self._order(project) == order
+        ranks = Task.objects.filter(project=project).values_list("order_rank", flat=True)
+        assert list(ranks) == [rank_for_slot(slot) for slot in (1, 2, 3)]
+
+    def test_rebalance_locks_tasks_by_id(self):
+        project = ProjectFactory()
+        TaskFactory.create_batch(2, project=project)
+
+        with CaptureQueriesContext(connection) as queries:
+            services.rebalance_ranks(project.id)
+
+        # тот же порядок блокировок, что у bulk_update_tasks — без дедлоков
+        locks = [q["sql"] for q in queries if "tasks_task" in q["sql"] and "FOR UPDATE" in q["sql"]]
+        assert len(locks) == 1
+        assert locks[0].endswith('ORDER BY "tasks_task"."id" ASC FOR UPDATE')
+
+
+@pytest.mark.django_db
+class TestBulkReorderTasks:
+    def _order(self, project):
+        return list(Task.objects.filter(project=project).values_list("id", flat=True))
+
+    def test_listed_tasks_swap_their_ranks(self):
+        project = ProjectFactory()
+        tasks = TaskFactory.create_batch(5, project=project)
+        ranks = {task.id: task.order_rank for task in tasks}
+        column = [tasks[3].id, tasks[1].id, tasks[0].id]
+
+        changed = services.bulk_reorder_tasks(
+            project=project, task_ids=column, updated_by=project.owner
+        )
+
+        assert set(changed) == {tasks[3].id, tasks[0].id}
+        # задачи вне набора не двигаются, набор занимает те же места в новом порядке
+        assert self._order(project) == [
+            tasks[3].id,
+            tasks[1].id,
+            tasks[2].id,
+            tasks[0].id,
+            tasks[4].id,
+        ]
+        current = dict(Task.objects.filter(project=project).values_list("id", "order_rank"))
+        assert sorted(current[task_id] for task_id in column) == sorted(
+            ranks[task_id] for task_id in column
+        )
+
+    def test_same_order_no_change(self):
+        project = ProjectFactory()
+        tasks = TaskFactory.create_batch(3, project=project)
+
+        changed = services.bulk_reorder_tasks(
+            project=project, task_ids=[task.id for task in tasks], updated_by=project.owner
+        )
+
+        assert changed == []
+
+    def test_equal_ranks_are_rebalanced(self):
+        project = ProjectFactory()
+        task1, task2, task3 = TaskFactory.create_batch(
+            3, project=project, order_rank=rank_for_slot(1)
+        )
+
+        services.bulk_reorder_tasks(
+            project=project, task_ids=[task1.id, task2.id, task3.id], updated_by=project.owner
+        )
+
+        assert self._order(project) == [task1.id, task2.id, task3.id]
+        ranks = Task.objects.filter(project=project).values_list("order_rank", flat=True)
+        assert len(set(ranks)) == 3
+
+    def test_member_cannot_reorder_foreign_tasks(self):
+        project = ProjectFactory()
+        member = ProjectMemberFactory(project=project).user
+        own = TaskFactory(project=project, creator=member)
+        foreign = TaskFactory(project=project)
+
+        with pytest.raises(PermissionDeniedError):
+            services.bulk_reorder_tasks(
+                project=project, task_ids=[foreign.id, own.id], updated_by=member
+            )
+
+    def test_task_from_other_project(self):
+        project = ProjectFactory()
+        task = TaskFactory(project=project)
+        other = TaskFactory()
+
+        with pytest.raises(NotFoundError):
+            services.bulk_reorder_tasks(
+                project=project, task_ids=[other.id, task.id], updated_by=project.owner
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_single_event_with_new_order(self):
+        project = ProjectFactory()
+        tasks = TaskFactory.create_batch(3, project=project)
+        column = [tasks[2].id, tasks[0].id, tasks[1].id]
+
+        with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
+            services.bulk_reorder_tasks(project=project, task_ids=column, updated_by=project.owner)
+
+        mock_send.assert_called_once()
+        project_id, event_type, event = mock_send.call_args[0]
+        assert (project_id, event_type) == (project.id, "task.bulk_reordered")
+        assert [row["id"] for row in event["data"]] == column
+        ranks = [row["order_rank"] for row in event["data"]]
+        assert ranks == sorted(ranks)
+
+
+class TestTaskListVersion:
+    @pytest.mark.django_db(transaction=True)
+    def test_create_task_bumps_version(self):
+        project = ProjectFactory()
+
+        with patch("apps.tasks.services.bump_task_list_version") as mock_bump:
+            services.create_task(project=project, creator=project.owner, title="Task")
+
+        mock_bump.assert_called_once_with(project.id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_change_status_bumps_version(self):
+        task = TaskFactory()
+
+        with patch("apps.tasks.services.bump_task_list_version") as mock_bump:
+            services.change_status(task=task, new_status=Task.Status.COMPLETED)
+
+        mock_bump.assert_called_once_with(task.project_id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_unchanged_status_keeps_version(self):
+        task = TaskFactory(status=Task.Status.PENDING)
+
+        with patch("apps.tasks.services.bump_task_list_version") as mock_bump:
+            services.change_status(task=task, new_status=Task.Status.PENDING)
+
+        mock_bump.assert_not_called()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_delete_task_bumps_version(self):
+        task = TaskFactory()
 
-        result = services.reorder_task(task=task, new_position=2)
+        with patch("apps.tasks.services.bump_task_list_version") as mock_bump:
+            services.delete_task(task=task)
 
-        assert result.position == 2
+        mock_bump.assert_called_once_with(task.project_id)
@@ -38,6 +38,25 @@ class UserDetailSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class UserTaskStatsSerializer(serializers.Serializer):
+    total_assigned = serializers.IntegerField(help_text="Назначено задач во всех проектах")
+    pending = serializers.IntegerField(help_text="Из них в статусе pending")
+    in_progress = serializers.IntegerField(help_text="Из них в статусе in_progress")
+    completed = serializers.IntegerField(help_text="Из них в статусе completed")
+    high_priority = serializers.IntegerField(help_text="Из них с приоритетом high или urgent")
+    last_task_created = serializers.DateTimeField(
+        allow_null=True, help_text="Создание самой новой назначенной задачи"
+    )
+
+
+class UserMeSerializer(UserDetailSerializer):
+    task_stats = UserTaskStatsSerializer(source="assigned_task_stats", read_only=True)
+
+    class Meta(UserDetailSerializer.Meta):
+        fields = [*UserDetailSerializer.Meta.fields, "task_stats"]
+        read_only_fields = fields
+
+
 class RegisterSerializer(serializers.Serializer):
     email = serializers.EmailField(help_text="Email пользователя (используется для входа)")
     password = serializers.CharField(
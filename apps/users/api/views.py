@@ -22,6 +22,7 @@ from .serializers import (
     ResetPasswordSerializer,
     UserDetailSerializer,
     UserListSerializer,
+    UserMeSerializer,
     UserUpdateSerializer,
     VerifyEmailSerializer,
 )
@@ -54,6 +55,8 @@ class UserViewSet(viewsets.GenericViewSet):
             return UserUpdateSerializer
         if self.action == "change_password":
             return ChangePasswordSerializer
+        if self.action == "me":
+            return UserMeSerializer
         return UserDetailSerializer
 
     def get_queryset(self):
@@ -109,13 +112,18 @@ class UserViewSet(viewsets.GenericViewSet):
 
     @action_endpoint_schema(
         summary="Текущий пользователь",
-        description="Возвращает информацию о текущем авторизованном пользователе.",
+        description=(
+            "Возвращает информацию о текущем авторизованном пользователе "
+            "и счётчики назначенных ему задач по всем проектам."
+        ),
         tags=["users"],
         method="GET",
     )
     @action(detail=False, methods=["get"])
     def me(self, request):
-        serializer = UserDetailSerializer(request.user)
+        user = request.user
+        user.assigned_task_stats = selectors.get_user_task_stats(user)
+        serializer = UserMeSerializer(user)
         return Response(serializer.data)
 
     @extend_schema(
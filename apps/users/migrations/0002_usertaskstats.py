@@ -0,0 +1,86 @@
+# Generated by Django 5.1.15 on 2026-10-17 05:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def fill_user_task_stats(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserTaskStats = apps.get_model("users", "UserTaskStats")
+    Task = apps.get_model("tasks", "Task")
+
+    stats = {
+        user_id: UserTaskStats(user_id=user_id)
+        for user_id in User.objects.values_list("id", flat=True)
+    }
+    groups = (
+        Task.objects.filter(assignee__isnull=False)
+        .values("assignee_id")
+        .annotate(
+            total_assigned=Count("id"),
+            pending=Count("id", filter=Q(status="pending")),
+            in_progress=Count("id", filter=Q(status="in_progress")),
+            completed=Count("id", filter=Q(status="completed")),
+            high_priority=Count("id", filter=Q(priority__in=["high", "urgent"])),
+            last_task_created=Max("created_at"),
+        )
+        .order_by()
+    )
+    for row in groups:
+        user_stats = stats[row.pop("assignee_id")]
+        for name, value in row.items():
+            setattr(user_stats, name, value)
+
+    UserTaskStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+        ("tasks", "0006_task_active_deadline_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTaskStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+                ("total_assigned", models.IntegerField(default=0, verbose_name="Назначено задач")),
+                ("pending", models.IntegerField(default=0, verbose_name="Ожидают")),
+                ("in_progress", models.IntegerField(default=0, verbose_name="В работе")),
+                ("completed", models.IntegerField(default=0, verbose_name="Завершены")),
+                (
+                    "high_priority",
+                    models.IntegerField(default=0, verbose_name="Высокий и срочный приоритет"),
+                ),
+                (
+                    "last_task_created",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Последняя назначенная задача"
+                    ),
+                ),
+                (
+                    "reconciled_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Последняя сверка"),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика задач пользователя",
+                "verbose_name_plural": "Статистика задач пользователей",
+            },
+        ),
+        migrations.RunPython(fill_user_task_stats, migrations.RunPython.noop),
+    ]
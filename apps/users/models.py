@@ -99,3 +99,42 @@ class PasswordResetToken(models.Model):
     @property
     def is_valid(self):
         return not self.is_used and not self.is_expired
+
+
+class UserTaskStats(models.Model):
+    """
+    Денормализованные счётчики задач, назначенных пользователю, по всем проектам.
+    services задач меняют их F()-инкрементами; расхождения исправляет periodic-сверка.
+    last_task_created между сверками только растёт: снятие назначения его не уменьшает.
+    """
+
+    STATUS_COUNTERS = ("pending", "in_progress", "completed")
+    COUNTERS = ("total_assigned", *STATUS_COUNTERS, "high_priority")
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_stats",
+        verbose_name="Пользователь",
+    )
+    total_assigned = models.IntegerField("Назначено задач", default=0)
+    pending = models.IntegerField("Ожидают", default=0)
+    in_progress = models.IntegerField("В работе", default=0)
+    completed = models.IntegerField("Завершены", default=0)
+    high_priority = models.IntegerField("Высокий и срочный приоритет", default=0)
+    last_task_created = models.DateTimeField("Последняя назначенная задача", null=True, blank=True)
+    reconciled_at = models.DateTimeField("Последняя сверка", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Статистика задач пользователя"
+        verbose_name_plural = "Статистика задач пользователей"
+
+    def __str__(self):
+        return f"Статистика задач {self.user_id}"
+
+    def as_dict(self) -> dict:
+        return {
+            **{name: getattr(self, name) for name in self.COUNTERS},
+            "last_task_created": self.last_task_created,
+        }
@@ -2,7 +2,7 @@ from django.db.models import Count, Max, Q, QuerySet
 
 from core.exceptions import NotFoundError
 
-from .models import EmailVerificationToken, PasswordResetToken, User
+from .models import EmailVerificationToken, PasswordResetToken, User, UserTaskStats
 
 
 def get_by_id(user_id: int) -> User:
@@ -42,15 +42,21 @@ def get_password_reset_token(token: str) -> PasswordResetToken:
 
 
 def get_user_task_stats(user: User) -> dict:
-    from apps.tasks.models import Task
+    """Счётчики из UserTaskStats; для пользователя без строки статистики — агрегат."""
+    try:
+        return UserTaskStats.objects.get(user_id=user.id).as_dict()
+    except UserTaskStats.DoesNotExist:
+        return count_user_task_stats(user.id)
+
+
+def count_user_task_stats(user_id: int) -> dict:
+    from apps.tasks.models import HIGH_PRIORITIES, Task
 
-    return Task.objects.filter(assignee=user).aggregate(
+    return Task.objects.filter(assignee_id=user_id).aggregate(
         total_assigned=Count("id"),
         pending=Count("id", filter=Q(status=Task.Status.PENDING)),
         in_progress=Count("id", filter=Q(status=Task.Status.IN_PROGRESS)),
         completed=Count("id", filter=Q(status=Task.Status.COMPLETED)),
-        high_priority=Count(
-            "id", filter=Q(priority__in=[Task.Priority.HIGH, Task.Priority.URGENT])
-        ),
+        high_priority=Count("id", filter=Q(priority__in=HIGH_PRIORITIES)),
         last_task_created=Max("created_at"),
     )
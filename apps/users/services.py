@@ -1,11 +1,16 @@
+from datetime import datetime
+
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
 from core.exceptions import ConflictError, NotFoundError, ValidationError
 
 from . import selectors
-from .models import EmailVerificationToken, PasswordResetToken, User
+from .models import EmailVerificationToken, PasswordResetToken, User, UserTaskStats
 from .tasks import send_password_reset_email, send_verification_email
 
 
@@ -34,6 +39,7 @@ def register_user(
         last_name=last_name,
     )
 
+    UserTaskStats.objects.create(user=user)
     EmailVerificationToken.create_for_user(user)
 
     transaction.on_commit(lambda: send_verification_email.delay(user.id))
@@ -168,3 +174,61 @@ def reset_password(*, token: str, new_password: str) -> User:
     token_obj.save(update_fields=["is_used"])
 
     return user
+
+
+def adjust_task_stats(
+    user_id: int,
+    *,
+    total: int = 0,
+    statuses: dict[str, int] | None = None,
+    high_priority: int = 0,
+    last_task_created: datetime | None = None,
+) -> None:
+    """
+    F()-инкременты счётчиков исполнителя в транзакции вызывающего.
+    statuses — изменения по значению статуса; cancelled отдельно не считается.
+    Вызывается после записи задач: отсутствующая строка заводится пересчётом по данным.
+    """
+    changes = {"total_assigned": total, "high_priority": high_priority}
+    for task_status, delta in (statuses or {}).items():
+        if task_status in UserTaskStats.STATUS_COUNTERS:
+            changes[task_status] = changes.get(task_status, 0) + delta
+
+    updates = {name: F(name) + delta for name, delta in changes.items() if delta}
+    if last_task_created is not None:
+        # GREATEST в PostgreSQL пропускает NULL — пустое значение просто заменяется
+        updates["last_task_created"] = Greatest("last_task_created", Value(last_task_created))
+    if not updates or UserTaskStats.objects.filter(user_id=user_id).update(**updates):
+        return
+
+    # строки нет (createsuperuser, админка, импорт): заводим её пересчётом — изменение
+    # вызывающего уже в данных транзакции, поэтому дельту повторно не применяем
+    _, created = UserTaskStats.objects.get_or_create(
+        user_id=user_id, defaults=selectors.count_user_task_stats(user_id)
+    )
+    if not created:
+        # строку параллельно завела другая транзакция — её пересчёт нашего изменения не видел
+        UserTaskStats.objects.filter(user_id=user_id).update(**updates)
+
+
+def reconcile_user_task_stats(user_id: int) -> bool:
+    """Пересчитывает счётчики пользователя; True, если они расходились с данными."""
+    with transaction.atomic():
+        UserTaskStats.objects.get_or_create(user_id=user_id)
+        # пока строка заблокирована, инкременты ждут: пересчёт видит все закоммиченные изменения
+        stats = UserTaskStats.objects.select_for_update().get(user_id=user_id)
+        actual = selectors.count_user_task_stats(user_id)
+
+        drifted = stats.as_dict() != actual
+        for name, value in actual.items():
+            setattr(stats, name, value)
+        stats.reconciled_at = timezone.now()
+        stats.save()
+
+    return drifted
+
+
+def reconcile_all_user_task_stats() -> int:
+    """Сверка счётчиков всех пользователей, по транзакции на пользователя."""
+    user_ids = User.objects.order_by("id").values_list("id", flat=True)
+    return sum(reconcile_user_task_stats(user_id) for user_id in user_ids.iterator())
@@ -1,9 +1,13 @@
+import logging
+
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
 
 from .models import EmailVerificationToken, PasswordResetToken, User
 
+logger = logging.getLogger(__name__)
+
 
 @shared_task
 def send_verification_email(user_id: int) -> None:
@@ -79,3 +83,12 @@ def send_password_reset_email(user_id: int) -> None:
         recipient_list=[user.email],
         fail_silently=False,
     )
+
+
+@shared_task
+def reconcile_user_task_stats() -> None:
+    from . import services
+
+    drifted = services.reconcile_all_user_task_stats()
+    if drifted:
+        logger.warning(f"User task stats drift repaired: {drifted} users")
@@ -4,6 +4,8 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from apps.tasks.tests.factories import TaskFactory
+from apps.users import services as user_services
 from apps.users.models import User
 
 from .factories import UserFactory
@@ -232,6 +234,26 @@ class TestUserMeAPI:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["email"] == verified_user.email
+        assert response.data["task_stats"]["total_assigned"] == 0
+
+    def test_me_task_stats_single_lookup(
+        self, api_client, verified_user, django_assert_num_queries
+    ):
+        task = TaskFactory(assignee=verified_user, priority="urgent")
+        user_services.reconcile_user_task_stats(verified_user.id)
+        api_client.force_authenticate(user=verified_user)
+
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("users-me"))
+
+        assert response.data["task_stats"] == {
+            "total_assigned": 1,
+            "pending": 1,
+            "in_progress": 0,
+            "completed": 0,
+            "high_priority": 1,
+            "last_task_created": task.created_at.isoformat().replace("+00:00", "Z"),
+        }
 
     def test_me_unauthenticated(self, api_client):
         url = reverse("users-me")
@@ -2,8 +2,12 @@ from unittest.mock import patch
 
 import pytest
 
-from apps.users import services
-from apps.users.models import EmailVerificationToken, PasswordResetToken
+from apps.projects import services as project_services
+from apps.projects.tests.factories import ProjectFactory
+from apps.tasks import services as task_services
+from apps.users import selectors, services
+from apps.users.models import EmailVerificationToken, PasswordResetToken, UserTaskStats
+from apps.users.tasks import reconcile_user_task_stats
 from core.exceptions import ConflictError, NotFoundError, ValidationError
 
 from .factories import UserFactory
@@ -264,3 +268,84 @@ class TestResetPassword:
                 token="invalid-token",
                 new_password="NewSecurePass456!",
             )
+
+
+@pytest.mark.django_db
+class TestUserTaskStats:
+    def _stats(self, user):
+        return UserTaskStats.objects.get(user=user).as_dict()
+
+    def test_task_services_keep_counters(self):
+        first, second = UserFactory.create_batch(2, is_verified=True)
+        for user in (first, second):
+            services.reconcile_user_task_stats(user.id)
+        project = ProjectFactory()
+        owner = project.owner
+
+        task = task_services.create_task(
+            project=project, creator=owner, title="A", priority="high", assignee=first
+        )
+        other = task_services.create_task(project=project, creator=owner, title="B", assignee=first)
+        task_services.change_status(task=task, new_status="in_progress")
+        task_services.update_task(task=task, priority="low")
+        task_services.assign_task(task=other, assignee=second, project_name=project.name)
+        task_services.delete_task(task=task)
+
+        assert self._stats(first)["total_assigned"] == 0
+        assert self._stats(first)["high_priority"] == 0
+        assert self._stats(second) == selectors.count_user_task_stats(second.id)
+        assert self._stats(second)["pending"] == 1
+
+    def test_reconcile_repairs_drift(self):
+        user = UserFactory(is_verified=True)
+        project = ProjectFactory()
+        task_services.create_task(project=project, creator=project.owner, title="A", assignee=user)
+
+        assert services.reconcile_user_task_stats(user.id) is False
+
+        UserTaskStats.objects.filter(user=user).update(total_assigned=5)
+        reconcile_user_task_stats.delay()
+
+        stats = UserTaskStats.objects.get(user=user)
+        assert stats.total_assigned == 1
+        assert stats.reconciled_at is not None
+
+    def test_selector_falls_back_to_aggregate(self):
+        user = UserFactory(is_verified=True)
+
+        stats = selectors.get_user_task_stats(user)
+
+        assert stats["total_assigned"] == 0
+        assert stats["last_task_created"] is None
+
+    def test_adjust_creates_missing_row(self):
+        # createsuperuser/админка заводят пользователя мимо register_user
+        user = UserFactory(is_verified=True)
+        project = ProjectFactory()
+        task = task_services.create_task(
+            project=project, creator=project.owner, title="A", priority="high", assignee=user
+        )
+
+        assert self._stats(user) == selectors.count_user_task_stats(user.id)
+        assert self._stats(user)["total_assigned"] == 1
+
+        UserTaskStats.objects.filter(user=user).delete()
+        task_services.update_task(task=task, priority="low")
+
+        assert self._stats(user)["high_priority"] == 0
+        assert self._stats(user) == selectors.count_user_task_stats(user.id)
+
+    def test_delete_project_creates_missing_row(self):
+        user = UserFactory(is_verified=True)
+        project = ProjectFactory()
+        other = ProjectFactory()
+        for target in (project, other):
+            task_services.create_task(
+                project=target, creator=target.owner, title="A", assignee=user
+            )
+        UserTaskStats.objects.filter(user=user).delete()
+
+        project_services.delete_project(project=project)
+
+        assert self._stats(user)["total_assigned"] == 1
+        assert self._stats(user) == selectors.count_user_task_stats(user.id)
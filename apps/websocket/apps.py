@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class WebsocketConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.websocket"
+
+    def ready(self):
+        from channels_redis.serializers import registry
+
+        from core.websocket import CHANNEL_SERIALIZER_FORMAT, ChannelMessageSerializer
+
+        registry.register_serializer(CHANNEL_SERIALIZER_FORMAT, ChannelMessageSerializer)
@@ -14,6 +14,24 @@ def serialize_task_event(task, event_type: str, user) -> dict:
     }
 
 
+def serialize_tasks_event(tasks, event_type: str, user) -> dict:
+    return {
+        "event_type": event_type,
+        "timestamp": timezone.now().isoformat(),
+        "user": UserListSerializer(user).data,
+        "data": TaskDetailSerializer(tasks, many=True).data,
+    }
+
+
+def serialize_tasks_order_event(ordering: list[dict], event_type: str, user) -> dict:
+    return {
+        "event_type": event_type,
+        "timestamp": timezone.now().isoformat(),
+        "user": UserListSerializer(user).data,
+        "data": ordering,
+    }
+
+
 def serialize_comment_event(comment, event_type: str, user) -> dict:
     return {
         "event_type": event_type,
@@ -3,7 +3,7 @@ import logging
 from celery import shared_task
 
 from apps.comments.models import Comment
-from apps.tasks.models import Task
+from apps.tasks.models import TASK_ORDERING, Task
 from apps.users.models import User
 from core.event_types import CommentEvents, TaskEvents
 from core.websocket import send_to_project_group
@@ -13,6 +13,8 @@ from .serializers import (
     serialize_comment_event,
     serialize_task_deleted_event,
     serialize_task_event,
+    serialize_tasks_event,
+    serialize_tasks_order_event,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,6 +37,56 @@ def broadcast_task_created(task_id: int, user_id: int):
     send_to_project_group(task.project_id, TaskEvents.CREATED, event_data)
 
 
+def _broadcast_tasks(task_ids: list[int], project_id: int, user_id: int, event_type: str):
+    # одно событие на пачку задач вместо события на каждую
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.warning(f"User not found: user={user_id}")
+        return
+
+    tasks = list(
+        Task.objects.filter(id__in=task_ids)
+        .select_related("creator", "assignee", "project")
+        .prefetch_related("tags")
+        .order_by(*TASK_ORDERING)
+    )
+    if not tasks:
+        return
+
+    event_data = serialize_tasks_event(tasks, event_type, user)
+    send_to_project_group(project_id, event_type, event_data)
+
+
+@shared_task
+def broadcast_tasks_created(task_ids: list[int], project_id: int, user_id: int):
+    _broadcast_tasks(task_ids, project_id, user_id, TaskEvents.BULK_CREATED)
+
+
+@shared_task
+def broadcast_tasks_updated(task_ids: list[int], project_id: int, user_id: int):
+    _broadcast_tasks(task_ids, project_id, user_id, TaskEvents.BULK_UPDATED)
+
+
+@shared_task
+def broadcast_tasks_reordered(task_ids: list[int], project_id: int, user_id: int):
+    # одно событие с новым порядком набора: [{"id", "order_rank"}, ...]
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.warning(f"User not found: user={user_id}")
+        return
+
+    ordering = list(
+        Task.objects.filter(id__in=task_ids).order_by(*TASK_ORDERING).values("id", "order_rank")
+    )
+    if not ordering:
+        return
+
+    event_data = serialize_tasks_order_event(ordering, TaskEvents.BULK_REORDERED, user)
+    send_to_project_group(project_id, TaskEvents.BULK_REORDERED, event_data)
+
+
 @shared_task
 def broadcast_task_updated(task_id: int, user_id: int):
     try:
@@ -3,7 +3,13 @@ from unittest.mock import patch
 import pytest
 
 from apps.tasks.tests.factories import TaskFactory
-from apps.websocket.tasks import broadcast_task_created
+from apps.websocket.tasks import (
+    broadcast_task_created,
+    broadcast_task_reordered,
+    broadcast_tasks_created,
+    broadcast_tasks_reordered,
+    broadcast_tasks_updated,
+)
 
 
 @pytest.mark.django_db
@@ -20,6 +26,54 @@ class TestBroadcastTasks:
         assert call_args[0][0] == task.project_id
         assert call_args[0][1] == "task.created"
 
+    def test_broadcast_tasks_created_single_event(self):
+        first = TaskFactory()
+        second = TaskFactory(project=first.project)
+
+        with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
+            broadcast_tasks_created([second.id, first.id], first.project_id, first.creator.id)
+
+        mock_send.assert_called_once()
+        project_id, event_type, event = mock_send.call_args[0]
+        assert project_id == first.project_id
+        assert event_type == "task.bulk_created"
+        assert [task["id"] for task in event["data"]] == [first.id, second.id]
+
+    def test_broadcast_tasks_updated_single_event(self):
+        task = TaskFactory()
+
+        with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
+            broadcast_tasks_updated([task.id], task.project_id, task.creator.id)
+
+        mock_send.assert_called_once()
+        assert mock_send.call_args[0][1] == "task.bulk_updated"
+
+    def test_broadcast_tasks_reordered_carries_order(self):
+        first = TaskFactory()
+        second = TaskFactory(project=first.project)
+
+        with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
+            broadcast_tasks_reordered([second.id, first.id], first.project_id, first.creator.id)
+
+        mock_send.assert_called_once()
+        _, event_type, event = mock_send.call_args[0]
+        assert event_type == "task.bulk_reordered"
+        assert event["data"] == [
+            {"id": first.id, "order_rank": first.order_rank},
+            {"id": second.id, "order_rank": second.order_rank},
+        ]
+
+    def test_broadcast_task_reordered_keeps_task_payload(self):
+        task = TaskFactory()
+
+        with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
+            broadcast_task_reordered(task.id, task.creator.id)
+
+        _, event_type, event = mock_send.call_args[0]
+        assert event_type == "task.reordered"
+        assert event["data"]["id"] == task.id
+        assert event["data"]["order_rank"] == task.order_rank
+
     def test_broadcast_task_created_missing_task(self):
         with patch("apps.websocket.tasks.send_to_project_group") as mock_send:
             broadcast_task_created(99999, 1)
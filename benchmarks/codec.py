@@ -0,0 +1,106 @@
+"""
+Сравнение кодеков кэша: pickle, JSON, msgpack и core.codec (msgpack + zlib).
+
+Запуск: python -m benchmarks.codec [--number N]
+"""
+
+import argparse
+import json
+import pickle
+import timeit
+from datetime import UTC, datetime, timedelta
+
+import msgpack
+
+from core import codec
+from core.ranking import rank_for_slot
+
+NOW = datetime(2026, 1, 15, 12, 30, tzinfo=UTC)
+
+
+def _user(user_id: int) -> dict:
+    return {
+        "id": user_id,
+        "email": f"user{user_id}@example.com",
+        "first_name": "Иван",
+        "last_name": "Петров",
+        "avatar": f"/media/avatars/{user_id}.png",
+    }
+
+
+def _task(task_id: int) -> dict:
+    return {
+        "id": task_id,
+        "title": f"Задача #{task_id}: подготовить релиз",
+        "status": "in_progress",
+        "priority": "high",
+        "deadline": (NOW + timedelta(days=task_id)).isoformat(),
+        "order_rank": rank_for_slot(task_id),
+        "creator": _user(1),
+        "assignee": _user(task_id % 5 + 2),
+        "tags": [{"id": 1, "name": "backend", "color": "#6B7280"}],
+        "created_at": (NOW - timedelta(hours=task_id)).isoformat(),
+    }
+
+
+PAYLOADS = {
+    "project_detail": {
+        "id": 42,
+        "name": "TaskFlow",
+        "description": "REST API платформа для управления проектами и задачами",
+        "status": "active",
+        "owner": _user(1),
+        "members_count": 12,
+        "created_at": NOW.isoformat(),
+        "updated_at": NOW.isoformat(),
+    },
+    "task_list_page": {
+        "count": 240,
+        "next": "http://api.example.com/api/v1/projects/42/tasks/?page=2",
+        "previous": None,
+        "results": [_task(i) for i in range(1, 21)],
+    },
+    "task_event": {
+        "event_type": "task.updated",
+        "timestamp": NOW.isoformat(),
+        "user": _user(1),
+        "data": _task(7),
+    },
+}
+
+CODECS = {
+    "pickle": (
+        lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+    ),
+    "json": (
+        lambda value: json.dumps(value, ensure_ascii=False).encode(),
+        json.loads,
+    ),
+    "msgpack": (msgpack.packb, msgpack.unpackb),
+    "core.codec": (codec.encode, codec.decode),
+}
+
+
+def run(number: int) -> None:
+    print(f"{'payload':<16}{'codec':<12}{'bytes':>8}{'encode, µs':>12}{'decode, µs':>12}")
+
+    for payload_name, payload in PAYLOADS.items():
+        for codec_name, (dumps, loads) in CODECS.items():
+            data = dumps(payload)
+            assert loads(data) == payload
+
+            encode_time = timeit.timeit(lambda: dumps(payload), number=number)  # noqa: B023
+            decode_time = timeit.timeit(lambda: loads(data), number=number)  # noqa: B023
+
+            print(
+                f"{payload_name:<16}{codec_name:<12}{len(data):>8}"
+                f"{encode_time / number * 1e6:>12.1f}{decode_time / number * 1e6:>12.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="повторов на замер")
+    run(parser.parse_args().number)
@@ -0,0 +1,380 @@
+"""
+Регрессия планов запросов селекторов: EXPLAIN (ANALYZE, BUFFERS) на наполненной БД.
+
+Создаёт отдельную тестовую БД, наполняет её фабриками из apps/*/tests, выполняет
+каждый сценарий из CASES и сравнивает планы всех его SELECT с базовой линией
+benchmarks/query_plans.json. Падает (exit 1), если появился Seq Scan, которого не было,
+строк или буферов прочитано больше бюджета или изменилось число запросов.
+
+Запуск: python -m benchmarks.query_plans [--update] [--case NAME ...] [--keepdb]
+--update перезаписывает базовую линию — её diff в ревью показывает, как поменялись планы;
+--keepdb оставляет наполненную БД для следующих запусков (например, при подборе индекса).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+import factory.random  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.comments import selectors as comment_selectors  # noqa: E402
+from apps.comments.api.pagination import CommentKeysetPagination  # noqa: E402
+from apps.comments.models import Comment  # noqa: E402
+from apps.comments.tests.factories import CommentFactory  # noqa: E402
+from apps.projects import selectors as project_selectors  # noqa: E402
+from apps.projects import services as project_services  # noqa: E402
+from apps.projects.api.pagination import ProjectSearchPagination  # noqa: E402
+from apps.projects.models import Project, ProjectMember  # noqa: E402
+from apps.projects.tests.factories import ProjectFactory  # noqa: E402
+from apps.tags import selectors as tag_selectors  # noqa: E402
+from apps.tags.models import Tag  # noqa: E402
+from apps.tags.tests.factories import TagFactory  # noqa: E402
+from apps.tasks import selectors as task_selectors  # noqa: E402
+from apps.tasks.api.pagination import (  # noqa: E402
+    AssignedTaskPagination,
+    TaskDeadlinePagination,
+    TaskKeysetPagination,
+)
+from apps.tasks.models import TASK_ORDERING, Task  # noqa: E402
+from apps.tasks.tests.factories import TaskFactory  # noqa: E402
+from apps.users import selectors as user_selectors  # noqa: E402
+from apps.users import services as user_services  # noqa: E402
+from apps.users.models import User  # noqa: E402
+from apps.users.tests.factories import UserFactory  # noqa: E402
+from core.query_plans import capture_plans, check_plans  # noqa: E402
+from core.ranking import rank_for_slot  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_suffix(".json")
+SEED = 20260115
+PAGE_SIZE = 20
+BATCH_SIZE = 2000
+
+USERS = 1000
+PROJECTS = 100
+MEMBERS_PER_PROJECT = 10
+# у небольшой группы пользователей проекты есть почти везде — как у руководителей
+ACTIVE_USERS = 20
+TASKS_PER_PROJECT = (50, 550)
+# несколько больших досок — на них видно, где план перестаёт масштабироваться
+LARGE_PROJECTS = 3
+LARGE_PROJECT_TASKS = 5000
+COMMENTS_PER_TASK = (0, 3)
+TAGS_PER_PROJECT = 5
+# на живой доске большая часть задач уже закрыта
+STATUS_WEIGHTS = {
+    Task.Status.PENDING: 20,
+    Task.Status.IN_PROGRESS: 10,
+    Task.Status.COMPLETED: 60,
+    Task.Status.CANCELLED: 10,
+}
+
+
+@dataclass
+class Dataset:
+    project: Project
+    task: Task
+    comment: Comment
+    user: User
+    user_project_ids: list[int]
+    task_cursor: list
+    comment_cursor: list
+    search_term: str
+
+
+def _weighted_members(rng: random.Random, users: list[User], owner: User) -> list[User]:
+    active = [user for user in users[:ACTIVE_USERS] if user != owner and rng.random() < 0.6]
+    rest = [user for user in rng.sample(users[ACTIVE_USERS:], MEMBERS_PER_PROJECT) if user != owner]
+    return [owner, *active, *rest]
+
+
+def seed() -> Dataset:
+    rng = random.Random(SEED)
+    factory.random.reseed_random(SEED)
+    now = timezone.now()
+
+    users = User.objects.bulk_create(
+        UserFactory.build_batch(USERS, is_verified=True), batch_size=BATCH_SIZE
+    )
+    projects = Project.objects.bulk_create(
+        [ProjectFactory.build(owner=rng.choice(users)) for _ in range(PROJECTS)],
+        batch_size=BATCH_SIZE,
+    )
+
+    members_by_project = {}
+    memberships = []
+    for project in projects:
+        members = _weighted_members(rng, users, project.owner)
+        members_by_project[project.id] = members
+        memberships.extend(
+            ProjectMember(
+                project=project,
+                user=user,
+                role=(
+                    ProjectMember.Role.OWNER if user == project.owner else ProjectMember.Role.MEMBER
+                ),
+            )
+            for user in members
+        )
+    ProjectMember.objects.bulk_create(memberships, batch_size=BATCH_SIZE)
+
+    tags = Tag.objects.bulk_create(
+        [
+            TagFactory.build(project=project)
+            for project in projects
+            for _ in range(TAGS_PER_PROJECT)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    tags_by_project = {}
+    for tag in tags:
+        tags_by_project.setdefault(tag.project_id, []).append(tag)
+
+    statuses, weights = zip(*STATUS_WEIGHTS.items(), strict=True)
+    priorities = list(Task.Priority)
+    tasks = []
+    for index, project in enumerate(projects):
+        members = members_by_project[project.id]
+        size = LARGE_PROJECT_TASKS if index < LARGE_PROJECTS else rng.randint(*TASKS_PER_PROJECT)
+        for slot in range(1, size + 1):
+            deadline = now + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.7 else None
+            tasks.append(
+                TaskFactory.build(
+                    project=project,
+                    creator=rng.choice(members),
+                    assignee=rng.choice(members) if rng.random() < 0.8 else None,
+                    status=rng.choices(statuses, weights)[0],
+                    priority=rng.choice(priorities),
+                    deadline=deadline,
+                    order_rank=rank_for_slot(slot),
+                )
+            )
+    tasks = Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+
+    Task.tags.through.objects.bulk_create(
+        [
+            Task.tags.through(task_id=task.id, tag_id=tag.id)
+            for task in tasks
+            for tag in rng.sample(tags_by_project[task.project_id], rng.randint(0, 2))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    Comment.objects.bulk_create(
+        [
+            CommentFactory.build(task=task, author=rng.choice(members_by_project[task.project_id]))
+            for task in tasks
+            for _ in range(rng.randint(*COMMENTS_PER_TASK))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    # счётчики ProjectStats и UserTaskStats — так же, как их заполняют миграции
+    for project in projects:
+        project_services.reconcile_project_stats(project.id)
+    for user in users:
+        user_services.reconcile_user_task_stats(user.id)
+
+    with connection.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+
+    return _pick_dataset()
+
+
+def _pick_dataset() -> Dataset:
+    # самый большой проект и самая обсуждаемая его задача — худший случай для доски
+    project = Project.objects.annotate(size=Count("tasks")).order_by("-size", "id").first()
+    project_tasks = Task.objects.filter(project=project).order_by(*TASK_ORDERING)
+    middle = project_tasks[project_tasks.count() // 2]
+    task = project_tasks.annotate(size=Count("comments")).order_by("-size", "id").first()
+    comments = Comment.objects.filter(task=task).order_by("created_at", "id")
+    first_comment = comments.first()
+    user = User.objects.get(
+        id=ProjectMember.objects.filter(project=project).order_by("id")[1].user_id
+    )
+
+    return Dataset(
+        project=project,
+        task=task,
+        comment=first_comment,
+        user=user,
+        user_project_ids=list(
+            Project.objects.filter(members__user=user)
+            .order_by("-created_at")
+            .values_list("id", flat=True)
+        ),
+        task_cursor=[middle.order_rank, middle.created_at, middle.id],
+        comment_cursor=[first_comment.created_at, first_comment.id],
+        search_term=task.description.split()[0].strip(".,").lower(),
+    )
+
+
+def _keyset_page(pagination_class, queryset, values: list | None) -> list:
+    pagination = pagination_class()
+    pagination.page_size = PAGE_SIZE
+    pagination.fields = [pagination._parse_field(field) for field in pagination.ordering]
+    return pagination.fetch_rows(queryset, values, reverse=False)
+
+
+def _task_list_page(data: Dataset, **filters) -> list:
+    return list(task_selectors.filter_by_project_with_filters(data.project, **filters)[:PAGE_SIZE])
+
+
+def _search_page(data: Dataset) -> list:
+    query = project_selectors.build_search_query(data.search_term)
+    branches = project_selectors.search_in_project(data.project, query)
+    return _keyset_page(ProjectSearchPagination, branches, None)
+
+
+CASES = {
+    # tasks
+    "tasks.get_by_id": lambda d: task_selectors.get_by_id(d.task.id),
+    "tasks.list_page": lambda d: _task_list_page(d),
+    "tasks.list_page_by_status": lambda d: _task_list_page(d, status=Task.Status.IN_PROGRESS),
+    "tasks.list_page_by_priority": lambda d: _task_list_page(d, priority=Task.Priority.URGENT),
+    "tasks.list_page_by_assignee": lambda d: _task_list_page(d, assignee_id=d.user.id),
+    "tasks.keyset_page": lambda d: _keyset_page(
+        TaskKeysetPagination,
+        task_selectors.filter_by_project_with_filters(d.project),
+        d.task_cursor,
+    ),
+    "tasks.assigned_to_user": lambda d: _keyset_page(
+        AssignedTaskPagination, task_selectors.filter_assigned_to_user(d.user), None
+    ),
+    "tasks.assigned_to_user_by_status": lambda d: _keyset_page(
+        AssignedTaskPagination,
+        task_selectors.filter_assigned_to_user(d.user, status=Task.Status.IN_PROGRESS),
+        None,
+    ),
+    "tasks.exists_task_in_project": lambda d: task_selectors.exists_task_in_project(
+        d.project, d.task.id
+    ),
+    "tasks.get_last_rank": lambda d: task_selectors.get_last_rank(d.project),
+    "tasks.get_neighbour_ranks": lambda d: task_selectors.get_neighbour_ranks(
+        d.project, d.task.id, 20
+    ),
+    "tasks.overdue_page": lambda d: _keyset_page(
+        TaskDeadlinePagination, task_selectors.filter_overdue(d.project), None
+    ),
+    "tasks.due_soon_page": lambda d: _keyset_page(
+        TaskDeadlinePagination, task_selectors.filter_due_soon(d.project, days=7), None
+    ),
+    "tasks.overdue_assigned_to_user": lambda d: _keyset_page(
+        TaskDeadlinePagination, task_selectors.filter_overdue_assigned_to_user(d.user), None
+    ),
+    "tasks.get_overdue_count": lambda d: task_selectors.get_overdue_count(d.project),
+    # comments
+    "comments.get_by_id": lambda d: comment_selectors.get_by_id(d.comment.id),
+    "comments.list_page": lambda d: list(comment_selectors.filter_by_task(d.task)[:PAGE_SIZE]),
+    "comments.keyset_page": lambda d: _keyset_page(
+        CommentKeysetPagination, comment_selectors.filter_by_task(d.task), d.comment_cursor
+    ),
+    "comments.count_by_task": lambda d: comment_selectors.count_by_task(d.task),
+    # projects
+    "projects.get_detail": lambda d: project_selectors.get_detail(d.project.id),
+    "projects.get_user_project_ids": lambda d: project_selectors.get_user_project_ids(d.user),
+    "projects.filter_by_ids_with_members_count": lambda d: list(
+        project_selectors.filter_by_ids_with_members_count(d.user_project_ids[:PAGE_SIZE])
+    ),
+    "projects.get_member_role": lambda d: project_selectors.get_member_role(d.project, d.user),
+    "projects.filter_members": lambda d: list(project_selectors.filter_members(d.project)),
+    "projects.get_project_with_task_stats": lambda d: (
+        project_selectors.get_project_with_task_stats(d.project.id)
+    ),
+    "projects.count_project_stats": lambda d: project_selectors.count_project_stats(d.project.id),
+    "projects.search": _search_page,
+    # tags
+    "tags.filter_by_project": lambda d: list(tag_selectors.filter_by_project(d.project)),
+    "tags.exists_tag_name_in_project": lambda d: tag_selectors.exists_tag_name_in_project(
+        d.project, "backend"
+    ),
+    # users
+    "users.get_by_email": lambda d: user_selectors.get_by_email(d.user.email),
+    "users.get_user_task_stats": lambda d: user_selectors.get_user_task_stats(d.user),
+    "users.count_user_task_stats": lambda d: user_selectors.count_user_task_stats(d.user.id),
+}
+
+
+def _load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def _save_baseline(baseline: dict) -> None:
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+
+
+def run(data: Dataset, case_names: list[str], update: bool) -> int:
+    baseline = _load_baseline()
+    failed = []
+
+    print(f"{'сценарий':<44}{'запросов':>9}{'строк':>9}{'буферов':>9}{'мс':>9}  ")
+    for name in case_names:
+        plans = capture_plans(partial(CASES[name], data))
+        problems = [] if update else check_plans(plans, baseline.get(name, []))
+        if not update and name not in baseline:
+            problems = ["нет базовой линии — запустите с --update"]
+
+        rows = sum(plan.rows for plan in plans)
+        buffers = sum(plan.buffers for plan in plans)
+        time_ms = sum(plan.time_ms for plan in plans)
+        status = "FAIL" if problems else "ok"
+        print(f"{name:<44}{len(plans):>9}{rows:>9}{buffers:>9}{time_ms:>9.2f}  {status}")
+
+        for problem in problems:
+            print(f"    {problem}")
+        if problems:
+            failed.append(name)
+            for plan in plans:
+                print(f"    {'; '.join(plan.scans)}")
+
+        if update:
+            baseline[name] = [plan.to_baseline() for plan in plans]
+
+    if update:
+        _save_baseline({name: baseline[name] for name in CASES if name in baseline})
+        print(f"базовая линия записана в {BASELINE_PATH.name}")
+        return 0
+
+    if failed:
+        print(f"планы деградировали: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--update", action="store_true", help="перезаписать базовую линию")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="только сценарий")
+    parser.add_argument("--keepdb", action="store_true", help="не удалять наполненную БД")
+    args = parser.parse_args()
+
+    test_settings = connection.settings_dict["TEST"]
+    test_settings["NAME"] = f"test_{connection.settings_dict['NAME']}_plans"
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=args.keepdb
+    )
+    try:
+        data = _pick_dataset() if Task.objects.exists() else seed()
+        return run(data, args.case or list(CASES), args.update)
+    finally:
+        if not args.keepdb:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
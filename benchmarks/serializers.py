@@ -0,0 +1,116 @@
+"""
+Сравнение ModelSerializer и core.fast_serializers на странице списка задач.
+
+Данные создаются в транзакции и откатываются; нужна мигрированная БД из настроек.
+Запуск: python -m benchmarks.serializers [--rows N] [--number N]
+
+Пример (100 задач, локальный PostgreSQL):
+                             ModelSerializer   fast path   speedup
+сериализация*                          12.75        2.94      4.3x
+запросы + сериализация                 26.32        5.94      4.4x
+"""
+
+import argparse
+import os
+import timeit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.projects.models import Project, ProjectMember  # noqa: E402
+from apps.tags.models import Tag  # noqa: E402
+from apps.tasks import selectors  # noqa: E402
+from apps.tasks.api.serializers import TaskListSerializer  # noqa: E402
+from apps.tasks.models import TASK_ORDERING, Task  # noqa: E402
+from apps.users.models import User  # noqa: E402
+from core.fast_serializers import CompiledSerializer  # noqa: E402
+from core.ranking import rank_for_slot  # noqa: E402
+
+
+def _create_board(rows: int) -> Project:
+    users = [
+        User.objects.create_user(
+            email=f"bench-{i}@example.com",
+            password=None,
+            first_name="Иван",
+            last_name="Петров",
+            avatar=f"avatars/{i}.png",
+        )
+        for i in range(5)
+    ]
+    project = Project.objects.create(name="benchmark", owner=users[0])
+    ProjectMember.objects.bulk_create(
+        ProjectMember(project=project, user=user, role=ProjectMember.Role.MEMBER) for user in users
+    )
+    tags = [Tag.objects.create(project=project, name=name) for name in ("backend", "api", "bug")]
+
+    tasks = Task.objects.bulk_create(
+        Task(
+            project=project,
+            creator=users[0],
+            assignee=users[i % 5],
+            title=f"Задача #{i}: подготовить релиз",
+            deadline=timezone.now(),
+            order_rank=rank_for_slot(i + 1),
+        )
+        for i in range(rows)
+    )
+    Task.tags.through.objects.bulk_create(
+        Task.tags.through(task_id=task.id, tag_id=tag.id) for task in tasks for tag in tags
+    )
+    return project
+
+
+def run(rows: int, number: int) -> None:
+    context = {"request": RequestFactory().get("/api/v1/", SERVER_NAME="localhost")}
+    renderer = JSONRenderer()
+
+    with transaction.atomic():
+        project = _create_board(rows)
+        queryset = selectors.filter_by_project_with_filters(project).order_by(*TASK_ORDERING)
+        compiled = CompiledSerializer(TaskListSerializer, context)
+
+        instances = list(queryset)
+        values_rows = list(compiled.values(queryset))
+
+        def slow_render():
+            return TaskListSerializer(instances, many=True, context=context).data
+
+        def fast_render():
+            return compiled.render(values_rows)
+
+        def slow_full():
+            return TaskListSerializer(queryset.all(), many=True, context=context).data
+
+        def fast_full():
+            return compiled.render(compiled.values(queryset))
+
+        assert renderer.render(fast_full()) == renderer.render(slow_full())
+
+        print(f"{rows} задач, 3 тега на задачу; время на страницу, мс")
+        print(f"{'':<28}{'ModelSerializer':>16}{'fast path':>12}{'speedup':>10}")
+        for label, slow, fast in (
+            ("сериализация*", slow_render, fast_render),
+            ("запросы + сериализация", slow_full, fast_full),
+        ):
+            slow_time = timeit.timeit(slow, number=number) / number * 1e3
+            fast_time = timeit.timeit(fast, number=number) / number * 1e3
+            print(f"{label:<28}{slow_time:>16.2f}{fast_time:>12.2f}{slow_time / fast_time:>9.1f}x")
+
+        print("* строки уже загружены; fast path здесь же выбирает теги одним запросом")
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="задач на странице")
+    parser.add_argument("--number", type=int, default=50, help="повторов на замер")
+    args = parser.parse_args()
+    run(args.rows, args.number)
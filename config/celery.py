@@ -1,9 +1,24 @@
 import os
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
+
+from core import identity_map
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 
 app = Celery("taskflow")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+@task_prerun.connect
+def activate_identity_map(task=None, **kwargs):
+    task.request.identity_map_token = identity_map.activate()
+
+
+@task_postrun.connect
+def deactivate_identity_map(task=None, **kwargs):
+    token = getattr(task.request, "identity_map_token", None)
+    if token is not None:
+        identity_map.deactivate(token)
@@ -0,0 +1,8 @@
+# Настройки gunicorn для web: gunicorn -c python:config.gunicorn config.wsgi:application
+
+
+def post_worker_init(worker):
+    # приложение уже загружено; поток публикации метрик — свой у каждого воркера
+    from core.metrics import start_metrics_publisher
+
+    start_metrics_publisher()
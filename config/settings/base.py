@@ -2,6 +2,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -50,6 +51,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.IdentityMapMiddleware",
 ]
 
 # URLs
@@ -88,19 +90,50 @@ DATABASES = {
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Cache (Redis)
+# Короткие таймауты: при деградации Redis запрос быстрее уходит в Postgres
+CACHE_REDIS_CONNECT_TIMEOUT = float(os.environ.get("CACHE_REDIS_CONNECT_TIMEOUT", 0.25))
+CACHE_REDIS_SOCKET_TIMEOUT = float(os.environ.get("CACHE_REDIS_SOCKET_TIMEOUT", 0.25))
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+        "OPTIONS": {
+            # msgpack (+ zlib для больших значений) вместо pickle
+            "serializer": "core.codec.CacheSerializer",
+            "socket_connect_timeout": CACHE_REDIS_CONNECT_TIMEOUT,
+            "socket_timeout": CACHE_REDIS_SOCKET_TIMEOUT,
+        },
     }
 }
 
+# Circuit breaker: после N ошибок подряд Redis не трогаем recovery_timeout секунд
+CACHE_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CACHE_CIRCUIT_FAILURE_THRESHOLD", 5))
+CACHE_CIRCUIT_RECOVERY_TIMEOUT = float(os.environ.get("CACHE_CIRCUIT_RECOVERY_TIMEOUT", 30))
+
+# /metrics (Prometheus): заголовок Authorization: Bearer <token>; без токена эндпоинт закрыт
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# воркеры web раз в METRICS_PUBLISH_INTERVAL секунд публикуют снимок метрик в Redis
+# (config/gunicorn.py); снимок старше METRICS_WORKER_TTL — процесс завершился.
+# Пустой METRICS_REDIS_URL — /metrics отдаёт только ответивший процесс
+METRICS_REDIS_URL = os.environ.get(
+    "METRICS_REDIS_URL", os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+)
+METRICS_PUBLISH_INTERVAL = int(os.environ.get("METRICS_PUBLISH_INTERVAL", 5))
+METRICS_WORKER_TTL = int(os.environ.get("METRICS_WORKER_TTL", 60))
+
+# L1 кэш в памяти процесса перед Redis (инвалидация через Redis pub/sub)
+CACHE_L1_ENABLED = os.environ.get("CACHE_L1_ENABLED", "True").lower() == "true"
+CACHE_L1_MAX_ENTRIES = int(os.environ.get("CACHE_L1_MAX_ENTRIES", 10000))
+CACHE_L1_MAX_TTL = int(os.environ.get("CACHE_L1_MAX_TTL", 30))  # секунды
+
 # Channels (WebSocket через Redis)
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
             "hosts": [os.environ.get("REDIS_URL", "redis://localhost:6379/0")],
+            "serializer_format": "msgpack_zlib",
         },
     },
 }
@@ -146,6 +179,13 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "core.exception_handler.custom_exception_handler",
 }
 
+# Выше этого числа строк (по оценке планировщика) списки не считают точный COUNT(*)
+PAGINATION_EXACT_COUNT_THRESHOLD = int(os.environ.get("PAGINATION_EXACT_COUNT_THRESHOLD", 10000))
+
+# Конфигурация полнотекстового поиска PostgreSQL (латиница в ней стеммится english_stem).
+# Входит в GENERATED-колонки search_vector: смена требует миграции.
+SEARCH_CONFIG = "russian"
+
 # JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),  # Время жизни access токена
@@ -177,6 +217,11 @@ List эндпоинты возвращают:
   "results": [...]
 }
 ```
+Списки задач и комментариев дополнительно возвращают `count_is_exact`: на больших выборках
+`count` — оценка планировщика PostgreSQL, а не точный `COUNT(*)`.
+
+С `?pagination=keyset` (задачи, комментарии, проекты) страницы отдаются по курсору
+без `count`: переходите по ссылкам `next`/`previous`.
     """,
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
@@ -219,6 +264,17 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # исправляют расхождения денормализованных счётчиков ProjectStats и UserTaskStats
+    "reconcile-project-stats": {
+        "task": "apps.projects.tasks.reconcile_project_stats",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "reconcile-user-task-stats": {
+        "task": "apps.users.tasks.reconcile_user_task_stats",
+        "schedule": crontab(hour=4, minute=0),
+    },
+}
 
 # Email (SMTP)
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -10,6 +10,10 @@ CACHES = {
     }
 }
 
+CACHE_L1_ENABLED = False
+
+METRICS_REDIS_URL = ""
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
@@ -12,6 +12,11 @@ from .examples import (
     PERMISSION_DENIED_ERROR_EXAMPLE,
     VALIDATION_ERROR_EXAMPLE,
 )
+from .parameters import (
+    CURSOR_PAGINATION_PARAMETERS,
+    KEYSET_PAGINATION_PARAMETERS,
+    SPARSE_FIELDSET_PARAMETERS,
+)
 from .responses import (
     ConflictErrorResponse,
     NotFoundErrorResponse,
@@ -28,6 +33,9 @@ __all__ = [
     "NOT_FOUND_ERROR_EXAMPLE",
     "PERMISSION_DENIED_ERROR_EXAMPLE",
     "CONFLICT_ERROR_EXAMPLE",
+    "CURSOR_PAGINATION_PARAMETERS",
+    "KEYSET_PAGINATION_PARAMETERS",
+    "SPARSE_FIELDSET_PARAMETERS",
     "list_endpoint_schema",
     "create_endpoint_schema",
     "retrieve_endpoint_schema",
@@ -0,0 +1,56 @@
+from drf_spectacular.utils import OpenApiParameter
+
+_CURSOR_PARAMETER = OpenApiParameter(
+    name="cursor",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Курсор из ссылок next/previous (значение непрозрачно)",
+    required=False,
+)
+
+KEYSET_PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="pagination",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "keyset — курсорная пагинация без подсчёта total: ответ содержит next/previous "
+            "со ссылкой на следующую/предыдущую страницу"
+        ),
+        required=False,
+        enum=["keyset"],
+    ),
+    _CURSOR_PARAMETER,
+]
+
+# для списков, которые отдаются только курсорными страницами
+CURSOR_PAGINATION_PARAMETERS = [
+    _CURSOR_PARAMETER,
+    OpenApiParameter(
+        name="page_size",
+        type=int,
+        location=OpenApiParameter.QUERY,
+        description="Размер страницы (до 100)",
+        required=False,
+    ),
+]
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Поля ответа через запятую, например fields=id,title,status,order_rank",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="expand",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Связи, которые отдаются вложенными объектами, через запятую. "
+            "Остальные связи отдаются идентификаторами; без параметра развёрнуты все"
+        ),
+        required=False,
+    ),
+]
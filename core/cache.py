@@ -1,108 +1,1026 @@
+import json
 import logging
+import os
 import random
+import threading
 import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from functools import partial
 
+import redis
+from django.conf import settings
 from django.core.cache import cache
-from redis.exceptions import ConnectionError
+from redis.exceptions import RedisError
+
+from core.metrics import registry
 
 logger = logging.getLogger(__name__)
 
 CACHE_VERSION = "v1"
+CACHE_INVALIDATION_CHANNEL = f"{CACHE_VERSION}:cache:invalidate"
 
 
 class CacheTTL:
     PROJECT = 60 * 10  # 10 минут
     MEMBERSHIP = 60 * 5  # 5 минут
     NOT_FOUND = 60  # 1 минута для негативного кэширования
+    PROJECT_LIST = 60 * 10  # 10 минут
+    TASK_LIST = 60 * 5  # 5 минут
+    OVERDUE_COUNT = 60 * 60  # 1 час; раньше истекает по ближайшему дедлайну
+    STALE_GRACE = 60  # сколько отдаём устаревшее значение, пока идёт пересчёт
 
 
 class CacheKeys:
     PROJECT_DETAIL = f"{CACHE_VERSION}:projects:detail:{{project_id}}"
-    MEMBER_ROLE = f"{CACHE_VERSION}:projects:member_role:{{project_id}}:{{user_id}}"
-    EXISTS_MEMBER = f"{CACHE_VERSION}:projects:exists_member:{{project_id}}:{{user_id}}"
-    IS_ADMIN_OR_OWNER = f"{CACHE_VERSION}:projects:is_admin_or_owner:{{project_id}}:{{user_id}}"
+    # Redis hash: user_id -> role для всех участников проекта
+    PROJECT_MEMBERS = f"{CACHE_VERSION}:projects:members:{{project_id}}"
+    # Счётчик поколения проекта: входит в ключи project-scoped кэшей (project_cache_key)
+    PROJECT_GENERATION = f"{CACHE_VERSION}:projects:generation:{{project_id}}"
+    # Список проектов пользователя: id (по участию) и строки-сводки (по проекту) отдельно
+    USER_PROJECT_IDS = f"{CACHE_VERSION}:projects:user_ids:{{user_id}}"
+    PROJECT_SUMMARY = f"{CACHE_VERSION}:projects:summary:{{project_id}}"
+    # Версия задач проекта: растёт при любом изменении задач, входит в ключ страницы списка
+    TASK_LIST_VERSION = f"{CACHE_VERSION}:tasks:list_version:{{project_id}}"
+    TASK_LIST_PAGE = f"{CACHE_VERSION}:tasks:list:{{project_id}}:v{{version}}:{{query_hash}}"
+    TASK_OVERDUE_COUNT = f"{CACHE_VERSION}:tasks:overdue_count:{{project_id}}"
+
+    @classmethod
+    def family(cls, key: str) -> str:
+        for prefix, family in _KEY_FAMILY_PREFIXES:
+            if key.startswith(prefix):
+                return family
+        return "other"
+
+
+# Статическая часть шаблона ключа -> имя семейства (длинные префиксы проверяются первыми)
+_KEY_FAMILY_PREFIXES = sorted(
+    (
+        (template.split("{")[0], name.lower())
+        for name, template in vars(CacheKeys).items()
+        if name.isupper()
+    ),
+    key=lambda item: len(item[0]),
+    reverse=True,
+)
 
 
 CACHE_NONE_SENTINEL = "__CACHE_NONE__"
 CACHE_FALSE_SENTINEL = "__CACHE_FALSE__"
 
+# Служебное поле hash: отличает загруженный (возможно пустой) hash от отсутствующего
+HASH_LOADED_FIELD = "__loaded__"
+# Маркер "hash изменился, пока его грузили" — загрузка не перезапишет свежие данные
+HASH_DIRTY_TTL_MS = 10_000
 
-def safe_cache_get(key: str, default=None):
+# HSET только в уже загруженный hash, иначе помечаем его как грязный
+_HASH_SET_FIELD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+redis.call('SET', KEYS[2], '1', 'PX', ARGV[3])
+return 0
+"""
+
+_HASH_DELETE_FIELD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+redis.call('SET', KEYS[2], '1', 'PX', ARGV[2])
+return 0
+"""
+
+_HASH_SET_ALL_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+_MISSING = object()
+
+# Конверт stale-while-revalidate в cache_with_lock
+SWR_MARKER = "__swr__"
+SWR_OUTCOMES = ("hit", "stale", "miss")
+_swr_stats: defaultdict[str, Counter[str]] = defaultdict(Counter)
+_swr_stats_lock = threading.Lock()
+
+# Отличает недоступный Redis от промаха
+_UNAVAILABLE = object()
+
+CACHE_REQUESTS = registry.counter(
+    "taskflow_cache_requests_total",
+    "Чтения из Redis по семействам ключей: hit, miss, unavailable",
+    ("family", "result"),
+)
+CACHE_L1_REQUESTS = registry.counter(
+    "taskflow_cache_l1_requests_total",
+    "Чтения из L1 кэша процесса: hit, miss",
+    ("family", "result"),
+)
+CACHE_L1_ENTRIES = registry.gauge("taskflow_cache_l1_entries", "Записей в L1 кэше процесса")
+CACHE_NEGATIVE_HITS = registry.counter(
+    "taskflow_cache_negative_hits_total",
+    "Попадания в негативный кэш (сентинелы None/False)",
+    ("family",),
+)
+CACHE_SETS = registry.counter(
+    "taskflow_cache_sets_total", "Записи в кэш: ok, error", ("family", "result")
+)
+CACHE_LOCK_OUTCOMES = registry.counter(
+    "taskflow_cache_lock_total",
+    "Исходы cache_with_lock: hit, stale, miss",
+    ("family", "outcome"),
+)
+CACHE_LOCK_CONTENTION = registry.counter(
+    "taskflow_cache_lock_contention_total",
+    "cache_with_lock: лок на пересчёт уже занят другим запросом",
+    ("family",),
+)
+CACHE_INVALIDATIONS = registry.counter(
+    "taskflow_cache_invalidations_total",
+    "Инвалидации: delete, bump (счётчик поколения/версии), hash_field",
+    ("family", "kind"),
+)
+REDIS_COMMAND_DURATION = registry.histogram(
+    "taskflow_redis_command_duration_seconds",
+    "Время команд Redis из core.cache",
+    ("operation",),
+)
+REDIS_ERRORS = registry.counter(
+    "taskflow_redis_errors_total", "Ошибки и таймауты Redis", ("operation",)
+)
+REDIS_CIRCUIT_STATE = registry.gauge(
+    "taskflow_redis_circuit_state", "Состояние circuit breaker (1 — текущее)", ("state",)
+)
+REDIS_CIRCUIT_OPENED = registry.counter(
+    "taskflow_redis_circuit_opened_total", "Сколько раз circuit breaker открывался"
+)
+REDIS_CIRCUIT_REJECTED = registry.counter(
+    "taskflow_redis_circuit_rejected_total", "Обращения к Redis, отклонённые открытым circuit"
+)
+CACHE_PENDING_INVALIDATIONS = registry.gauge(
+    "taskflow_cache_pending_invalidations", "Инвалидации, ждущие восстановления Redis"
+)
+
+
+def _record_read(key: str, value) -> None:
+    family = CacheKeys.family(key)
+
+    if value is _UNAVAILABLE:
+        CACHE_REQUESTS.inc(family=family, result="unavailable")
+    elif value is _MISSING:
+        CACHE_REQUESTS.inc(family=family, result="miss")
+    else:
+        CACHE_REQUESTS.inc(family=family, result="hit")
+        if value in (CACHE_NONE_SENTINEL, CACHE_FALSE_SENTINEL):
+            CACHE_NEGATIVE_HITS.inc(family=family)
+
+
+def _record_l1_hit(key: str, value) -> None:
+    if value in (CACHE_NONE_SENTINEL, CACHE_FALSE_SENTINEL):
+        CACHE_NEGATIVE_HITS.inc(family=CacheKeys.family(key))
+
+
+def _record_invalidation(key: str, kind: str) -> None:
+    CACHE_INVALIDATIONS.inc(family=CacheKeys.family(key), kind=kind)
+
+
+class LocalCache:
+    """
+    In-process LRU кэш (L1) с TTL на каждую запись.
+
+    Стоит перед Redis: повторные чтения одного ключа в рамках воркера
+    не ходят в сеть. Согласованность между воркерами обеспечивается
+    рассылкой инвалидаций через Redis pub/sub.
+
+    generation растёт при каждой инвалидации: значение, прочитанное из Redis до неё,
+    set(..., generation=...) в L1 не положит — иначе старое значение прожило бы ещё TTL.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+
+    def get(self, key: str, default=None):
+        family = CacheKeys.family(key)
+
+        with self._lock:
+            item = self._data.get(key)
+
+            if item is not None and item[0] <= time.monotonic():
+                del self._data[key]
+                item = None
+
+            if item is None:
+                self._misses[family] += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits[family] += 1
+            return item[1]
+
+    def set(self, key: str, value, ttl: int, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            families = set(self._hits) | set(self._misses)
+            result = {}
+            for family in sorted(families):
+                hits = self._hits[family]
+                misses = self._misses[family]
+                result[family] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses),
+                }
+            return result
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker для обращений к Redis.
+
+    closed — запросы идут в Redis; после failure_threshold ошибок подряд
+    переходит в open. open — Redis не трогаем вовсе, вызывающий код сразу
+    идёт в Postgres. Через recovery_timeout секунд — half_open: один
+    пробный запрос, по его результату снова closed или open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._opened_total = 0
+        self._rejected_total = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._recovery_due():
+                return self.HALF_OPEN
+            return self._state
+
+    def _recovery_due(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.recovery_timeout
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and self._recovery_due():
+                self._state = self.HALF_OPEN
+
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self._rejected_total += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            recovered = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+        if recovered:
+            logger.info("Redis circuit closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._opened_total += 1
+                    logger.warning("Redis circuit opened", extra={"failures": self._failures})
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened_total": self._opened_total,
+                "rejected_total": self._rejected_total,
+            }
+
+
+_local_cache: LocalCache | None = None
+_local_cache_lock = threading.Lock()
+_listener_pid: int | None = None
+
+_redis_client: redis.Redis | None = None
+
+_circuit_breaker: CircuitBreaker | None = None
+_circuit_breaker_lock = threading.Lock()
+# Инвалидации, не дошедшие до Redis при открытом circuit (или упавшие):
+# ("cache", key) — ключ django cache, ("redis", key) — ключ прямого клиента
+_pending_invalidations: deque[tuple[str, str]] = deque(maxlen=10000)
+_replay_lock = threading.Lock()
+
+
+def get_redis_client() -> redis.Redis | None:
+    """
+    Прямой клиент Redis для операций, которых нет в django.core.cache
+    (pub/sub и т.п.). None, если default-кэш не Redis (тесты, locmem).
+    """
+    global _redis_client
+
+    config = settings.CACHES["default"]
+    if not config["BACKEND"].endswith("RedisCache"):
+        return None
+
+    if _redis_client is None:
+        _redis_client = _create_redis_client(
+            socket_timeout=settings.CACHE_REDIS_SOCKET_TIMEOUT,
+        )
+
+    return _redis_client
+
+
+def _create_redis_client(**kwargs) -> redis.Redis:
+    location = settings.CACHES["default"]["LOCATION"]
+    if isinstance(location, str):
+        location = location.split(",")
+
+    return redis.Redis.from_url(
+        location[0],
+        decode_responses=True,
+        socket_connect_timeout=settings.CACHE_REDIS_CONNECT_TIMEOUT,
+        **kwargs,
+    )
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    global _circuit_breaker
+
+    if _circuit_breaker is None:
+        with _circuit_breaker_lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker(
+                    failure_threshold=settings.CACHE_CIRCUIT_FAILURE_THRESHOLD,
+                    recovery_timeout=settings.CACHE_CIRCUIT_RECOVERY_TIMEOUT,
+                )
+
+    return _circuit_breaker
+
+
+def get_circuit_breaker_stats() -> dict:
+    stats = get_circuit_breaker().stats()
+    stats["pending_invalidations"] = len(_pending_invalidations)
+    return stats
+
+
+def _call_redis(operation: str, key: str, func, default=None):
+    """
+    Любое обращение к Redis идёт через circuit breaker. При открытом circuit
+    или ошибке (включая таймауты) возвращается default.
+    """
+    breaker = get_circuit_breaker()
+    if not breaker.allow_request():
+        return default
+
+    # сначала досылаем отложенные инвалидации, чтобы не прочитать устаревшее
+    if _pending_invalidations and _replay_lock.acquire(blocking=False):
+        try:
+            _replay_invalidations()
+        finally:
+            _replay_lock.release()
+
+    started = time.perf_counter()
     try:
-        return cache.get(key, default=default)
-    except ConnectionError:
-        logger.warning("Redis unavailable on get", extra={"key": key})
+        result = func()
+    except (RedisError, OSError):
+        breaker.record_failure()
+        REDIS_ERRORS.inc(operation=operation)
+        logger.warning(f"Redis unavailable on {operation}", extra={"key": key})
         return default
+    finally:
+        REDIS_COMMAND_DURATION.observe(time.perf_counter() - started, operation=operation)
 
+    breaker.record_success()
+    return result
 
-def safe_cache_set(key: str, value, ttl: int) -> bool:
+
+def _delete_or_defer(kind: str, key: str) -> None:
+    if kind == "cache":
+        func = partial(cache.delete, key)
+    else:
+        func = partial(get_redis_client().delete, key)
+
+    if _call_redis("delete", key, func, default=_MISSING) is _MISSING:
+        _pending_invalidations.append((kind, key))
+
+
+def _replay_invalidations() -> None:
+    if len(_pending_invalidations) == _pending_invalidations.maxlen:
+        logger.error("Redis invalidation queue overflowed, some keys may stay stale")
+
+    keys, prefixes = [], []
+    # если circuit снова откроется, ключи вернутся в очередь — обходим её один раз
+    for _ in range(len(_pending_invalidations)):
+        kind, key = _pending_invalidations.popleft()
+        _delete_or_defer(kind, key)
+
+        if kind == "cache":
+            keys.append(key)
+        else:
+            prefixes.append(_hash_field_key(key, ""))
+
+    if keys or prefixes:
+        _broadcast_invalidation(keys, prefixes)
+
+
+def _l1_generation(local_cache: LocalCache | None) -> int | None:
+    # снимается до обращения к Redis и передаётся в local_cache.set
+    return None if local_cache is None else local_cache.generation
+
+
+def get_local_cache() -> LocalCache | None:
+    global _local_cache
+
+    if not settings.CACHE_L1_ENABLED:
+        return None
+
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LocalCache(settings.CACHE_L1_MAX_ENTRIES)
+
+    _ensure_invalidation_listener()
+    return _local_cache
+
+
+def get_l1_stats() -> dict:
+    if _local_cache is None:
+        return {}
+    return _local_cache.stats()
+
+
+def _ensure_invalidation_listener() -> None:
+    global _listener_pid
+
+    # Поток подписки не переживает fork (gunicorn --preload), поэтому
+    # запускаем его заново в каждом процессе
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+
+    with _local_cache_lock:
+        if _listener_pid == pid:
+            return
+        _listener_pid = pid
+
+        if get_redis_client() is None:
+            return
+
+        thread = threading.Thread(
+            target=_listen_for_invalidations,
+            name="cache-l1-invalidation",
+            daemon=True,
+        )
+        thread.start()
+
+
+def _listen_for_invalidations() -> None:
+    # у подписки свой клиент без socket_timeout: простой канала — не ошибка
+    client = _create_redis_client(health_check_interval=30)
+
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            # пока не были подписаны, инвалидации могли пройти мимо
+            _local_cache.clear()
+
+            for message in pubsub.listen():
+                _apply_invalidation(message["data"])
+        except (RedisError, OSError):
+            logger.warning("Redis unavailable, L1 invalidation listener reconnecting")
+            _local_cache.clear()
+            time.sleep(1)
+        except Exception:
+            # поток не перезапускается (_listener_pid уже выставлен) — не даём ему умереть
+            logger.exception("L1 invalidation listener failed, reconnecting")
+            _local_cache.clear()
+            time.sleep(1)
+
+
+def _apply_invalidation(data) -> None:
     try:
-        cache.set(key, value, ttl)
+        payload = json.loads(data)
+        keys, prefixes = payload["keys"], payload["prefixes"]
+    except (ValueError, TypeError, KeyError):
+        # неизвестно, что инвалидировали — сбрасываем L1 целиком
+        logger.error("Malformed L1 invalidation message", extra={"data": data})
+        _local_cache.clear()
+        return
+
+    _local_cache.delete_many(keys)
+    for prefix in prefixes:
+        _local_cache.delete_prefix(prefix)
+
+
+def _broadcast_invalidation(keys: list[str], prefixes: list[str] = ()) -> None:
+    if _local_cache is not None:
+        _local_cache.delete_many(keys)
+        for prefix in prefixes:
+            _local_cache.delete_prefix(prefix)
+
+    client = get_redis_client()
+    if client is None:
+        return
+
+    payload = json.dumps({"keys": keys, "prefixes": list(prefixes)})
+    _call_redis(
+        "invalidation publish",
+        CACHE_INVALIDATION_CHANNEL,
+        lambda: client.publish(CACHE_INVALIDATION_CHANNEL, payload),
+    )
+
+
+def safe_cache_get(key: str, default=None):
+    local_cache = get_local_cache()
+
+    if local_cache is not None:
+        value = local_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            _record_l1_hit(key, value)
+            return value
+
+    generation = _l1_generation(local_cache)
+    value = _call_redis("get", key, lambda: cache.get(key, _MISSING), default=_UNAVAILABLE)
+    _record_read(key, value)
+
+    if value is _MISSING or value is _UNAVAILABLE:
+        return default
+
+    if local_cache is not None:
+        local_cache.set(key, value, settings.CACHE_L1_MAX_TTL, generation)
+
+    return value
+
+
+def safe_cache_set(key: str, value, ttl: int) -> bool:
+    local_cache = get_local_cache()
+    generation = _l1_generation(local_cache)
+    if not _call_redis("set", key, lambda: cache.set(key, value, ttl) or True, default=False):
+        CACHE_SETS.inc(family=CacheKeys.family(key), result="error")
+        return False
+
+    CACHE_SETS.inc(family=CacheKeys.family(key), result="ok")
+
+    if local_cache is not None:
+        local_cache.set(key, value, min(ttl, settings.CACHE_L1_MAX_TTL), generation)
+
+    return True
+
+
+def safe_cache_get_many(keys: list[str]) -> dict:
+    local_cache = get_local_cache()
+    result = {}
+
+    if local_cache is not None:
+        for key in keys:
+            value = local_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                _record_l1_hit(key, value)
+                result[key] = value
+
+    missing = [key for key in keys if key not in result]
+    if not missing:
+        return result
+
+    generation = _l1_generation(local_cache)
+    fetched = _call_redis(
+        "get_many", missing[0], lambda: cache.get_many(missing), default=_UNAVAILABLE
+    )
+    for key in missing:
+        _record_read(key, _UNAVAILABLE if fetched is _UNAVAILABLE else fetched.get(key, _MISSING))
+
+    if fetched is _UNAVAILABLE:
+        return result
+
+    if local_cache is not None:
+        for key, value in fetched.items():
+            local_cache.set(key, value, settings.CACHE_L1_MAX_TTL, generation)
+
+    result.update(fetched)
+    return result
+
+
+def safe_cache_set_many(mapping: dict, ttl: int) -> bool:
+    if not mapping:
         return True
-    except ConnectionError:
-        logger.warning("Redis unavailable on set", extra={"key": key})
+
+    first_key = next(iter(mapping))
+    family = CacheKeys.family(first_key)
+    local_cache = get_local_cache()
+    generation = _l1_generation(local_cache)
+    if (
+        _call_redis("set_many", first_key, lambda: cache.set_many(mapping, ttl), default=None)
+        is None
+    ):
+        CACHE_SETS.inc(len(mapping), family=family, result="error")
+        return False
+
+    CACHE_SETS.inc(len(mapping), family=family, result="ok")
+
+    if local_cache is not None:
+        for key, value in mapping.items():
+            local_cache.set(key, value, min(ttl, settings.CACHE_L1_MAX_TTL), generation)
+
+    return True
+
+
+def _invalidate_keys(keys: list[str]) -> None:
+    for key in keys:
+        _record_invalidation(key, "delete")
+
+    if (
+        _call_redis("delete", keys[0], lambda: cache.delete_many(keys), default=_MISSING)
+        is _MISSING
+    ):
+        _pending_invalidations.extend(("cache", key) for key in keys)
+
+    _broadcast_invalidation(keys)
+
+
+def _hash_field_key(key: str, field) -> str:
+    return f"{key}#{field}"
+
+
+def safe_hash_get(key: str, field, default=None):
+    """
+    Значение поля Redis hash. default — hash не загружен (или Redis недоступен),
+    CACHE_NONE_SENTINEL — hash загружен, но поля в нём нет.
+    """
+    l1_key = _hash_field_key(key, field)
+    local_cache = get_local_cache()
+
+    if local_cache is not None:
+        value = local_cache.get(l1_key, _MISSING)
+        if value is not _MISSING:
+            _record_l1_hit(key, value)
+            return value
+
+    client = get_redis_client()
+    if client is None:
+        return default
+
+    generation = _l1_generation(local_cache)
+    result = _call_redis(
+        "hget",
+        key,
+        lambda: client.hmget(key, [str(field), HASH_LOADED_FIELD]),
+        default=_UNAVAILABLE,
+    )
+    if result is _UNAVAILABLE:
+        _record_read(key, _UNAVAILABLE)
+        return default
+
+    value, loaded = result
+    if loaded is None:
+        _record_read(key, _MISSING)
+        return default
+
+    if value is None:
+        value = CACHE_NONE_SENTINEL
+    _record_read(key, value)
+
+    if local_cache is not None:
+        local_cache.set(l1_key, value, settings.CACHE_L1_MAX_TTL, generation)
+
+    return value
+
+
+def safe_hash_can_load(key: str) -> bool:
+    """
+    Запишет ли safe_hash_set_all hash: Redis доступен и hash не помечен грязным.
+    Иначе загружать его целиком бессмысленно.
+    """
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    dirty = _call_redis("exists", key, lambda: client.exists(f"{key}:dirty"), default=True)
+    return not dirty
+
+
+def safe_hash_set_all(key: str, mapping: dict, ttl: int) -> bool:
+    client = get_redis_client()
+    if client is None:
         return False
 
+    args = [ttl, HASH_LOADED_FIELD, 1]
+    for field, value in mapping.items():
+        args.extend((field, value))
+
+    return bool(
+        _call_redis(
+            "hset",
+            key,
+            lambda: client.eval(_HASH_SET_ALL_SCRIPT, 2, key, f"{key}:dirty", *args),
+        )
+    )
+
+
+def safe_hash_set_field(key: str, field, value) -> None:
+    client = get_redis_client()
+
+    if client is not None:
+        result = _call_redis(
+            "hset",
+            key,
+            lambda: client.eval(
+                _HASH_SET_FIELD_SCRIPT, 2, key, f"{key}:dirty", field, value, HASH_DIRTY_TTL_MS
+            ),
+            default=_MISSING,
+        )
+        if result is _MISSING:
+            # точечно обновить не вышло — после восстановления сбросим hash целиком
+            _pending_invalidations.append(("redis", key))
+
+    _record_invalidation(key, "hash_field")
+    _broadcast_invalidation([_hash_field_key(key, field)])
 
-def cache_with_lock(key: str, ttl: int, fetch_func, lock_ttl: int = 10):
-    cached = safe_cache_get(key)
 
-    if cached in (CACHE_NONE_SENTINEL, CACHE_FALSE_SENTINEL):
-        return cached
-    if cached is not None:
-        return cached
+def safe_hash_delete_field(key: str, field) -> None:
+    client = get_redis_client()
+
+    if client is not None:
+        result = _call_redis(
+            "hdel",
+            key,
+            lambda: client.eval(
+                _HASH_DELETE_FIELD_SCRIPT, 2, key, f"{key}:dirty", field, HASH_DIRTY_TTL_MS
+            ),
+            default=_MISSING,
+        )
+        if result is _MISSING:
+            _pending_invalidations.append(("redis", key))
+
+    _record_invalidation(key, "hash_field")
+    _broadcast_invalidation([_hash_field_key(key, field)])
+
+
+def _wrap_swr(value, soft_ttl: int) -> dict:
+    return {SWR_MARKER: 1, "value": value, "soft_expires": time.time() + soft_ttl}
+
+
+def _is_swr_entry(entry) -> bool:
+    return isinstance(entry, dict) and SWR_MARKER in entry
+
+
+def _record_swr(key: str, outcome: str) -> None:
+    with _swr_stats_lock:
+        _swr_stats[CacheKeys.family(key)][outcome] += 1
+
+
+def get_swr_stats() -> dict:
+    with _swr_stats_lock:
+        return {
+            family: {outcome: counts[outcome] for outcome in SWR_OUTCOMES}
+            for family, counts in sorted(_swr_stats.items())
+        }
+
+
+def _refresh(key: str, ttl: int, stale_ttl: int, fetch_func):
+    value = fetch_func()
+    soft_ttl = ttl + random.randint(0, max(1, ttl // 10))
+    safe_cache_set(key, _wrap_swr(value, soft_ttl), soft_ttl + stale_ttl)
+    return value
+
+
+def cache_with_lock(
+    key: str, ttl: int, fetch_func, lock_ttl: int = 10, stale_ttl: int = CacheTTL.STALE_GRACE
+):
+    """
+    Stale-while-revalidate: после soft TTL (ttl + jitter) значение ещё stale_ttl
+    секунд отдаётся как есть, пока один обладатель лока пересчитывает его.
+    Остальные запросы лок не ждут никогда.
+    """
+    entry = safe_cache_get(key)
+
+    # негативный результат fetch_func пишет сам, без обёртки и со своим коротким TTL
+    if entry in (CACHE_NONE_SENTINEL, CACHE_FALSE_SENTINEL):
+        _record_swr(key, "hit")
+        return entry
+
+    if _is_swr_entry(entry) and entry["soft_expires"] <= time.time():
+        # копия из L1 могла устареть, а другой воркер уже обновил Redis
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.delete_many([key])
+            entry = safe_cache_get(key)
+
+    if _is_swr_entry(entry) and entry["soft_expires"] > time.time():
+        _record_swr(key, "hit")
+        return entry["value"]
 
     lock_key = f"{key}:lock"
 
+    lock_acquired = _call_redis(
+        "add", lock_key, lambda: cache.add(lock_key, "locked", lock_ttl), default=False
+    )
+
+    if not lock_acquired:
+        CACHE_LOCK_CONTENTION.inc(family=CacheKeys.family(key))
+        if _is_swr_entry(entry):
+            _record_swr(key, "stale")
+            return entry["value"]
+
+        # значения нет совсем — не ждём обладателя лока, считаем сами без записи
+        _record_swr(key, "miss")
+        return fetch_func()
+
+    _record_swr(key, "stale" if _is_swr_entry(entry) else "miss")
+
     try:
-        lock_acquired = cache.add(lock_key, "locked", lock_ttl)
-    except Exception:
-        lock_acquired = False
+        return _refresh(key, ttl, stale_ttl, fetch_func)
+    finally:
+        _call_redis("delete", lock_key, lambda: cache.delete(lock_key))
 
-    jitter_max = max(1, ttl // 10)
 
-    if lock_acquired:
-        try:
-            value = fetch_func()
-            jitter = random.randint(0, jitter_max)
-            safe_cache_set(key, value, ttl + jitter)
+def _get_counter(key: str) -> int:
+    local_cache = get_local_cache()
+
+    if local_cache is not None:
+        value = local_cache.get(key, _MISSING)
+        if value is not _MISSING:
             return value
-        finally:
-            try:
-                cache.delete(lock_key)
-            except Exception:
-                pass
 
-    for _ in range(20):
-        time.sleep(0.05)
-        cached = safe_cache_get(key)
+    def load():
+        value = cache.get(key)
+        if value is None:
+            # стартуем с текущего времени: если счётчик вытеснят из Redis,
+            # новое значение не совпадёт ни с одним из старых
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            value = cache.get(key)
+        return value
 
-        if cached in (CACHE_NONE_SENTINEL, CACHE_FALSE_SENTINEL):
-            return cached
-        if cached is not None:
-            return cached
+    generation = _l1_generation(local_cache)
+    value = _call_redis("get", key, load)
+    if value is None:
+        return 0
+
+    if local_cache is not None:
+        local_cache.set(key, value, settings.CACHE_L1_MAX_TTL, generation)
 
-    # не дождались — сами генерим и всё равно кэшируем
-    value = fetch_func()
-    jitter = random.randint(0, jitter_max)
-    safe_cache_set(key, value, ttl + jitter)
     return value
 
 
+def _bump_counter(key: str) -> None:
+    def incr():
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # счётчика нет — следующее чтение заведёт новое значение
+            return 0
+
+    _record_invalidation(key, "bump")
+    if _call_redis("incr", key, incr, default=_MISSING) is _MISSING:
+        # удалённый счётчик тоже даёт новое значение
+        _pending_invalidations.append(("cache", key))
+
+    _broadcast_invalidation([key])
+
+
+def get_project_generation(project_id: int) -> int:
+    return _get_counter(CacheKeys.PROJECT_GENERATION.format(project_id=project_id))
+
+
+def project_cache_key(template: str, project_id: int, **params) -> str:
+    """
+    Ключ кэша, привязанный к проекту. bump_project_generation разом
+    делает недостижимыми все такие ключи проекта, старые записи доживают по TTL.
+    """
+    base = template.format(project_id=project_id, **params)
+    return f"{base}:g{get_project_generation(project_id)}"
+
+
+def bump_project_generation(project_id: int) -> None:
+    _bump_counter(CacheKeys.PROJECT_GENERATION.format(project_id=project_id))
+
+
+def get_task_list_version(project_id: int) -> int:
+    return _get_counter(CacheKeys.TASK_LIST_VERSION.format(project_id=project_id))
+
+
+def bump_task_list_version(project_id: int) -> None:
+    _bump_counter(CacheKeys.TASK_LIST_VERSION.format(project_id=project_id))
+
+
+def invalidate_overdue_count(project_id: int) -> None:
+    _invalidate_keys([project_cache_key(CacheKeys.TASK_OVERDUE_COUNT, project_id)])
+
+
 def invalidate_project_cache(project_id: int) -> None:
-    cache.delete(CacheKeys.PROJECT_DETAIL.format(project_id=project_id))
+    _invalidate_keys(
+        [
+            project_cache_key(CacheKeys.PROJECT_DETAIL, project_id),
+            CacheKeys.PROJECT_SUMMARY.format(project_id=project_id),
+        ]
+    )
+
+
+def invalidate_user_project_ids(user_id: int) -> None:
+    _invalidate_keys([CacheKeys.USER_PROJECT_IDS.format(user_id=user_id)])
+
+
+def update_membership_cache(project_id: int, user_id: int, role: str | None) -> None:
+    key = project_cache_key(CacheKeys.PROJECT_MEMBERS, project_id)
+
+    if role is None:
+        safe_hash_delete_field(key, user_id)
+    else:
+        safe_hash_set_field(key, user_id, role)
+
+
+def invalidate_membership_cache(project_id: int) -> None:
+    key = project_cache_key(CacheKeys.PROJECT_MEMBERS, project_id)
+    _record_invalidation(key, "delete")
+
+    if get_redis_client() is not None:
+        _delete_or_defer("redis", key)
+
+    _broadcast_invalidation([], prefixes=[_hash_field_key(key, "")])
+
+
+def invalidate_all_project_caches(project_id: int) -> None:
+    bump_project_generation(project_id)
+    # сводка не зависит от поколения; списки id участников самоочищаются при чтении
+    _invalidate_keys([CacheKeys.PROJECT_SUMMARY.format(project_id=project_id)])
+
+
+def _collect_metrics() -> None:
+    if _local_cache is not None:
+        for family, stats in _local_cache.stats().items():
+            CACHE_L1_REQUESTS.set(stats["hits"], family=family, result="hit")
+            CACHE_L1_REQUESTS.set(stats["misses"], family=family, result="miss")
+        CACHE_L1_ENTRIES.set(len(_local_cache))
 
+    for family, outcomes in get_swr_stats().items():
+        for outcome, count in outcomes.items():
+            CACHE_LOCK_OUTCOMES.set(count, family=family, outcome=outcome)
 
-def invalidate_membership_cache(project_id: int, user_id: int) -> None:
-    keys = [
-        CacheKeys.MEMBER_ROLE.format(project_id=project_id, user_id=user_id),
-        CacheKeys.EXISTS_MEMBER.format(project_id=project_id, user_id=user_id),
-        CacheKeys.IS_ADMIN_OR_OWNER.format(project_id=project_id, user_id=user_id),
-    ]
-    cache.delete_many(keys)
+    breaker_stats = get_circuit_breaker_stats()
+    for state in (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN):
+        REDIS_CIRCUIT_STATE.set(int(breaker_stats["state"] == state), state=state)
+    REDIS_CIRCUIT_OPENED.set(breaker_stats["opened_total"])
+    REDIS_CIRCUIT_REJECTED.set(breaker_stats["rejected_total"])
+    CACHE_PENDING_INVALIDATIONS.set(breaker_stats["pending_invalidations"])
 
 
-def invalidate_all_project_caches(project_id: int, user_ids: list[int]) -> None:
-    invalidate_project_cache(project_id)
-    for user_id in user_ids:
-        invalidate_membership_cache(project_id, user_id)
+registry.add_collector(_collect_metrics)
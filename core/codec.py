@@ -0,0 +1,105 @@
+import pickle
+import uuid
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import msgpack
+
+# Формат: 1 байт заголовка + msgpack (сжатый zlib, если payload больше порога)
+HEADER_RAW = b"\x00"
+HEADER_ZLIB = b"\x01"
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 1  # скорость важнее последних процентов размера
+
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_TIME = 3
+_EXT_DECIMAL = 4
+_EXT_UUID = 5
+_EXT_PICKLE = 127
+
+_PICKLE_PROTOCOL_MARKER = 0x80
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, time):
+        return msgpack.ExtType(_EXT_TIME, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+    # редкие типы (модели, множества) — как раньше, через pickle
+    return msgpack.ExtType(_EXT_PICKLE, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_TIME:
+        return time.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == _EXT_PICKLE:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def packb(value) -> bytes:
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def unpackb(data: bytes):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def encode(value) -> bytes:
+    """Кортежи после decode становятся списками."""
+    packed = packb(value)
+
+    if len(packed) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(packed, COMPRESS_LEVEL)
+        if len(compressed) < len(packed):
+            return HEADER_ZLIB + compressed
+
+    return HEADER_RAW + packed
+
+
+def decode(data: bytes):
+    header = data[:1]
+
+    if header == HEADER_RAW:
+        return unpackb(data[1:])
+    if header == HEADER_ZLIB:
+        return unpackb(zlib.decompress(data[1:]))
+    if data[0] == _PICKLE_PROTOCOL_MARKER:
+        # значения, записанные до перехода на msgpack
+        return pickle.loads(data)
+
+    raise ValueError(f"Unknown codec header: {header!r}")
+
+
+class CacheSerializer:
+    """
+    Сериализатор для django.core.cache (OPTIONS["serializer"] у RedisCache).
+    Целые числа пишутся как есть, чтобы работали INCR/cache.incr.
+    """
+
+    def dumps(self, obj):
+        if type(obj) is int:
+            return obj
+        return encode(obj)
+
+    def loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            return decode(data)
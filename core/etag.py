@@ -0,0 +1,28 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags, quote_etag
+
+
+def compute_etag(data) -> str:
+    """Сильный ETag: хэш от JSON-представления данных ответа."""
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return quote_etag(hashlib.sha1(content.encode()).hexdigest())
+
+
+def etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+
+    etags = parse_etags(header)
+    # для If-None-Match сравнение слабое (RFC 9110): префикс W/ не учитываем
+    return "*" in etags or any(candidate.removeprefix("W/") == etag for candidate in etags)
+
+
+def request_cache_hash(request) -> str:
+    """Хэш URL запроса без учёта порядка параметров: ссылки пагинации абсолютные."""
+    params = sorted((key, value) for key in request.GET for value in request.GET.getlist(key))
+    raw = json.dumps([request.build_absolute_uri(request.path), params])
+    return hashlib.sha1(raw.encode()).hexdigest()
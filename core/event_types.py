@@ -9,6 +9,10 @@ class TaskEvents(str, Enum):
     ASSIGNED = "task.assigned"
     REORDERED = "task.reordered"
     TAGS_CHANGED = "task.tags_changed"
+    BULK_CREATED = "task.bulk_created"
+    BULK_UPDATED = "task.bulk_updated"
+    # data — новый порядок набора [{"id", "order_rank"}, ...], а не задача, как у REORDERED
+    BULK_REORDERED = "task.bulk_reordered"
 
 
 class CommentEvents(str, Enum):
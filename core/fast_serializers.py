@@ -0,0 +1,244 @@
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Быстрый путь для горячих list-эндпоинтов: строки берутся из values(), а ответ
+# собирается заранее скомпилированными accessor-ами без моделей и ModelSerializer.
+# Вывод совпадает с обычным сериализатором байт в байт; всё, что компилятор
+# не умеет (SerializerMethodField, dotted source, обратные связи), уводит на обычный путь.
+
+# to_representation этих полей для значений из БД — тождественное преобразование
+_IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def _datetime_converter(field: serializers.DateTimeField):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _file_converter(field: serializers.FileField, model_field: models.FileField, context: dict):
+    if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+        return lambda name: name or None
+
+    storage = model_field.storage
+    request = context.get("request")
+    # одни и те же аватары повторяются на странице; компилируется на запрос — кэш не растёт
+    urls = {}
+
+    def convert(name):
+        if not name:
+            return None
+        if name not in urls:
+            url = storage.url(name)
+            urls[name] = request.build_absolute_uri(url) if request is not None else url
+        return urls[name]
+
+    return convert
+
+
+def _converter(field, model_field, context):
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.FileField):
+        return _file_converter(field, model_field, context)
+    if isinstance(field, _IDENTITY_FIELDS):
+        return None
+    if type(field).to_representation is serializers.Field.to_representation:
+        raise NotCompilable(field)
+    return field.to_representation
+
+
+def _accessor(path: str, convert):
+    getter = itemgetter(path)
+    if convert is None:
+        return lambda row, related: getter(row)
+
+    def access(row, related):
+        value = getter(row)
+        return None if value is None else convert(value)
+
+    return access
+
+
+def _related_order(model, prefix: str) -> list[str]:
+    order = []
+    for name in model._meta.ordering:
+        desc = name.startswith("-")
+        order.append(f"{'-' if desc else ''}{prefix}{name.lstrip('-')}")
+    return order
+
+
+class _ManyRelation:
+    """Forward M2M: одна выборка по through-таблице на страницу вместо prefetch."""
+
+    def __init__(self, name: str, model_field: models.ManyToManyField, child, context: dict):
+        through = model_field.remote_field.through
+        self.name = name
+        self.source_key = model_field.m2m_field_name()
+        target = model_field.m2m_reverse_field_name()
+        self.queryset = through.objects.order_by(
+            *_related_order(model_field.related_model, f"{target}__"), "pk"
+        )
+
+        if isinstance(child, serializers.PrimaryKeyRelatedField):
+            self.paths = [f"{target}_id"]
+            self.build = itemgetter(self.paths[0])
+        else:
+            compiled = _CompiledFields(child, model_field.related_model, context, f"{target}__")
+            self.paths = compiled.paths
+            self.build = lambda row: compiled.build(row, None)
+
+    def load(self, parent_ids: list) -> dict:
+        grouped = {parent_id: [] for parent_id in parent_ids}
+        rows = self.queryset.filter(**{f"{self.source_key}__in": parent_ids}).values(
+            self.source_key, *self.paths
+        )
+        for row in rows:
+            grouped[row[self.source_key]].append(self.build(row))
+        return grouped
+
+
+class _CompiledFields:
+    def __init__(self, serializer, model, context: dict, prefix: str = ""):
+        self.paths: list[str] = []
+        self.many: list[_ManyRelation] = []
+        self.accessors = []
+
+        for name, field in serializer.fields.items():
+            source = field.source
+            if source == "*" or "." in source:
+                raise NotCompilable(name)
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                raise NotCompilable(name)
+
+            if isinstance(field, serializers.ManyRelatedField | serializers.ListSerializer):
+                if prefix or not isinstance(model_field, models.ManyToManyField):
+                    raise NotCompilable(name)
+                child = (
+                    field.child_relation
+                    if isinstance(field, serializers.ManyRelatedField)
+                    else field.child
+                )
+                relation = _ManyRelation(name, model_field, child, context)
+                self.many.append(relation)
+                self.accessors.append((name, lambda row, related, r=relation: related[r.name]))
+                continue
+
+            path = f"{prefix}{source}"
+            if isinstance(field, serializers.BaseSerializer):
+                if not model_field.many_to_one and not model_field.one_to_one:
+                    raise NotCompilable(name)
+                nested = _CompiledFields(field, model_field.related_model, context, f"{path}__")
+                self.paths.append(path)
+                self.paths.extend(nested.paths)
+                null_getter = itemgetter(path)
+                self.accessors.append(
+                    (
+                        name,
+                        lambda row, related, g=null_getter, n=nested: (
+                            None if g(row) is None else n.build(row, related)
+                        ),
+                    )
+                )
+                continue
+
+            self.paths.append(path)
+            self.accessors.append((name, _accessor(path, _converter(field, model_field, context))))
+
+    def build(self, row: dict, related) -> dict:
+        return {name: access(row, related) for name, access in self.accessors}
+
+
+class CompiledSerializer:
+    """
+    Read-only сериализатор списка, скомпилированный из обычного (с учётом context:
+    fieldset, request для абсолютных URL файлов).
+    """
+
+    def __init__(self, serializer_class, context: dict):
+        serializer = serializer_class(context=context)
+        self.model = serializer.Meta.model
+        self.fields = _CompiledFields(serializer, self.model, context)
+        self.pk_name = self.model._meta.pk.name
+
+    def values(self, queryset, extra: tuple[str, ...] = ()):
+        paths = list(dict.fromkeys([self.pk_name, *self.fields.paths, *extra]))
+        return queryset.select_related(None).prefetch_related(None).values(*paths)
+
+    def render(self, rows) -> list[dict]:
+        rows = list(rows)
+        parent_ids = [row[self.pk_name] for row in rows]
+        related = {relation.name: relation.load(parent_ids) for relation in self.fields.many}
+
+        build = self.fields.build
+        if not related:
+            return [build(row, None) for row in rows]
+        return [
+            build(row, {name: values[row[self.pk_name]] for name, values in related.items()})
+            for row in rows
+        ]
+
+
+def compile_serializer(serializer_class, context: dict) -> CompiledSerializer | None:
+    try:
+        return CompiledSerializer(serializer_class, context)
+    except NotCompilable:
+        return None
+
+
+class FastListMixin:
+    """list() через CompiledSerializer с фолбэком на обычный сериализатор."""
+
+    def fast_list_response(self, queryset, context: dict | None = None) -> Response:
+        serializer_class = self.get_serializer_class()
+        if context is None:
+            context = self.get_serializer_context()
+
+        compiled = compile_serializer(serializer_class, context)
+        if compiled is None:
+            return self._slow_list_response(queryset, serializer_class, context)
+
+        # ключи курсора keyset-пагинации читаются из тех же строк
+        extra = tuple(name.lstrip("-") for name in getattr(self.paginator, "ordering", ()))
+        rows = compiled.values(queryset, extra)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page))
+        return Response(compiled.render(rows))
+
+    def _slow_list_response(self, queryset, serializer_class, context: dict) -> Response:
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        serializer = serializer_class(queryset, many=True, context=context)
+        return Response(serializer.data)
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """
+    Набор полей из ?fields= и ?expand=. None — параметр не передан:
+    все поля / все связи развёрнуты, как без sparse fieldsets.
+    """
+
+    fields: frozenset[str] | None = None
+    expand: frozenset[str] | None = None
+
+    def includes(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def expands(self, name: str) -> bool:
+        return self.includes(name) and (self.expand is None or name in self.expand)
+
+
+def _parse_names(request, param: str) -> frozenset[str] | None:
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+def parse_fieldset(request, serializer_class) -> Fieldset:
+    fields = _parse_names(request, FIELDS_PARAM) or None
+    expand = _parse_names(request, EXPAND_PARAM)
+
+    errors = {}
+    if fields is not None:
+        unknown = fields - set(serializer_class.Meta.fields)
+        if unknown:
+            errors[FIELDS_PARAM] = f"Неизвестные поля: {', '.join(sorted(unknown))}"
+    if expand is not None:
+        unknown = expand - set(serializer_class.expandable_fields)
+        if unknown:
+            errors[EXPAND_PARAM] = f"Нельзя развернуть: {', '.join(sorted(unknown))}"
+    if errors:
+        raise ValidationError(errors)
+
+    return Fieldset(fields=fields, expand=expand)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Убирает поля, не попавшие в fieldset из context, а связи из expandable_fields
+    без expand отдаёт идентификаторами (creator_id без JOIN, теги — списком id).
+    """
+
+    expandable_fields: tuple[str, ...] = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        fieldset = self.context.get("fieldset")
+        if fieldset is None:
+            return
+
+        for name in list(self.fields):
+            if not fieldset.includes(name):
+                self.fields.pop(name)
+            elif name in self.expandable_fields and not fieldset.expands(name):
+                many = isinstance(self.fields[name], serializers.ListSerializer)
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=many)
+
+
+class SparseFieldsetViewMixin:
+    """Разбирает ?fields=/?expand= для list и передаёт fieldset в сериализатор."""
+
+    def get_fieldset(self) -> Fieldset:
+        if not hasattr(self, "_fieldset"):
+            if self.action == "list":
+                self._fieldset = parse_fieldset(self.request, self.get_serializer_class())
+            else:
+                self._fieldset = Fieldset()
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
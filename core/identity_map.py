@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+# Identity map живёт в рамках одного HTTP-запроса или одной Celery-задачи.
+# Вне активной области селекторы работают как обычно — без мемоизации.
+_identity_map: ContextVar[dict | None] = ContextVar("identity_map", default=None)
+
+
+def activate() -> Token:
+    return _identity_map.set({})
+
+
+def deactivate(token: Token) -> None:
+    _identity_map.reset(token)
+
+
+@contextmanager
+def identity_map_scope():
+    token = activate()
+    try:
+        yield
+    finally:
+        deactivate(token)
+
+
+def is_active() -> bool:
+    return _identity_map.get() is not None
+
+
+def get_or_load(key: tuple, loader):
+    store = _identity_map.get()
+    if store is None:
+        return loader()
+
+    try:
+        return store[key]
+    except KeyError:
+        pass
+
+    # исключения (NotFoundError) не мемоизируются
+    value = loader()
+    store[key] = value
+    return value
+
+
+def put(key: tuple, value) -> None:
+    store = _identity_map.get()
+    if store is not None:
+        store[key] = value
+
+
+def discard(*keys: tuple) -> None:
+    store = _identity_map.get()
+    if store is None:
+        return
+
+    for key in keys:
+        store.pop(key, None)
@@ -0,0 +1,279 @@
+import bisect
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Метрики процесса в текстовом формате Prometheus (без prometheus_client).
+# Воркеры web публикуют снимки в Redis (start_metrics_publisher из config/gunicorn.py):
+# /metrics любого воркера отдаёт ряды всех живых процессов с меткой worker.
+
+# Redis hash: worker -> {"published_at", "metrics"}
+METRICS_WORKERS_KEY = "metrics:workers"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: defaultdict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def set(self, value: float, **labels) -> None:
+        """Для значений, которые считает кто-то другой (collectors)."""
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.labelnames, key, strict=True)), value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # на каждый набор меток: [счётчики по бакетам..., +Inf], сумма
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total[0])) for key, (counts, total) in self._values.items()
+            )
+
+        for key, (counts, total) in items:
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        # collectors вызываются при каждом скрейпе и обновляют gauge/counter из внешних данных
+        self._collectors = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self._register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self._register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self._register(Histogram(*args, **kwargs))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector) -> None:
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, list]:
+        """Значения метрик процесса: имя метрики -> [(имя ряда, метки, значение), ...]."""
+        for collector in self._collectors:
+            collector()
+        return {metric.name: list(metric.samples()) for metric in self._metrics}
+
+    def render(self, snapshots: dict[str, dict] | None = None) -> str:
+        """snapshots — снимки нескольких процессов (worker -> snapshot()), иначе — этот процесс."""
+        if snapshots is None:
+            workers = [(None, self.snapshot())]
+        else:
+            workers = sorted(snapshots.items())
+
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for worker, snapshot in workers:
+                for name, labels, value in snapshot.get(metric.name, ()):
+                    if worker is not None:
+                        labels = {**labels, "worker": worker}
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+
+_redis_client: redis.Redis | None = None
+_publisher_pid: int | None = None
+_publisher_lock = threading.Lock()
+
+
+def _get_redis_client() -> redis.Redis | None:
+    # свой клиент, мимо circuit breaker кэша: фоновая публикация не влияет на запросы
+    global _redis_client
+
+    if not settings.METRICS_REDIS_URL:
+        return None
+
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.METRICS_REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.CACHE_REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.CACHE_REDIS_SOCKET_TIMEOUT,
+        )
+    return _redis_client
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def publish_metrics(snapshot: dict | None = None) -> None:
+    client = _get_redis_client()
+    if client is None:
+        return
+
+    if snapshot is None:
+        snapshot = registry.snapshot()
+    payload = json.dumps({"published_at": time.time(), "metrics": snapshot})
+    try:
+        client.hset(METRICS_WORKERS_KEY, worker_id(), payload)
+    except (RedisError, OSError):
+        logger.warning("Redis unavailable, metrics snapshot not published")
+
+
+def collect_worker_metrics() -> dict[str, dict]:
+    """
+    Снимки метрик всех живых процессов (worker -> snapshot). Свой снимок — текущий;
+    без Redis — только он. Процессы, не публиковавшиеся METRICS_WORKER_TTL, удаляются.
+    """
+    own = {worker_id(): registry.snapshot()}
+    client = _get_redis_client()
+    if client is None:
+        return own
+
+    publish_metrics(own[worker_id()])
+    try:
+        entries = client.hgetall(METRICS_WORKERS_KEY)
+    except (RedisError, OSError):
+        logger.warning("Redis unavailable, exporting metrics of this process only")
+        return own
+
+    deadline = time.time() - settings.METRICS_WORKER_TTL
+    snapshots, dead = {}, []
+    for worker, raw in entries.items():
+        entry = json.loads(raw)
+        if entry["published_at"] < deadline:
+            dead.append(worker)
+        else:
+            snapshots[worker] = entry["metrics"]
+
+    if dead:
+        try:
+            client.hdel(METRICS_WORKERS_KEY, *dead)
+        except (RedisError, OSError):
+            pass
+    return {**snapshots, **own}
+
+
+def start_metrics_publisher() -> None:
+    """Поток публикации снимков; запускается явно в каждом воркере web (после fork)."""
+    global _publisher_pid
+
+    with _publisher_lock:
+        if _publisher_pid == os.getpid() or _get_redis_client() is None:
+            return
+        _publisher_pid = os.getpid()
+
+        thread = threading.Thread(
+            target=_publish_metrics_forever, name="metrics-publisher", daemon=True
+        )
+        thread.start()
+
+
+def _publish_metrics_forever() -> None:
+    while True:
+        time.sleep(settings.METRICS_PUBLISH_INTERVAL)
+        publish_metrics()
@@ -7,9 +7,22 @@ from rest_framework_simplejwt.tokens import AccessToken
 
 from apps.users.models import User
 
+from .identity_map import identity_map_scope
+
 logger = logging.getLogger(__name__)
 
 
+class IdentityMapMiddleware:
+    """Открывает identity map на время обработки HTTP-запроса."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_map_scope():
+            return self.get_response(request)
+
+
 class JWTAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         token = self._get_token_from_scope(scope)
@@ -1,7 +1,350 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+def estimate_count(queryset) -> int | None:
+    """Оценка числа строк из статистики планировщика PostgreSQL (EXPLAIN без выполнения)."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    query = queryset.order_by().query.clone()
+    query.select_related = False
+    sql, params = query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Точный COUNT(*) только для небольших выборок. Выше порога count — оценка планировщика,
+    а наличие следующей страницы определяется выборкой per_page + 1 строки.
+    stored_count — денормализованный счётчик выборки: с ним не нужны ни COUNT, ни EXPLAIN.
+    """
+
+    def __init__(self, object_list, per_page, *args, stored_count: int | None = None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.stored_count = stored_count
+
+    @cached_property
+    def count_is_exact(self) -> bool:
+        if self.stored_count is not None:
+            return True
+        self._estimate = estimate_count(self.object_list)
+        return self._estimate is None or self._estimate < settings.PAGINATION_EXACT_COUNT_THRESHOLD
+
+    @cached_property
+    def counts_rows(self) -> bool:
+        # страницы по COUNT(*); иначе — выборкой per_page + 1, без опоры на count
+        return self.stored_count is None and self.count_is_exact
+
+    @cached_property
+    def count(self):
+        if self.stored_count is not None:
+            return self.stored_count
+        if self.count_is_exact:
+            return super().count
+        return self._estimate
+
+    def validate_number(self, number):
+        if self.counts_rows:
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("Номер страницы должен быть целым числом")
+        if number < 1:
+            raise InvalidPage("Номер страницы меньше 1")
+        return number
+
+    def page(self, number):
+        if self.counts_rows:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise InvalidPage("Страница не содержит результатов")
+        return EstimatedPage(
+            rows[: self.per_page], number, self, has_next=len(rows) > self.per_page
+        )
+
+
+class EstimatedCountPagination(StandardPagination):
+    """Источник count может задать view методом get_stored_count() (None — оценка)."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        get_stored_count = getattr(view, "get_stored_count", None)
+        self.stored_count = get_stored_count() if get_stored_count else None
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return EstimatedCountPaginator(object_list, per_page, stored_count=self.stored_count)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_exact": self.page.paginator.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_exact"] = {"type": "boolean", "example": True}
+        response_schema["required"].append("count_is_exact")
+        return response_schema
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder обрезает микросекунды — для курсора нужна точность до микросекунды
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    raise TypeError(f"Unsupported cursor value: {type(value).__name__}")
+
+
+def _row_value(row, name: str):
+    # строки быстрого пути (core.fast_serializers) — словари из values()
+    if isinstance(row, dict):
+        return row[name]
+    return getattr(row, name)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная пагинация по ключу сортировки: WHERE (ключ) > (последний ключ страницы)
+    вместо OFFSET и без COUNT(*). Поля ordering должны быть NOT NULL (кроме nullable_fields),
+    последнее — уникальное (id), а под (фильтр, *ordering) должен быть индекс.
+    """
+
+    ordering: tuple[str, ...] = ("-created_at", "-id")
+    # NULL в этих полях сортируется как в PostgreSQL по умолчанию — больше любого значения
+    nullable_fields: tuple[str, ...] = ()
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Некорректный курсор"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [self._parse_field(field) for field in self.ordering]
+
+        cursor = self.decode_cursor(request, queryset)
+        reverse = cursor is not None and cursor["reverse"]
+        rows = self.fetch_rows(queryset, cursor["values"] if cursor else None, reverse)
+
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if not self.page:
+            self.next_cursor = self.previous_cursor = None
+        elif reverse:
+            self.next_cursor = self.encode_cursor(self.page[-1], reverse=False)
+            self.previous_cursor = (
+                self.encode_cursor(self.page[0], reverse=True) if has_more else None
+            )
+        else:
+            self.next_cursor = (
+                self.encode_cursor(self.page[-1], reverse=False) if has_more else None
+            )
+            self.previous_cursor = (
+                self.encode_cursor(self.page[0], reverse=True) if cursor is not None else None
+            )
+
+        return self.page
+
+    def fetch_rows(self, queryset, values: list | None, reverse: bool) -> list:
+        if values is not None:
+            queryset = queryset.filter(self._build_filter(values, reverse))
+        return list(queryset.order_by(*self.get_order_by(reverse))[: self.page_size + 1])
+
+    def get_order_by(self, reverse: bool) -> list[str]:
+        return [f"-{name}" if desc != reverse else name for name, desc in self.fields]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def _parse_field(self, field: str) -> tuple[str, bool]:
+        if field.startswith("-"):
+            return field[1:], True
+        return field, False
+
+    def _build_filter(self, values: list, reverse: bool) -> Q:
+        # (a, b, c) > (x, y, z) при разных направлениях сортировки раскрывается в OR:
+        # a > x OR (a = x AND b < y) OR (a = x AND b = y AND c < z)
+        clauses = []
+        for index, (name, desc) in enumerate(self.fields):
+            lookup = "lt" if desc != reverse else "gt"
+            equal = [
+                self._equal(prev_name, values[i])
+                for i, (prev_name, _) in enumerate(self.fields[:index])
+            ]
+            clauses.append(reduce(and_, [*equal, self._compare(name, lookup, values[index])]))
+
+        # дублируем условие по первому полю отдельно — по нему планировщик строит диапазон индекса
+        first_name, first_desc = self.fields[0]
+        first_lookup = "lte" if first_desc != reverse else "gte"
+        return self._compare(first_name, first_lookup, values[0]) & reduce(or_, clauses)
+
+    def _equal(self, name: str, value) -> Q:
+        if value is None:
+            return Q(**{f"{name}__isnull": True})
+        return Q(**{name: value})
+
+    def _compare(self, name: str, lookup: str, value) -> Q:
+        if name not in self.nullable_fields:
+            return Q(**{f"{name}__{lookup}": value})
+
+        # NULL больше любого значения: «больше NULL» нет ничего, «меньше NULL» — всё непустое
+        is_null = Q(**{f"{name}__isnull": True})
+        if value is None:
+            if lookup == "gt":
+                return Q(pk__in=[])
+            if lookup == "gte":
+                return is_null
+            return ~is_null if lookup == "lt" else Q()
+        if lookup in ("gt", "gte"):
+            return Q(**{f"{name}__{lookup}": value}) | is_null
+        return Q(**{f"{name}__{lookup}": value})
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        payload = {
+            "v": [_row_value(row, name) for name, _ in self.fields],
+            "r": reverse,
+        }
+        raw = json.dumps(payload, default=_encode_value, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def to_python(self, queryset, name: str, value):
+        return queryset.model._meta.get_field(name).to_python(value)
+
+    def decode_cursor(self, request, queryset) -> dict | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            values = payload["v"]
+            if len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                self.to_python(queryset, name, value)
+                for (name, _), value in zip(self.fields, values, strict=True)
+            ]
+            if any(
+                value is None and name not in self.nullable_fields
+                for (name, _), value in zip(self.fields, values, strict=True)
+            ):
+                raise ValueError
+            return {"values": values, "reverse": bool(payload.get("r"))}
+        except (
+            binascii.Error,
+            ValueError,
+            KeyError,
+            TypeError,
+            AttributeError,
+            DjangoValidationError,
+        ):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.next_cursor,
+                "previous": self.previous_cursor,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Позволяет view выбрать курсорную пагинацию вместо постраничной:
+    ?pagination=keyset для первой страницы, дальше — ссылки next/previous с ?cursor=.
+    """
+
+    keyset_pagination_class: type[KeysetPagination] | None = None
+
+    def get_keyset_pagination_class(self) -> type[KeysetPagination] | None:
+        return self.keyset_pagination_class
+
+    def uses_keyset_pagination(self) -> bool:
+        if self.get_keyset_pagination_class() is None:
+            return False
+        params = self.request.query_params
+        return params.get("pagination") == "keyset" or KeysetPagination.cursor_query_param in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.uses_keyset_pagination():
+                self._paginator = self.get_keyset_pagination_class()()
+            else:
+                return super().paginator
+        return self._paginator
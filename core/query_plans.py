@@ -0,0 +1,122 @@
+import json
+import math
+from dataclasses import dataclass
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+# Проверка планов горячих запросов: EXPLAIN (ANALYZE, BUFFERS) и сравнение с базовой
+# линией — новый Seq Scan, рост прочитанных строк/буферов или числа запросов.
+
+BUDGET_HEADROOM = 1.5
+BUDGET_SLACK = 20
+
+_SCAN_SUFFIX = "Scan"
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    sql: str
+    scans: tuple[str, ...]
+    seq_scans: frozenset[str]
+    rows: int
+    buffers: int
+    time_ms: float
+
+    def to_baseline(self) -> dict:
+        return {
+            "scans": list(self.scans),
+            "seq_scans": sorted(self.seq_scans),
+            "max_rows": _budget(self.rows),
+            "max_buffers": _budget(self.buffers),
+        }
+
+
+def _budget(value: int) -> int:
+    return math.ceil(value * BUDGET_HEADROOM) + BUDGET_SLACK
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def _describe_scan(node: dict) -> str:
+    description = f"{node['Node Type']} on {node['Relation Name']}"
+    if "Index Name" in node:
+        description += f" using {node['Index Name']}"
+    return description
+
+
+def summarize(plan: dict, sql: str = "") -> PlanSummary:
+    """
+    rows — строки, которые прочитали узлы сканирования (отданные + отброшенные фильтром),
+    buffers — shared hit + read корневого узла (включает дочерние).
+    """
+    root = plan["Plan"]
+    scans = set()
+    seq_scans = set()
+    rows = 0
+
+    for node in _walk(root):
+        if not node["Node Type"].endswith(_SCAN_SUFFIX) or "Relation Name" not in node:
+            continue
+        scans.add(_describe_scan(node))
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+        # Actual Rows и Rows Removed by * — средние на один loop
+        per_loop = (
+            node.get("Actual Rows", 0)
+            + node.get("Rows Removed by Filter", 0)
+            + node.get("Rows Removed by Index Recheck", 0)
+        )
+        rows += math.ceil(per_loop * node.get("Actual Loops", 1))
+
+    return PlanSummary(
+        sql=sql,
+        scans=tuple(sorted(scans)),
+        seq_scans=frozenset(seq_scans),
+        rows=rows,
+        buffers=root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        time_ms=plan.get("Execution Time", 0.0),
+    )
+
+
+def explain(sql: str, using: str = "default") -> PlanSummary:
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return summarize(plan[0], sql)
+
+
+def capture_plans(func, using: str = "default") -> list[PlanSummary]:
+    """Выполняет func и возвращает планы всех SELECT, которые она отправила в БД."""
+    with CaptureQueriesContext(connections[using]) as queries:
+        func()
+
+    statements = [query["sql"] for query in queries.captured_queries]
+    return [
+        explain(sql, using)
+        for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "WITH", "(SELECT"))
+    ]
+
+
+def check_plans(plans: list[PlanSummary], baseline: list[dict]) -> list[str]:
+    """Нарушения относительно базовой линии; пустой список — план не деградировал."""
+    if len(plans) != len(baseline):
+        return [f"запросов {len(plans)}, в базовой линии {len(baseline)}"]
+
+    problems = []
+    for index, (plan, expected) in enumerate(zip(plans, baseline, strict=True), start=1):
+        for relation in sorted(plan.seq_scans - set(expected["seq_scans"])):
+            problems.append(f"запрос {index}: Seq Scan по {relation}")
+        if plan.rows > expected["max_rows"]:
+            problems.append(f"запрос {index}: строк {plan.rows} > {expected['max_rows']}")
+        if plan.buffers > expected["max_buffers"]:
+            problems.append(f"запрос {index}: буферов {plan.buffers} > {expected['max_buffers']}")
+    return problems
@@ -0,0 +1,78 @@
+import string
+
+# Лексикографические ранги для ручного порядка: ранг — дробная часть числа по основанию 62,
+# цифры упорядочены как байты, поэтому в PostgreSQL колонка сравнивается в колляции "C".
+# Новый элемент получает ключ следующего слота, перемещение — ключ между соседями:
+# переписывается только перемещённая строка. Ранги никогда не оканчиваются на "0",
+# поэтому между любыми двумя различными рангами всегда есть ещё один.
+
+DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+BASE = len(DIGITS)
+SLOT_WIDTH = 5
+MAX_SLOT = BASE**SLOT_WIDTH - 1
+
+# длиннее RANK_REBALANCE_LENGTH — перестройка рангов в фоне, RANK_MAX_LENGTH — размер колонки
+RANK_REBALANCE_LENGTH = 32
+RANK_MAX_LENGTH = 64
+
+_MIDDLE = DIGITS[BASE // 2]
+
+
+def _encode(number: int) -> str:
+    digits = []
+    for _ in range(SLOT_WIDTH):
+        number, digit = divmod(number, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits))
+
+
+def rank_for_slot(slot: int) -> str:
+    """Ранг слота: номер из SLOT_WIDTH цифр и средняя цифра, чтобы ранг не оканчивался на "0"."""
+    if not 0 <= slot <= MAX_SLOT:
+        raise ValueError(f"Номер слота вне диапазона: {slot}")
+    return _encode(slot) + _MIDDLE
+
+
+def slot_of(rank: str) -> int:
+    """Слот, в который попадает ранг: первые SLOT_WIDTH цифр."""
+    number = 0
+    for char in rank[:SLOT_WIDTH].ljust(SLOT_WIDTH, DIGITS[0]):
+        number = number * BASE + DIGITS.index(char)
+    return number
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """
+    Ранг строго между before и after; None — начало или конец списка.
+    Ранг в конце списка остаётся в слоте before: слоты выдаются только новым элементам.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Ранги не упорядочены: {before!r} >= {after!r}")
+
+    if after is None and before is not None:
+        slot = slot_of(before)
+        if slot < MAX_SLOT:
+            after = _encode(slot + 1)
+    return _midpoint(before or "", after)
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    # low < high; пустой low — ноль, high=None — единица
+    if high is not None:
+        common = 0
+        while common < len(high) and (low[common : common + 1] or DIGITS[0]) == high[common]:
+            common += 1
+        if common:
+            return high[:common] + _midpoint(low[common:], high[common:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) > RANK_REBALANCE_LENGTH
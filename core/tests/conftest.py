@@ -0,0 +1,37 @@
+from collections import Counter, defaultdict, deque
+
+import pytest
+
+from core import cache as core_cache
+from core.metrics import registry
+
+
+@pytest.fixture
+def l1_cache(settings, locmem_cache, monkeypatch):
+    settings.CACHE_L1_ENABLED = True
+    settings.CACHE_L1_MAX_ENTRIES = 100
+    settings.CACHE_L1_MAX_TTL = 30
+    monkeypatch.setattr(core_cache, "_local_cache", None)
+    return core_cache.get_local_cache()
+
+
+@pytest.fixture
+def swr_stats(monkeypatch):
+    monkeypatch.setattr(core_cache, "_swr_stats", defaultdict(Counter))
+    return core_cache.get_swr_stats
+
+
+@pytest.fixture
+def circuit_breaker(settings, monkeypatch):
+    settings.CACHE_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.CACHE_CIRCUIT_RECOVERY_TIMEOUT = 30
+    monkeypatch.setattr(core_cache, "_circuit_breaker", None)
+    monkeypatch.setattr(core_cache, "_pending_invalidations", deque(maxlen=100))
+    return core_cache.get_circuit_breaker()
+
+
+@pytest.fixture
+def metrics():
+    registry.clear()
+    yield registry
+    registry.clear()
@@ -0,0 +1,467 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from apps.projects import selectors as project_selectors
+from core.cache import (
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_NONE_SENTINEL,
+    HASH_LOADED_FIELD,
+    CacheKeys,
+    CircuitBreaker,
+    LocalCache,
+    _listen_for_invalidations,
+    cache_with_lock,
+    get_circuit_breaker_stats,
+    get_l1_stats,
+    get_project_generation,
+    invalidate_all_project_caches,
+    invalidate_membership_cache,
+    invalidate_project_cache,
+    project_cache_key,
+    safe_cache_get,
+    safe_cache_set,
+    safe_hash_can_load,
+    safe_hash_get,
+    update_membership_cache,
+)
+from core.exceptions import NotFoundError
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self):
+        local_cache = LocalCache(max_entries=2)
+        local_cache.set("a", 1, 60)
+        local_cache.set("b", 2, 60)
+        local_cache.get("a")
+
+        local_cache.set("c", 3, 60)
+
+        assert local_cache.get("a") == 1
+        assert local_cache.get("b") is None
+        assert local_cache.get("c") == 3
+
+    def test_entry_expires_after_ttl(self):
+        local_cache = LocalCache(max_entries=10)
+
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            local_cache.set("a", 1, 5)
+
+        with patch("core.cache.time.monotonic", return_value=104.0):
+            assert local_cache.get("a") == 1
+
+        with patch("core.cache.time.monotonic", return_value=105.0):
+            assert local_cache.get("a") is None
+
+        assert len(local_cache) == 0
+
+    def test_stats_grouped_by_key_family(self):
+        local_cache = LocalCache(max_entries=10)
+        key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+        local_cache.set(key, {"id": 1}, 60)
+
+        local_cache.get(key)
+        local_cache.get(CacheKeys.PROJECT_DETAIL.format(project_id=2))
+
+        stats = local_cache.stats()
+        assert stats["project_detail"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+class TestTwoTierCache:
+    def test_get_served_from_l1_after_first_read(self, l1_cache, locmem_cache):
+        key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+        locmem_cache.set(key, {"id": 1}, 60)
+
+        assert safe_cache_get(key) == {"id": 1}
+
+        with patch.object(locmem_cache, "get") as mock_get:
+            assert safe_cache_get(key) == {"id": 1}
+
+        mock_get.assert_not_called()
+        assert get_l1_stats()["project_detail"]["hits"] == 1
+
+    def test_set_populates_l1(self, l1_cache):
+        key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+
+        safe_cache_set(key, {"id": 1}, 60)
+
+        assert l1_cache.get(key) == {"id": 1}
+
+    def test_invalidate_project_cache_evicts_l1(self, l1_cache):
+        key = project_cache_key(CacheKeys.PROJECT_DETAIL, 1)
+        safe_cache_set(key, {"id": 1}, 60)
+
+        invalidate_project_cache(1)
+
+        assert safe_cache_get(key) is None
+
+    def test_invalidation_is_published_to_other_workers(self, l1_cache):
+        client = MagicMock()
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            invalidate_project_cache(1)
+
+        channel, payload = client.publish.call_args[0]
+        assert channel == CACHE_INVALIDATION_CHANNEL
+        assert json.loads(payload) == {
+            "keys": [
+                project_cache_key(CacheKeys.PROJECT_DETAIL, 1),
+                CacheKeys.PROJECT_SUMMARY.format(project_id=1),
+            ],
+            "prefixes": [],
+        }
+
+    def test_invalidation_during_read_keeps_value_out_of_l1(self, l1_cache, locmem_cache):
+        key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+
+        def stale_read(*args):
+            # инвалидация пришла, пока ответ Redis со старым значением был в пути
+            l1_cache.delete_many([key])
+            return {"id": 1, "name": "old"}
+
+        with patch.object(locmem_cache, "get", side_effect=stale_read):
+            assert safe_cache_get(key) == {"id": 1, "name": "old"}
+
+        assert l1_cache.get(key) is None
+
+    def test_invalidation_during_hash_read_keeps_field_out_of_l1(self, l1_cache):
+        key = "v1:projects:members:1"
+        client = MagicMock()
+
+        def stale_read(*args):
+            l1_cache.delete_prefix(key)
+            return ["member", "1"]
+
+        client.hmget.side_effect = stale_read
+        with patch("core.cache.get_redis_client", return_value=client):
+            assert safe_hash_get(key, 2) == "member"
+
+        assert l1_cache.get(f"{key}#2") is None
+
+    def test_malformed_invalidation_clears_l1_and_listener_survives(self, l1_cache):
+        class Stop(BaseException):
+            pass
+
+        seen = []
+
+        def listen():
+            l1_cache.set("v1:projects:detail:1", {"id": 1}, 30)
+            yield {"data": "not json"}
+            seen.append(l1_cache.get("v1:projects:detail:1"))
+
+            l1_cache.set("v1:projects:detail:1", {"id": 1}, 30)
+            l1_cache.set("v1:projects:detail:2", {"id": 2}, 30)
+            yield {"data": json.dumps({"keys": ["v1:projects:detail:2"], "prefixes": []})}
+            seen.append(l1_cache.get("v1:projects:detail:1"))
+            seen.append(l1_cache.get("v1:projects:detail:2"))
+            raise Stop
+
+        client = MagicMock()
+        client.pubsub.return_value.listen.side_effect = listen
+        with patch("core.cache._create_redis_client", return_value=client):
+            with pytest.raises(Stop):
+                _listen_for_invalidations()
+
+        # битое сообщение сбросило L1, следующее обработано как обычно
+        assert seen == [None, {"id": 1}, None]
+
+    def test_l1_disabled_reads_backend(self, locmem_cache, settings):
+        settings.CACHE_L1_ENABLED = False
+        key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+        locmem_cache.set(key, {"id": 1}, 60)
+
+        assert safe_cache_get(key) == {"id": 1}
+        locmem_cache.delete(key)
+        assert safe_cache_get(key) is None
+
+
+class TestMembershipHash:
+    def test_hash_not_loaded_returns_default(self, l1_cache):
+        client = MagicMock()
+        client.hmget.return_value = [None, None]
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            assert safe_hash_get("v1:projects:members:1", 2) is None
+
+    def test_loaded_hash_without_field_is_negative(self, l1_cache):
+        client = MagicMock()
+        client.hmget.return_value = [None, "1"]
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            assert safe_hash_get("v1:projects:members:1", 2) == CACHE_NONE_SENTINEL
+
+        client.hmget.assert_called_once_with("v1:projects:members:1", ["2", HASH_LOADED_FIELD])
+
+    def test_dirty_hash_cannot_be_loaded(self, locmem_cache):
+        client = MagicMock()
+        client.exists.return_value = 1
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            assert not safe_hash_can_load("v1:projects:members:1")
+
+        client.exists.assert_called_once_with("v1:projects:members:1:dirty")
+
+    def test_hash_cannot_be_loaded_when_circuit_open(self, locmem_cache, circuit_breaker):
+        client = MagicMock()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            assert not safe_hash_can_load("v1:projects:members:1")
+
+        client.exists.assert_not_called()
+
+    def test_field_served_from_l1(self, l1_cache):
+        client = MagicMock()
+        client.hmget.return_value = ["admin", "1"]
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            safe_hash_get("v1:projects:members:1", 2)
+            assert safe_hash_get("v1:projects:members:1", 2) == "admin"
+
+        client.hmget.assert_called_once()
+        assert get_l1_stats()["project_members"]["hits"] == 1
+
+    def test_update_membership_evicts_only_that_user(self, l1_cache):
+        client = MagicMock()
+        client.hmget.return_value = ["member", "1"]
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            key = project_cache_key(CacheKeys.PROJECT_MEMBERS, 1)
+            safe_hash_get(key, 2)
+            safe_hash_get(key, 3)
+            update_membership_cache(1, 2, "admin")
+
+        assert l1_cache.get(f"{key}#2") is None
+        assert l1_cache.get(f"{key}#3") == "member"
+        client.eval.assert_called_once()
+
+    def test_invalidate_membership_drops_whole_project(self, l1_cache):
+        client = MagicMock()
+        client.hmget.return_value = ["member", "1"]
+
+        key = project_cache_key(CacheKeys.PROJECT_MEMBERS, 1)
+        other_key = project_cache_key(CacheKeys.PROJECT_MEMBERS, 10)
+
+        with patch("core.cache.get_redis_client", return_value=client):
+            safe_hash_get(key, 2)
+            safe_hash_get(other_key, 2)
+            invalidate_membership_cache(1)
+
+        client.delete.assert_called_once_with(key)
+        assert l1_cache.get(f"{key}#2") is None
+        assert l1_cache.get(f"{other_key}#2") == "member"
+
+
+class TestStaleWhileRevalidate:
+    key = "v1:projects:detail:1"
+
+    def test_fresh_value_is_served_without_fetch(self, locmem_cache, swr_stats):
+        fetch = MagicMock(return_value={"id": 1})
+
+        cache_with_lock(self.key, 60, fetch)
+        assert cache_with_lock(self.key, 60, fetch) == {"id": 1}
+
+        fetch.assert_called_once()
+        assert swr_stats()["project_detail"] == {"hit": 1, "stale": 0, "miss": 1}
+
+    def test_stale_value_refreshed_by_lock_holder(self, locmem_cache, swr_stats):
+        with patch("core.cache.time.time", return_value=1000.0):
+            cache_with_lock(self.key, 60, lambda: "old")
+
+        with patch("core.cache.time.time", return_value=1100.0):
+            assert cache_with_lock(self.key, 60, lambda: "new") == "new"
+            assert cache_with_lock(self.key, 60, lambda: "newer") == "new"
+
+        assert swr_stats()["project_detail"] == {"hit": 1, "stale": 1, "miss": 1}
+
+    def test_stale_value_served_while_lock_is_held(self, locmem_cache, swr_stats):
+        with patch("core.cache.time.time", return_value=1000.0):
+            cache_with_lock(self.key, 60, lambda: "old")
+
+        locmem_cache.add(f"{self.key}:lock", "locked", 10)
+        fetch = MagicMock(return_value="new")
+
+        with patch("core.cache.time.time", return_value=1100.0):
+            with patch("core.cache.time.sleep") as mock_sleep:
+                assert cache_with_lock(self.key, 60, fetch) == "old"
+
+        fetch.assert_not_called()
+        mock_sleep.assert_not_called()
+        assert swr_stats()["project_detail"]["stale"] == 1
+
+    def test_miss_while_lock_is_held_fetches_without_waiting(self, locmem_cache, swr_stats):
+        locmem_cache.add(f"{self.key}:lock", "locked", 10)
+
+        with patch("core.cache.time.sleep") as mock_sleep:
+            assert cache_with_lock(self.key, 60, lambda: "value") == "value"
+
+        mock_sleep.assert_not_called()
+        # запись остаётся за обладателем лока
+        assert locmem_cache.get(self.key) is None
+        assert swr_stats()["project_detail"]["miss"] == 1
+
+    def test_hard_ttl_covers_stale_window(self, locmem_cache):
+        with patch.object(locmem_cache, "set", wraps=locmem_cache.set) as mock_set:
+            with patch("core.cache.random.randint", return_value=0):
+                cache_with_lock(self.key, 60, lambda: "value", stale_ttl=30)
+
+        assert mock_set.call_args[0][2] == 90
+
+    @pytest.mark.django_db
+    def test_missing_project_is_cached(self, locmem_cache):
+        with pytest.raises(NotFoundError):
+            project_selectors.get_detail(987654321)
+
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                with pytest.raises(NotFoundError):
+                    project_selectors.get_detail(987654321)
+
+        assert len(queries) == 0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["rejected_total"] == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+
+        with patch("core.cache.time.monotonic", return_value=130.0):
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+
+    def test_successful_probe_closes_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+
+        with patch("core.cache.time.monotonic", return_value=130.0):
+            breaker.allow_request()
+            breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            for _ in range(3):
+                breaker.record_failure()
+
+        with patch("core.cache.time.monotonic", return_value=130.0):
+            breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.stats()["opened_total"] == 2
+
+
+class TestRedisFastFail:
+    def test_timeout_falls_back_to_default(self, locmem_cache, circuit_breaker):
+        with patch.object(locmem_cache, "get", side_effect=RedisTimeoutError):
+            assert safe_cache_get("key", default="fallback") == "fallback"
+
+        assert circuit_breaker.stats()["consecutive_failures"] == 1
+
+    def test_open_circuit_skips_redis(self, locmem_cache, circuit_breaker):
+        with patch.object(locmem_cache, "get", side_effect=RedisConnectionError) as mock_get:
+            for _ in range(5):
+                assert safe_cache_get("key") is None
+
+        assert mock_get.call_count == 2
+        assert get_circuit_breaker_stats()["state"] == CircuitBreaker.OPEN
+
+    def test_cache_with_lock_goes_to_db_when_redis_fails(self, locmem_cache, circuit_breaker):
+        with patch.object(locmem_cache, "get", side_effect=RedisTimeoutError):
+            with patch.object(locmem_cache, "add", side_effect=RedisTimeoutError):
+                assert cache_with_lock("key", 60, lambda: "value") == "value"
+
+    def test_invalidation_replayed_after_recovery(self, locmem_cache, circuit_breaker):
+        key = project_cache_key(CacheKeys.PROJECT_DETAIL, 1)
+        locmem_cache.set(key, "stale", 60)
+
+        with patch.object(locmem_cache, "delete_many", side_effect=RedisConnectionError):
+            invalidate_project_cache(1)
+
+        assert get_circuit_breaker_stats()["pending_invalidations"] == 2
+        assert locmem_cache.get(key) == "stale"
+
+        safe_cache_get("other")
+
+        assert locmem_cache.get(key) is None
+        assert get_circuit_breaker_stats()["pending_invalidations"] == 0
+
+
+class TestProjectGeneration:
+    def test_key_contains_generation(self, locmem_cache):
+        generation = get_project_generation(1)
+
+        assert project_cache_key(CacheKeys.PROJECT_DETAIL, 1) == (
+            f"{CacheKeys.PROJECT_DETAIL.format(project_id=1)}:g{generation}"
+        )
+
+    def test_generation_is_initialised_once(self, locmem_cache):
+        with patch("core.cache.time.time", return_value=1000.0):
+            assert get_project_generation(1) == 1_000_000
+
+        with patch("core.cache.time.time", return_value=2000.0):
+            assert get_project_generation(1) == 1_000_000
+
+    def test_invalidate_all_is_single_incr(self, locmem_cache):
+        key = project_cache_key(CacheKeys.PROJECT_DETAIL, 1)
+        other_project_key = project_cache_key(CacheKeys.PROJECT_DETAIL, 2)
+
+        with patch.object(locmem_cache, "incr", wraps=locmem_cache.incr) as mock_incr:
+            with patch.object(locmem_cache, "delete_many") as mock_delete_many:
+                invalidate_all_project_caches(1)
+
+        mock_incr.assert_called_once()
+        # кроме INCR удаляется только сводка проекта
+        mock_delete_many.assert_called_once_with([CacheKeys.PROJECT_SUMMARY.format(project_id=1)])
+        assert project_cache_key(CacheKeys.PROJECT_DETAIL, 1) != key
+        assert project_cache_key(CacheKeys.PROJECT_DETAIL, 2) == other_project_key
+
+    def test_bump_evicts_generation_from_l1(self, l1_cache):
+        generation = get_project_generation(1)
+
+        invalidate_all_project_caches(1)
+
+        assert get_project_generation(1) == generation + 1
+
+    def test_failed_bump_is_replayed(self, locmem_cache, circuit_breaker):
+        generation = get_project_generation(1)
+
+        with patch.object(locmem_cache, "incr", side_effect=RedisConnectionError):
+            invalidate_all_project_caches(1)
+
+        with patch("core.cache.time.time", return_value=generation / 1000 + 5):
+            assert get_project_generation(1) != generation
@@ -0,0 +1,75 @@
+import pickle
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+
+from core import codec
+from core.websocket import ChannelMessageSerializer
+
+
+class TestCodec:
+    def test_roundtrip_preserves_types(self):
+        value = {
+            "id": 1,
+            "members": {10: "owner", 11: "admin"},
+            "created_at": datetime(2026, 1, 15, 12, 30, 5, 123456, tzinfo=UTC),
+            "deadline": date(2026, 2, 1),
+            "budget": Decimal("10.50"),
+            "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "flags": {"archived": False, "owner": None},
+        }
+
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_small_value_is_not_compressed(self):
+        assert codec.encode({"id": 1})[:1] == codec.HEADER_RAW
+
+    def test_large_value_is_compressed(self):
+        value = [{"title": "Задача", "status": "pending"}] * 100
+
+        data = codec.encode(value)
+
+        assert data[:1] == codec.HEADER_ZLIB
+        assert len(data) < len(codec.packb(value))
+        assert codec.decode(data) == value
+
+    def test_unknown_type_falls_back_to_pickle(self):
+        value = {"ids": {1, 2, 3}}
+
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_legacy_pickled_value_is_readable(self):
+        assert codec.decode(pickle.dumps({"id": 1}, pickle.HIGHEST_PROTOCOL)) == {"id": 1}
+
+    def test_unknown_header_raises(self):
+        with pytest.raises(ValueError):
+            codec.decode(b"\x05data")
+
+
+class TestCacheSerializer:
+    def test_int_is_stored_raw_for_incr(self):
+        serializer = codec.CacheSerializer()
+
+        assert serializer.dumps(42) == 42
+        assert serializer.loads(b"42") == 42
+
+    def test_bool_is_not_treated_as_int(self):
+        serializer = codec.CacheSerializer()
+
+        assert serializer.loads(serializer.dumps(True)) is True
+
+    def test_roundtrip(self):
+        serializer = codec.CacheSerializer()
+        value = {"__swr__": 1, "value": "__CACHE_NONE__", "soft_expires": 1.5}
+
+        assert serializer.loads(serializer.dumps(value)) == value
+
+
+class TestChannelMessageSerializer:
+    def test_roundtrip(self):
+        serializer = ChannelMessageSerializer()
+        message = {"type": "broadcast_event", "event_type": "task.updated", "data": {"id": 1}}
+
+        assert serializer.deserialize(serializer.serialize(message)) == message
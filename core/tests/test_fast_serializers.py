@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+import pytest
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from apps.comments.api.serializers import CommentListSerializer
+from apps.comments.models import Comment
+from apps.comments.tests.factories import CommentFactory
+from apps.projects.api.serializers import ProjectMemberSerializer
+from apps.projects.models import ProjectMember
+from apps.projects.tests.factories import ProjectFactory, ProjectMemberFactory
+from apps.tags.api.serializers import TagListSerializer
+from apps.tags.models import Tag
+from apps.tags.tests.factories import TagFactory
+from apps.tasks import selectors as task_selectors
+from apps.tasks.api.serializers import TaskListSerializer
+from apps.tasks.tests.factories import TaskFactory
+from apps.users.tests.factories import UserFactory
+from core.fast_serializers import CompiledSerializer, compile_serializer
+from core.fieldsets import Fieldset
+
+
+def _assert_same_json(serializer_class, queryset, context):
+    slow = serializer_class(queryset, many=True, context=context).data
+
+    compiled = CompiledSerializer(serializer_class, context)
+    fast = compiled.render(compiled.values(queryset))
+
+    assert JSONRenderer().render(fast) == JSONRenderer().render(slow)
+
+
+@pytest.fixture
+def request_context():
+    return {"request": RequestFactory().get("/api/v1/")}
+
+
+@pytest.fixture
+def board(db):
+    project = ProjectFactory()
+    assignee = UserFactory(is_verified=True, avatar="avatars/assignee.png")
+    ProjectMemberFactory(project=project, user=assignee)
+    tags = [TagFactory(project=project, name=name) for name in ("backend", "api", "urgent")]
+
+    deadline = timezone.now() + timedelta(days=3, microseconds=123)
+    TaskFactory(project=project, assignee=assignee, deadline=deadline).tags.set(tags)
+    TaskFactory(project=project).tags.set(tags[:1])
+    TaskFactory(project=project, assignee=assignee)
+    return project
+
+
+@pytest.mark.django_db
+class TestCompiledSerializer:
+    def test_task_list_matches(self, board, request_context):
+        queryset = task_selectors.filter_by_project_with_filters(board).order_by("id")
+
+        _assert_same_json(TaskListSerializer, queryset, request_context)
+
+    def test_task_list_with_fieldset_matches(self, board, request_context):
+        fieldset = Fieldset(
+            fields=frozenset({"id", "title", "creator", "assignee", "tags"}),
+            expand=frozenset({"assignee"}),
+        )
+        queryset = task_selectors.filter_by_project_with_filters(board, fieldset=fieldset)
+
+        _assert_same_json(
+            TaskListSerializer, queryset.order_by("id"), {**request_context, "fieldset": fieldset}
+        )
+
+    def test_comment_list_matches(self, board, request_context):
+        task = board.tasks.first()
+        CommentFactory.create_batch(2, task=task)
+        CommentFactory(task=task, author=UserFactory(avatar="avatars/author.png"), is_edited=True)
+
+        _assert_same_json(
+            CommentListSerializer,
+            Comment.objects.filter(task=task).select_related("author"),
+            request_context,
+        )
+
+    def test_member_list_matches(self, board):
+        queryset = ProjectMember.objects.filter(project=board).order_by("joined_at", "id")
+
+        _assert_same_json(ProjectMemberSerializer, queryset, {})
+
+    def test_tag_list_matches(self, board, request_context):
+        _assert_same_json(TagListSerializer, Tag.objects.filter(project=board), request_context)
+
+    def test_method_fields_not_compiled(self):
+        class WithMethodField(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Tag
+                fields = ["id", "label"]
+
+            def get_label(self, obj):
+                return obj.name.upper()
+
+        assert compile_serializer(WithMethodField, {}) is None
@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+from core import identity_map
+from core.identity_map import identity_map_scope
+
+
+class TestIdentityMap:
+    def test_loader_called_once_within_scope(self):
+        loader = MagicMock(return_value="value")
+
+        with identity_map_scope():
+            assert identity_map.get_or_load(("project", "1"), loader) == "value"
+            assert identity_map.get_or_load(("project", "1"), loader) == "value"
+
+        loader.assert_called_once()
+
+    def test_no_memoization_outside_scope(self):
+        loader = MagicMock(return_value="value")
+
+        identity_map.get_or_load(("project", "1"), loader)
+        identity_map.get_or_load(("project", "1"), loader)
+
+        assert loader.call_count == 2
+        assert not identity_map.is_active()
+
+    def test_exceptions_are_not_memoized(self):
+        loader = MagicMock(side_effect=[LookupError, "value"])
+
+        with identity_map_scope():
+            try:
+                identity_map.get_or_load(("project", "1"), loader)
+            except LookupError:
+                pass
+            assert identity_map.get_or_load(("project", "1"), loader) == "value"
+
+    def test_discard_forces_reload(self):
+        loader = MagicMock(return_value="value")
+
+        with identity_map_scope():
+            identity_map.get_or_load(("project", "1"), loader)
+            identity_map.discard(("project", "1"))
+            identity_map.get_or_load(("project", "1"), loader)
+
+        assert loader.call_count == 2
+
+    def test_nested_scope_is_isolated(self):
+        loader = MagicMock(return_value="value")
+
+        with identity_map_scope():
+            identity_map.get_or_load(("project", "1"), loader)
+            with identity_map_scope():
+                identity_map.get_or_load(("project", "1"), loader)
+            identity_map.get_or_load(("project", "1"), loader)
+
+        assert loader.call_count == 2
@@ -0,0 +1,179 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.urls import reverse
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from core.cache import (
+    CACHE_LOCK_CONTENTION,
+    CACHE_NEGATIVE_HITS,
+    CACHE_NONE_SENTINEL,
+    CACHE_REQUESTS,
+    CACHE_SETS,
+    REDIS_ERRORS,
+    CacheKeys,
+    cache_with_lock,
+    invalidate_project_cache,
+    safe_cache_get,
+    safe_cache_set,
+)
+from core.metrics import (
+    METRICS_WORKERS_KEY,
+    Registry,
+    collect_worker_metrics,
+    publish_metrics,
+    worker_id,
+)
+
+
+class TestRegistry:
+    def test_counter_rendered_with_labels(self):
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests", ("family", "result"))
+
+        counter.inc(family="project_detail", result="hit")
+        counter.inc(2, family="project_detail", result="hit")
+
+        assert registry.render() == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{family="project_detail",result="hit"} 3\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        histogram = registry.histogram("duration_seconds", "Duration", buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        lines = registry.render().splitlines()
+        assert 'duration_seconds_bucket{le="0.1"} 1' in lines
+        assert 'duration_seconds_bucket{le="1"} 2' in lines
+        assert 'duration_seconds_bucket{le="+Inf"} 3' in lines
+        assert "duration_seconds_count 3" in lines
+        assert "duration_seconds_sum 5.55" in lines
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.counter("total", "Total", ("name",)).inc(name='a"b')
+
+        assert 'total{name="a\\"b"} 1' in registry.render()
+
+    def test_worker_snapshots_rendered_under_one_family(self):
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests", ("result",))
+        counter.inc(result="hit")
+        other = {"requests_total": [["requests_total", {"result": "hit"}, 5]]}
+
+        body = registry.render({"web-1:20": registry.snapshot(), "web-1:10": other})
+
+        assert body == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{result="hit",worker="web-1:10"} 5\n'
+            'requests_total{result="hit",worker="web-1:20"} 1\n'
+        )
+
+
+class TestWorkerMetrics:
+    def test_without_redis_only_own_process(self, metrics):
+        snapshots = collect_worker_metrics()
+
+        assert list(snapshots) == [worker_id()]
+
+    def test_merges_live_workers_and_drops_dead(self, metrics):
+        now = time.time()
+        client = MagicMock()
+        client.hgetall.return_value = {
+            "web-2:7": json.dumps({"published_at": now, "metrics": {"m": [["m", {}, 1]]}}),
+            "web-2:8": json.dumps({"published_at": now - 3600, "metrics": {}}),
+        }
+
+        with patch("core.metrics._get_redis_client", return_value=client):
+            snapshots = collect_worker_metrics()
+
+        assert set(snapshots) == {"web-2:7", worker_id()}
+        assert client.hset.call_args[0][:2] == (METRICS_WORKERS_KEY, worker_id())
+        client.hdel.assert_called_once_with(METRICS_WORKERS_KEY, "web-2:8")
+
+    def test_publish_failure_does_not_touch_cache_circuit(self, metrics, circuit_breaker):
+        client = MagicMock()
+        client.hset.side_effect = RedisTimeoutError
+
+        with patch("core.metrics._get_redis_client", return_value=client):
+            publish_metrics()
+            publish_metrics()
+
+        assert circuit_breaker.stats()["state"] == "closed"
+        assert REDIS_ERRORS.value(operation="hset") == 0
+
+
+class TestCacheInstrumentation:
+    key = CacheKeys.PROJECT_DETAIL.format(project_id=1)
+
+    def test_reads_counted_per_family(self, locmem_cache, metrics):
+        safe_cache_get(self.key)
+        safe_cache_set(self.key, {"id": 1}, 60)
+        safe_cache_get(self.key)
+
+        assert CACHE_REQUESTS.value(family="project_detail", result="miss") == 1
+        assert CACHE_REQUESTS.value(family="project_detail", result="hit") == 1
+        assert CACHE_SETS.value(family="project_detail", result="ok") == 1
+
+    def test_negative_hit_counted(self, locmem_cache, metrics):
+        safe_cache_set(self.key, CACHE_NONE_SENTINEL, 60)
+
+        safe_cache_get(self.key)
+
+        assert CACHE_NEGATIVE_HITS.value(family="project_detail") == 1
+
+    def test_unavailable_redis_counted(self, locmem_cache, circuit_breaker, metrics):
+        with patch.object(locmem_cache, "get", side_effect=RedisTimeoutError):
+            safe_cache_get(self.key)
+
+        assert CACHE_REQUESTS.value(family="project_detail", result="unavailable") == 1
+        assert REDIS_ERRORS.value(operation="get") == 1
+
+    def test_lock_contention_counted(self, locmem_cache, metrics):
+        locmem_cache.add(f"{self.key}:lock", "locked", 10)
+
+        cache_with_lock(self.key, 60, lambda: "value")
+
+        assert CACHE_LOCK_CONTENTION.value(family="project_detail") == 1
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_exports_prometheus_text(self, client, settings, locmem_cache, metrics):
+        settings.METRICS_TOKEN = "secret"
+        invalidate_project_cache(1)
+
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.content.decode()
+        worker = worker_id()
+        assert (
+            "taskflow_cache_invalidations_total"
+            f'{{family="project_detail",kind="delete",worker="{worker}"}} 1'
+        ) in body
+        assert f'taskflow_redis_circuit_state{{state="closed",worker="{worker}"}} 1' in body
+        assert "taskflow_redis_command_duration_seconds_bucket" in body
+
+    def test_token_required(self, client, settings):
+        settings.METRICS_TOKEN = "secret"
+
+        assert client.get(reverse("metrics")).status_code == 403
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+
+    def test_closed_without_token(self, client, settings):
+        settings.METRICS_TOKEN = ""
+
+        assert client.get(reverse("metrics")).status_code == 403
+        assert client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer ").status_code == 403
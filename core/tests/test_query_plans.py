@@ -0,0 +1,112 @@
+import pytest
+
+from apps.tasks import selectors as task_selectors
+from apps.tasks.tests.factories import TaskFactory
+from core.query_plans import PlanSummary, capture_plans, check_plans, summarize
+
+PLAN = {
+    "Plan": {
+        "Node Type": "Limit",
+        "Shared Hit Blocks": 40,
+        "Shared Read Blocks": 2,
+        "Plans": [
+            {
+                "Node Type": "Nested Loop",
+                "Plans": [
+                    {
+                        "Node Type": "Index Scan",
+                        "Relation Name": "tasks_task",
+                        "Index Name": "tasks_task_project_idx",
+                        "Actual Rows": 20,
+                        "Actual Loops": 1,
+                        "Rows Removed by Filter": 5,
+                    },
+                    {
+                        "Node Type": "Seq Scan",
+                        "Relation Name": "users_user",
+                        "Actual Rows": 1.5,
+                        "Actual Loops": 20,
+                    },
+                ],
+            }
+        ],
+    },
+    "Execution Time": 0.25,
+}
+
+
+def _summary(**overrides) -> PlanSummary:
+    values = {
+        "sql": "SELECT 1",
+        "scans": (),
+        "seq_scans": frozenset(),
+        "rows": 10,
+        "buffers": 10,
+        "time_ms": 0.1,
+    }
+    return PlanSummary(**{**values, **overrides})
+
+
+class TestSummarize:
+    def test_counts_rows_read_by_scans(self):
+        summary = summarize(PLAN)
+
+        # 20 отданных + 5 отброшенных фильтром + 1.5 * 20 loops
+        assert summary.rows == 55
+        assert summary.buffers == 42
+        assert summary.time_ms == 0.25
+
+    def test_collects_scans(self):
+        summary = summarize(PLAN)
+
+        assert summary.scans == (
+            "Index Scan on tasks_task using tasks_task_project_idx",
+            "Seq Scan on users_user",
+        )
+        assert summary.seq_scans == {"users_user"}
+
+
+class TestCheckPlans:
+    def test_within_baseline(self):
+        baseline = [_summary().to_baseline()]
+
+        assert check_plans([_summary(rows=14, buffers=14)], baseline) == []
+
+    def test_new_seq_scan(self):
+        baseline = [_summary().to_baseline()]
+
+        problems = check_plans([_summary(seq_scans=frozenset({"tasks_task"}))], baseline)
+
+        assert problems == ["запрос 1: Seq Scan по tasks_task"]
+
+    def test_known_seq_scan_allowed(self):
+        baseline = [_summary(seq_scans=frozenset({"tags_tag"})).to_baseline()]
+
+        assert check_plans([_summary(seq_scans=frozenset({"tags_tag"}))], baseline) == []
+
+    def test_over_budget(self):
+        baseline = [_summary().to_baseline()]
+
+        problems = check_plans([_summary(rows=1000, buffers=500)], baseline)
+
+        assert problems == ["запрос 1: строк 1000 > 35", "запрос 1: буферов 500 > 35"]
+
+    def test_query_count_changed(self):
+        baseline = [_summary().to_baseline()]
+
+        problems = check_plans([_summary(), _summary()], baseline)
+
+        assert problems == ["запросов 2, в базовой линии 1"]
+
+
+@pytest.mark.django_db
+class TestCapturePlans:
+    def test_explains_every_select(self):
+        task = TaskFactory()
+
+        plans = capture_plans(lambda: task_selectors.get_by_id(task.id))
+
+        # задача с JOIN-ами и prefetch тегов
+        assert len(plans) == 2
+        assert any("tasks_task" in scan for scan in plans[0].scans)
+        assert all(plan.sql.startswith("SELECT") for plan in plans)
@@ -0,0 +1,24 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+# импорт регистрирует метрики кэша в registry
+from core import cache  # noqa: F401
+from core.metrics import collect_worker_metrics, registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    # без токена эндпоинт закрыт
+    token = settings.METRICS_TOKEN
+    provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not token or not hmac.compare_digest(provided, token):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(collect_worker_metrics()), content_type=PROMETHEUS_CONTENT_TYPE
+    )
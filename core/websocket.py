@@ -2,10 +2,23 @@ import logging
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from channels_redis.serializers import BaseMessageSerializer
 from redis.exceptions import ConnectionError
 
+from core import codec
+
 logger = logging.getLogger(__name__)
 
+# Имя формата для CHANNEL_LAYERS["default"]["CONFIG"]["serializer_format"]
+CHANNEL_SERIALIZER_FORMAT = "msgpack_zlib"
+
+
+class ChannelMessageSerializer(BaseMessageSerializer):
+    """msgpack + zlib для больших событий (core.codec) поверх channels_redis."""
+
+    as_bytes = staticmethod(codec.encode)
+    from_bytes = staticmethod(codec.decode)
+
 
 class WebSocketError(Exception):
     pass